@@ -1,23 +1,386 @@
+import time
+STARTUP_TIME = time.perf_counter()  # Reference point for time-to-first-paint
+
 import sys
 import os
 import re  # For input validation
-import psutil
-import requests
-import io
 import subprocess  # For running external commands
+
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    # Batch mode: runs a saved configuration without loading any widgets
+    from headless import main
+    sys.exit(main(sys.argv[1:]))
+
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
     QLabel, QLineEdit, QCheckBox, QComboBox, QPushButton, QFileDialog,
     QTextEdit, QTabWidget, QGroupBox, QSpinBox, QDateEdit, QSizePolicy,
-    QScrollArea, QRadioButton, QMessageBox, QDialog, QProgressBar
+    QScrollArea, QRadioButton, QMessageBox, QDialog, QProgressBar, QTableWidget,
+    QTableWidgetItem, QHeaderView, QInputDialog, QTimeEdit, QDoubleSpinBox
 )
 from PySide6.QtGui import QAction, QDragEnterEvent, QDropEvent, QDesktopServices, QIcon
-from PySide6.QtCore import Qt, QDate, QTimer, QUrl, QSettings, QThread, Signal
+from PySide6.QtCore import Qt, QDate, QTime, QTimer, QUrl, QSettings, QSignalBlocker, QThread, Signal
 import shlex # For proper command quoting
 import platform
-import webbrowser
+import threading
+import uuid
+
+from config_model import UploadConfig, build_command
+from date_histogram import DateHistogram
+from dry_run_cache import (
+    DryRunCache, DryRunRecorder, cache_key, check as check_dry_run, describe as describe_dry_run,
+    nothing_to_upload)
+from folder_index import UPLOADED, FolderIndex, argument_batches, upload_filter
+from job_queue import CANCELLED, DONE, FAILED, FINISHED_STATES, QUEUED, JobQueue
+from log_view import LogConsole
+from media_dates import MEDIA_EXTENSIONS, DateScanner
+from process_runner import ImmichGoProcess
+from prescan import FolderScanner, parse_extensions
+from profiles import DEFAULT_PROFILE, ProfileStore, valid_name
+from progress import AggregateProgress, ProgressParser, format_bytes
+from progress_dashboard import ProgressDashboard
+from release_cache import DEFAULT_TTL, ReleaseCache
+from shard_planner import plan_archives, plan_folder
+from sidecar_matcher import METHODS
+from startup_profile import record_phase, startup_phase
+from takeout_checkpoint import DEFAULT_GROUP_SIZE, ArchiveTracker, TakeoutJournal, count_media, make_groups
+from takeout_inspector import inspect_takeout
+from throttle import PRIORITIES, ThrottleSchedule, apply_priority
+
+record_phase("module_imports", STARTUP_TIME)
+
+FIRST_PAINT_BUDGET_MS = 1000  # Startup must paint within this budget without network access
+
+
+def parse_version(text):
+    """Return the first x.y.z version in text as a tuple of ints, or None."""
+    match = re.search(r"(\d+)\.(\d+)\.(\d+)", text or "")
+    return tuple(int(part) for part in match.groups()) if match else None
+
+
+class BinaryCheckThread(QThread):
+    """Check binary presence, installed version and the latest release off the GUI thread."""
+    check_complete = Signal(dict)
+
+    def __init__(self, binary_path, release_cache):
+        super().__init__()
+        self.binary_path = binary_path
+        self.release_cache = release_cache
+
+    def installed_version(self):
+        try:
+            result = subprocess.run(
+                [self.binary_path, "version"],
+                capture_output=True, text=True, timeout=10,
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        version = parse_version(result.stdout + result.stderr)
+        return ".".join(map(str, version)) if version else None
+
+    def run(self):
+        result = {
+            "present": os.path.exists(self.binary_path),
+            "installed_version": None,
+            "latest_version": None,
+            "update_available": False,
+        }
+        # Refreshes the on-disk cache at most once per TTL
+        release = self.release_cache.get()
+        if release:
+            result["latest_version"] = release["tag"]
+        if result["present"]:
+            result["installed_version"] = self.installed_version()
+            installed = parse_version(result["installed_version"])
+            latest = parse_version(result["latest_version"])
+            result["update_available"] = bool(installed and latest and latest > installed)
+        self.check_complete.emit(result)
+
+
+class BinaryDownloadThread(QThread):
+    """Download and extract an immich-go release archive without blocking the UI."""
+    download_progress = Signal(int)
+    download_complete = Signal(str)
+    download_error = Signal(str)
+    extraction_error = Signal(str)
+
+    progress_interval = 0.25  # Seconds between progress signals
+
+    def __init__(self, download_url, binary_path, segments=4):
+        super().__init__()
+        self.download_url = download_url
+        self.binary_path = binary_path
+        self.segments = segments
+        self.cancel_event = threading.Event()
+        self.last_progress_time = 0.0
+        self.last_progress = -1
+
+    def cancel(self):
+        """Stop at the next chunk; the .part file is kept so the next attempt resumes."""
+        self.cancel_event.set()
+
+    def report_progress(self, downloaded, total):
+        if total <= 0:
+            return
+        progress = min(100, int((downloaded / total) * 100))
+        now = time.monotonic()
+        if progress != self.last_progress and (
+                progress == 100 or now - self.last_progress_time >= self.progress_interval):
+            self.last_progress_time = now
+            self.last_progress = progress
+            self.download_progress.emit(progress)
+
+    def run(self):
+        # Deferred import: requests is only needed once a download actually happens
+        from downloader import DownloadCancelled, ResumableDownloader, extract_binary
+
+        archive_name = self.download_url.rsplit("/", 1)[-1]
+        archive_path = os.path.join(os.path.dirname(self.binary_path), archive_name)
+        downloader = ResumableDownloader(
+            self.download_url, archive_path,
+            segments=self.segments,
+            progress_callback=self.report_progress,
+            cancel_event=self.cancel_event,
+        )
+        try:
+            downloader.download()
+        except DownloadCancelled:
+            return
+        except Exception as e:
+            self.download_error.emit(str(e))
+            return
+
+        try:
+            extract_binary(archive_path, self.binary_path)
+        except Exception as e:
+            self.extraction_error.emit(str(e))
+            return
+        finally:
+            if os.path.exists(archive_path):
+                os.remove(archive_path)
+
+        self.download_complete.emit(self.binary_path)
+
+
+class FolderScanThread(QThread):
+    """Pre-scan a local upload folder, reporting incremental summaries."""
+    scan_progress = Signal(object)
+    scan_complete = Signal(object)
+
+    def __init__(self, root, extensions=None):
+        super().__init__()
+        self.scanner = FolderScanner(root, extensions, progress_callback=self.scan_progress.emit)
+
+    def cancel(self):
+        self.scanner.cancel()
+
+    def run(self):
+        self.scan_complete.emit(self.scanner.scan())
+
+
+class DateScanThread(QThread):
+    """Date the media of a local upload folder, reporting incremental summaries."""
+    scan_progress = Signal(object)
+    scan_complete = Signal(object)
+
+    def __init__(self, root, db_path, extensions=None):
+        super().__init__()
+        self.db_path = db_path
+        self.scanner = DateScanner(root, db_path, extensions, progress_callback=self.scan_progress.emit)
+
+    def cancel(self):
+        self.scanner.cancel()
+
+    def run(self):
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.scan_complete.emit(self.scanner.scan())
+
+
+class ShardPlanThread(QThread):
+    """Measure a source and split it into byte-balanced shards."""
+    plan_complete = Signal(object, int, object)  # shards, total files (0 if unknown), total bytes
+    plan_error = Signal(str)
+
+    def __init__(self, kind, sources, count, extensions=None):
+        super().__init__()
+        self.kind = kind
+        self.sources = sources
+        self.count = count
+        self.extensions = extensions
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            if self.kind == "takeout":
+                shards = plan_archives(self.sources, self.count)
+                self.plan_complete.emit(shards, 0, sum(shard.bytes for shard in shards))
+                return
+            root = self.sources[0]
+            summary = FolderScanner(root, self.extensions, cancel_event=self.cancel_event).scan()
+            shards = plan_folder(root, summary.top_level, self.count, self.extensions, self.cancel_event)
+        except Exception as e:
+            self.plan_error.emit(str(e))
+            return
+        if not self.cancel_event.is_set():
+            self.plan_complete.emit(shards, summary.files, summary.bytes)
+
+
+class ArchiveCountThread(QThread):
+    """Count the media files of Takeout ZIPs from their central directories."""
+    count_complete = Signal(object)  # {path: media files}
+    count_error = Signal(str)
+
+    def __init__(self, sources):
+        super().__init__()
+        self.sources = sources
+
+    def run(self):
+        try:
+            counts = {path: count_media(path) for path in self.sources}
+        except Exception as e:
+            self.count_error.emit(str(e))
+            return
+        self.count_complete.emit(counts)
+
+
+class DryRunCheckThread(QThread):
+    """Fingerprint the sources of a run and look up a cached dry run of them."""
+    check_complete = Signal(object)  # dry_run_cache.DryRunCheck
+
+    def __init__(self, cache, key, kind, sources, dry_run):
+        super().__init__()
+        self.cache = cache
+        self.key = key
+        self.kind = kind
+        self.sources = sources
+        self.dry_run = dry_run
+
+    def run(self):
+        self.check_complete.emit(check_dry_run(self.cache, self.key, self.kind, self.sources, self.dry_run))
+
+
+class IndexRefreshThread(QThread):
+    """Update the folder index and work out what changed since the last upload."""
+    refresh_complete = Signal(object, object, object)  # RefreshResult, batches of delta paths, DedupResult
+    refresh_error = Signal(str)
+
+    def __init__(self, db_path, root, server, dedup=False):
+        super().__init__()
+        self.db_path = db_path
+        self.root = root
+        self.server = server
+        self.dedup = dedup
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            index = FolderIndex(self.db_path, self.root, self.server)
+            dedup_result = None
+            try:
+                result = index.refresh(cancel_event=self.cancel_event)
+                if self.dedup and not result.cancelled:
+                    dedup_result = self.find_duplicates(index)
+                    result.cancelled = dedup_result.cancelled
+                    result.pending_files, result.pending_bytes = index.pending_totals()
+                batches = [] if result.cancelled else index.delta_arguments()
+            finally:
+                index.close()
+        except Exception as e:
+            self.refresh_error.emit(str(e))
+            return
+        self.refresh_complete.emit(result, batches, dedup_result)
+
+    def find_duplicates(self, index):
+        # Deferred import: the process pool is only needed when deduplicating
+        from dedup import HashCache, find_duplicates
+
+        files = index.indexed_files()
+        # Copies already on the server are the ones to keep
+        keep = [path for path, _, _, status in files if status == UPLOADED]
+        cache = HashCache(self.db_path)
+        try:
+            dedup_result = find_duplicates(
+                [(path, size, mtime_ns) for path, size, mtime_ns, _ in files],
+                cache, keep=keep, cancel_event=self.cancel_event)
+        finally:
+            cache.close()
+        if not dedup_result.cancelled:
+            index.set_duplicates(dedup_result.duplicates)
+        return dedup_result
+
+
+class TakeoutInspectThread(QThread):
+    """Inventory Takeout archives from their central directories."""
+    inspect_complete = Signal(object)
+
+    def __init__(self, sources):
+        super().__init__()
+        self.sources = sources
+
+    def run(self):
+        self.inspect_complete.emit(inspect_takeout(self.sources))
+
+
+class TakeoutDuplicateThread(QThread):
+    """Report duplicate media in Takeout ZIPs (from their central directories) or an extracted folder."""
+    check_complete = Signal(int, int, int)  # media files, duplicates, duplicate bytes
+    check_error = Signal(str)
+
+    def __init__(self, sources, zipped, db_path):
+        super().__init__()
+        self.sources = sources
+        self.zipped = zipped
+        self.db_path = db_path
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        from dedup import HashCache, find_duplicates, walk_files, zip_duplicates
+
+        try:
+            if self.zipped:
+                counts = zip_duplicates(self.sources, self.cancel_event)
+                if counts is not None:
+                    self.check_complete.emit(*counts)
+                return
+            files = [item for source in self.sources for item in walk_files(source)
+                     if not item[0].lower().endswith(".json")]
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            cache = HashCache(self.db_path)
+            try:
+                result = find_duplicates(files, cache, cancel_event=self.cancel_event)
+            finally:
+                cache.close()
+            if result.cancelled:
+                return
+            self.check_complete.emit(len(files), len(result.duplicates), result.saved_bytes)
+        except Exception as e:
+            self.check_error.emit(str(e))
+
 
 class ImmichGoGUI(QMainWindow):
+    first_painted = Signal(float)
+
+    # Binary status state machine: state -> (status bar message, style)
+    BINARY_STATES = {
+        "checking": ("⏳ Checking Immich-Go binary...", "color: gray;"),
+        "missing": ("❌ Immich-Go binary not found", "color: red;"),
+        "downloading": ("⬇️ Downloading Immich-Go binary...", "color: #1565C0;"),
+        "ready": ("✓ Immich-Go {detail}", "color: green;"),
+        "update_available": ("⬆️ Immich-Go update available: {detail}", "color: orange;"),
+        "error": ("❌ Immich-Go binary: {detail}", "color: red;"),
+    }
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Immich-Go GUI")
@@ -71,13 +434,32 @@ class ImmichGoGUI(QMainWindow):
                 color: #90A4AE;
             }
         """)
+        # One upload limit shared by all runs, each run with a proxy of its own
+        self.upload_mbps = 0
+        self.upload_bucket = None  # Created with the first proxy
+        self.run_proxies = {}  # "run" or job id -> LocalProxy
+        self.dry_run_check_thread = None
+        self.dry_run_recording = None  # (DryRunCheck, kind, command parts, sources, DryRunRecorder) of a dry run
+        self.process_priorities = {}  # pid -> priority class last applied
+        self.throttle_timer = QTimer(self)
+        self.throttle_timer.setInterval(60 * 1000)  # Daytime/night switches happen within a minute
+        self.throttle_timer.timeout.connect(self.apply_throttle_schedule)
+
+        with startup_phase("profile_bar"):
+            self.create_profile_bar()
         # Add the tab widget to the main layout
         self.main_layout.addWidget(self.tab_widget)
 
-        self.create_menu_bar()
-        self.create_configuration_tab()
-        self.create_google_takeout_tab()
-        self.create_local_upload_tab()
+        with startup_phase("menu_bar"):
+            self.create_menu_bar()
+        with startup_phase("configuration_tab"):
+            self.create_configuration_tab()
+        with startup_phase("google_takeout_tab"):
+            self.create_google_takeout_tab()
+        with startup_phase("local_upload_tab"):
+            self.create_local_upload_tab()
+        with startup_phase("jobs_tab"):
+            self.create_jobs_tab()
 
         # Command Preview Section with refined size policy
         self.command_preview = QTextEdit()
@@ -92,35 +474,71 @@ class ImmichGoGUI(QMainWindow):
         self.status_indicator.setAlignment(Qt.AlignCenter)
         self.main_layout.addWidget(self.status_indicator)
 
-        # Timer for command preview update
-        self.command_update_timer = QTimer(self)
-        self.command_update_timer.timeout.connect(self.update_command_preview)
-        self.command_update_timer.start(300)
+        # Counters, throughput and ETA of the running job
+        self.progress_dashboard = ProgressDashboard()
+        self.progress_dashboard.hide()
+        self.main_layout.addWidget(self.progress_dashboard)
+
+        # CPU, memory, disk and network use of the running immich-go processes,
+        # created with the first run, see monitor_process
+        self.resource_panel = None
+        self.progress_parser = None
+
+        # Live output of the running immich-go process
+        self.output_view = LogConsole()
+        self.output_view.setMinimumHeight(160)
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop_command)
+        self.output_view.header.addWidget(self.stop_button)
+        self.main_layout.addWidget(self.output_view)
+        self.running_process = None
+
+        # The command preview is rebuilt on widget changes, debounced so a burst
+        # of edits (typing, loading the configuration) renders only once
+        self.preview_cache = None
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(50)
+        self.preview_timer.timeout.connect(self.update_command_preview)
+        self.connect_preview_signals()
 
         self.settings = QSettings("YourOrganization", "ImmichGoGUI")
-
-        # Check for and update (or download) the immich-go binary
-        self.update_binary()
-
-        self.load_configuration()
-
-    @staticmethod
-    def get_latest_release_info():
-        """Fetch the latest release information from GitHub."""
-        try:
-            # GitHub API to get the latest release
-            api_url = "https://api.github.com/repos/simulot/immich-go/releases/latest"
-            response = requests.get(api_url)
-            response.raise_for_status()
-            release_data = response.json()
-
-            # Get the release tag (version)
-            latest_version = release_data['tag_name']
-
-            return latest_version
-        except Exception as e:
-            print(f"Failed to fetch release information: {e}")
-            return None
+        self.profiles = ProfileStore(self.settings)
+        self.checkpoint_group_spin.setValue(
+            self.settings.value("checkpoint_group_size", DEFAULT_GROUP_SIZE, type=int))
+        self.checkpoint_group_spin.valueChanged.connect(
+            lambda value: self.settings.setValue("checkpoint_group_size", value))
+
+        # The binary is checked (and downloaded if needed) in the background once
+        # the window has painted, see paintEvent
+        self.binary_path = self.get_binary_path()
+        self.binary_check_thread = None
+        self.download_thread = None
+        self.first_paint_ms = None
+        self.create_status_bar()
+
+        with startup_phase("load_configuration"):
+            self.load_configuration()
+
+    def get_binary_folder(self):
+        return os.path.abspath(os.path.join(os.getcwd(), "immich-go"))
+
+    def get_metrics_path(self, name):
+        """CSV file for the resource samples of one run or job."""
+        return os.path.join(self.get_binary_folder(), "metrics", f"{name}.csv")
+
+    def get_release_cache(self):
+        """Release metadata cache stored next to the binary; the TTL is configurable in the settings."""
+        if not hasattr(self, "release_cache"):
+            ttl = self.settings.value("release_cache_ttl", DEFAULT_TTL, type=int)
+            cache_path = os.path.join(self.get_binary_folder(), "release.json")
+            self.release_cache = ReleaseCache(cache_path, ttl=ttl)
+        return self.release_cache
+
+    def get_latest_release_info(self, allow_network=True):
+        """Return the latest release metadata, from the local cache whenever it is fresh."""
+        return self.get_release_cache().get(allow_network=allow_network)
 
     def get_download_url(self, version=None):
         """Generate the appropriate download URL based on the system."""
@@ -145,308 +563,555 @@ class ImmichGoGUI(QMainWindow):
 
         key = (os_name, arch)
         if key in download_mapping:
+            filename = download_mapping[key]
+
             # Use provided version or fetch latest
             if version is None:
-                version = self.get_latest_release_info() or '0.22.1'
+                release = self.get_latest_release_info(allow_network=False)
+                asset = ReleaseCache.find_asset(release, filename)
+                if asset and asset.get("url"):
+                    return asset["url"]
+                version = release["tag"] if release else '0.22.1'
 
-            filename = download_mapping[key]
             return f'https://github.com/simulot/immich-go/releases/download/{version}/{filename}'
 
         return None
 
-    def update_binary(self):
-        binary_folder = os.path.abspath(os.path.join(os.getcwd(), "immich-go"))
-        if not os.path.exists(binary_folder):
-            os.makedirs(binary_folder)
-
+    def get_binary_path(self):
         # Determine correct binary name for OS
         binary_filename = "immich-go.exe" if sys.platform.startswith("win") else "immich-go"
-        binary_path = os.path.join(binary_folder, binary_filename)
-        self.binary_path = binary_path
-
-        # Check if binary exists
-        if not os.path.exists(binary_path):
-            # Create download progress dialog
-            progress_dialog = QDialog(self)
-            progress_dialog.setWindowTitle("Downloading Immich-Go")
-            progress_dialog.setFixedWidth(400)
-
-            layout = QVBoxLayout()
-
-            # Status label
-            status_label = QLabel("Downloading Immich-Go binary...")
-            layout.addWidget(status_label)
+        return os.path.join(self.get_binary_folder(), binary_filename)
+
+    def create_status_bar(self):
+        status_bar = self.statusBar()
+        self.binary_status_label = QLabel()
+        status_bar.addWidget(self.binary_status_label, 1)
+
+        self.download_progress_bar = QProgressBar()
+        self.download_progress_bar.setRange(0, 100)
+        self.download_progress_bar.setMaximumWidth(200)
+        self.download_progress_bar.hide()
+        status_bar.addPermanentWidget(self.download_progress_bar)
+
+        self.download_cancel_button = QPushButton("Cancel")
+        self.download_cancel_button.hide()
+        self.download_cancel_button.clicked.connect(self.cancel_binary_download)
+        status_bar.addPermanentWidget(self.download_cancel_button)
+
+        self.binary_update_button = QPushButton("Update")
+        self.binary_update_button.hide()
+        self.binary_update_button.clicked.connect(lambda: self.update_binary(force=True))
+        status_bar.addPermanentWidget(self.binary_update_button)
+
+    def set_binary_state(self, state, detail=""):
+        """Move the binary status state machine to state and reflect it in the status bar."""
+        if state not in self.BINARY_STATES:
+            raise ValueError(f"Unknown binary state: {state}")
+        self.binary_state = state
+        message, style = self.BINARY_STATES[state]
+        self.binary_status_label.setText(message.format(detail=detail))
+        self.binary_status_label.setStyleSheet(style)
+
+        downloading = state == "downloading"
+        self.download_progress_bar.setVisible(downloading)
+        self.download_cancel_button.setVisible(downloading)
+        self.binary_update_button.setVisible(state == "update_available")
+        if downloading:
+            self.download_progress_bar.setValue(0)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.first_paint_ms is None:
+            self.first_paint_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+            if self.first_paint_ms > FIRST_PAINT_BUDGET_MS:
+                print(f"Time to first paint {self.first_paint_ms:.0f} ms exceeds the "
+                      f"{FIRST_PAINT_BUDGET_MS} ms budget")
+            self.first_painted.emit(self.first_paint_ms)
+            # The window is on screen; now it is safe to look at the binary
+            QTimer.singleShot(0, self.start_binary_check)
+
+    def closeEvent(self, event):
+        if self.folder_scan_thread is not None and self.folder_scan_thread.isRunning():
+            self.folder_scan_thread.cancel()
+            self.folder_scan_thread.wait(5000)
+        if self.takeout_dedup_thread is not None and self.takeout_dedup_thread.isRunning():
+            self.takeout_dedup_thread.cancel()
+            self.takeout_dedup_thread.wait(5000)
+        if self.takeout_inspect_thread is not None and self.takeout_inspect_thread.isRunning():
+            self.takeout_inspect_thread.wait(5000)
+        if self.date_scan_thread is not None and self.date_scan_thread.isRunning():
+            self.date_scan_thread.cancel()
+            self.date_scan_thread.wait(5000)
+        if self.shard_plan_thread is not None and self.shard_plan_thread.isRunning():
+            self.shard_plan_thread.cancel()
+            self.shard_plan_thread.wait(5000)
+        if self.archive_count_thread is not None and self.archive_count_thread.isRunning():
+            self.archive_count_thread.wait(5000)
+        if self.dry_run_check_thread is not None and self.dry_run_check_thread.isRunning():
+            self.dry_run_check_thread.wait(5000)
+        if self.index_thread is not None and self.index_thread.isRunning():
+            self.index_thread.cancel()
+            self.index_thread.wait(5000)
+        for process, _ in self.job_runs.values():
+            # Leave the job marked as running so it is re-queued on the next start
+            process.process_finished.disconnect()
+            process.stop()
+            if not process.process.waitForFinished(5000):
+                process.kill()
+        if self.running_process is not None:
+            self.running_process.stop()
+            if not self.running_process.process.waitForFinished(5000):
+                self.running_process.kill()
+        self.output_view.shutdown()
+        if self.download_thread is not None and self.download_thread.isRunning():
+            self.download_thread.cancel()
+            self.download_thread.wait(5000)
+        if self.binary_check_thread is not None and self.binary_check_thread.isRunning():
+            self.binary_check_thread.wait(5000)
+        for proxy in self.run_proxies.values():
+            proxy.stop()
+        super().closeEvent(event)
+
+    def start_binary_check(self):
+        """Check binary presence, version and updates in a background thread."""
+        if not self.isVisible():
+            return
+        if self.binary_check_thread is not None and self.binary_check_thread.isRunning():
+            return
+        self.set_binary_state("checking")
+        self.binary_check_thread = BinaryCheckThread(self.binary_path, self.get_release_cache())
+        self.binary_check_thread.check_complete.connect(self.handle_binary_check)
+        self.binary_check_thread.start()
+
+    def handle_binary_check(self, result):
+        if not result["present"]:
+            self.set_binary_state("missing")
+            self.update_binary()
+        elif result["update_available"]:
+            self.set_binary_state("update_available",
+                f"{result['installed_version']} → {result['latest_version']}")
+        elif result["installed_version"]:
+            self.set_binary_state("ready", result["installed_version"])
+        else:
+            self.set_binary_state("ready", "unknown version")
 
-            # Progress bar
-            progress_bar = QProgressBar()
-            progress_bar.setRange(0, 100)
-            layout.addWidget(progress_bar)
+    def update_binary(self, force=False):
+        """Start a background download of the immich-go binary if it is missing (or force is set).
 
-            # Cancel button
-            cancel_button = QPushButton("Cancel")
-            layout.addWidget(cancel_button)
+        Returns True if the binary is already in place, False if it is being downloaded
+        or the download could not be started.
+        """
+        binary_folder = self.get_binary_folder()
+        if not os.path.exists(binary_folder):
+            os.makedirs(binary_folder)
+        binary_path = self.binary_path
 
-            progress_dialog.setLayout(layout)
+        if os.path.exists(binary_path) and not force:
+            return True
+        if self.download_thread is not None and self.download_thread.isRunning():
+            return False
 
-            # Prevent closing the dialog
-            progress_dialog.setWindowFlags(progress_dialog.windowFlags() & ~Qt.WindowCloseButtonHint)
+        try:
+            # Cache only: the background check has already refreshed the release metadata
+            download_url = self.get_download_url()
 
-            # Thread for download to keep UI responsive
-            class DownloadThread(QThread):
-                download_progress = Signal(int)
-                download_complete = Signal(bytes)
-                download_error = Signal(str)
+            if not download_url:
+                raise ValueError("Could not determine download URL for your system")
 
-                def __init__(self, download_url):
-                    super().__init__()
-                    self.download_url = download_url
+            download_thread = BinaryDownloadThread(download_url, binary_path)
+            # Keep a reference so a cancelled thread can finish checkpointing
+            self.download_thread = download_thread
 
-                def run(self):
-                    try:
-                        response = requests.get(self.download_url, stream=True)
-                        response.raise_for_status()
+            download_thread.download_progress.connect(self.download_progress_bar.setValue)
+            download_thread.download_complete.connect(self.handle_download_complete)
+            download_thread.download_error.connect(self.handle_download_error)
+            download_thread.extraction_error.connect(self.handle_extraction_error)
 
-                        total_size = int(response.headers.get('content-length', 0))
-                        block_size = 1024  # 1 Kibibyte
-                        downloaded_size = 0
+            self.set_binary_state("downloading")
+            download_thread.start()
 
-                        # Buffer to store downloaded content
-                        content = io.BytesIO()
+        except Exception as e:
+            self.set_binary_state("error", str(e))
+            QMessageBox.critical(self, "Download Error",
+                f"Failed to initiate download: {str(e)}\n\n"
+                "Please download manually from GitHub.")
+
+        return False
+
+    def cancel_binary_download(self):
+        if self.download_thread is not None:
+            # Stop at the next chunk; the partial download is resumed next time
+            self.download_thread.cancel()
+        if os.path.exists(self.binary_path):
+            # A cancelled update leaves the installed binary untouched
+            self.start_binary_check()
+        else:
+            self.set_binary_state("missing")
+
+    def handle_download_complete(self, path):
+        # Re-run the check so the status bar shows the installed version
+        self.start_binary_check()
+
+    def handle_extraction_error(self, error):
+        self.set_binary_state("error", "extraction failed")
+        QMessageBox.critical(self, "Extraction Error",
+            f"Failed to extract binary: {error}\n\n"
+            "Please download manually from GitHub.")
+
+    def handle_download_error(self, error):
+        self.set_binary_state("error", "download failed")
+        # If download fails, show manual download dialog
+        error_dialog = QDialog(self)
+        error_dialog.setWindowTitle("Binary Download Failed")
+        error_dialog.setFixedWidth(450)
+
+        layout = QVBoxLayout()
+
+        # Error message
+        error_label = QLabel("Automatic binary download failed")
+        error_label.setStyleSheet("color: red; font-weight: bold;")
+        layout.addWidget(error_label)
+
+        # Detailed error information
+        details_label = QLabel(f"Error: {error}")
+        details_label.setWordWrap(True)
+        layout.addWidget(details_label)
+
+        # Manual download instructions (cached metadata only, never block the UI here)
+        release = self.get_latest_release_info(allow_network=False)
+        version = release["tag"] if release else "latest"
+        download_url = "https://github.com/simulot/immich-go/releases/tag/" + version
+
+        instructions_label = QLabel(
+            "Please download the binary manually:\n\n"
+            f"1. Visit: {download_url}\n"
+            f"2. Download the appropriate binary for your system\n"
+            f"3. Place it in: {self.get_binary_folder()}\n"
+            "4. Rename to 'immich-go' (or 'immich-go.exe' on Windows)\n"
+            "5. Ensure it has executable permissions"
+        )
+        instructions_label.setWordWrap(True)
+        layout.addWidget(instructions_label)
+
+        # URL copy button
+        url_layout = QHBoxLayout()
+        url_edit = QLineEdit(download_url)
+        url_edit.setReadOnly(True)
+        copy_btn = QPushButton("Copy URL")
+        copy_btn.clicked.connect(lambda: QApplication.clipboard().setText(download_url))
+        url_layout.addWidget(url_edit)
+        url_layout.addWidget(copy_btn)
+        layout.addLayout(url_layout)
+
+        # Open browser button
+        open_btn = QPushButton("Open Download Page")
+        open_btn.clicked.connect(lambda: QDesktopServices.openUrl(QUrl(download_url)))
+        layout.addWidget(open_btn)
+
+        error_dialog.setLayout(layout)
+        error_dialog.exec()
+
+    def build_command(self, command_parts):
+        return build_command(self.binary_path, command_parts, self.get_config_options())
+
+    def launch_command(self, command_parts):
+        """(command, proxy) for an actual run: with throttling or the metadata cache
+        on, --server is a local proxy, otherwise proxy is None."""
+        config = self.current_config()
+        proxy = None
+        if (self.throttle_group.isChecked() or self.cache_group.isChecked()) and config.server_url:
+            cache_ttl = self.cache_ttl_spin.value() if self.cache_group.isChecked() else 0
+            proxy = self.start_proxy(config.server_url, not config.skip_ssl, cache_ttl)
+            if proxy is not None:
+                config.server_url = proxy.url
+        return build_command(self.binary_path, command_parts, config.config_options()), proxy
+
+    def monitor_process(self, key, pid, csv_path):
+        if self.resource_panel is None:
+            # Deferred import: psutil is only loaded once a process runs
+            from resource_panel import DEFAULT_INTERVAL, ResourcePanel
+
+            self.resource_panel = ResourcePanel()
+            self.resource_panel.interval_spin.setValue(
+                self.settings.value("resource_monitor_interval", DEFAULT_INTERVAL, type=int))
+            self.resource_panel.interval_spin.valueChanged.connect(
+                lambda seconds: self.settings.setValue("resource_monitor_interval", seconds))
+            self.main_layout.insertWidget(self.main_layout.indexOf(self.progress_dashboard) + 1, self.resource_panel)
+        self.resource_panel.add_process(key, pid, csv_path)
+
+    def unmonitor_process(self, key):
+        """Stop monitoring a run or job; returns its resource summary or None."""
+        if self.resource_panel is None:
+            return None
+        return self.resource_panel.remove_process(key)
 
-                        for data in response.iter_content(block_size):
-                            downloaded_size += len(data)
-                            content.write(data)
+    def report_proxy(self, key, prefix=""):
+        """Show what the proxy did for a finished run or job, and stop it."""
+        proxy = self.run_proxies.pop(key, None)
+        if proxy is not None:
+            # Deferred import: local_proxy is loaded with the first proxy
+            from local_proxy import describe
 
-                            # Calculate and emit progress
-                            if total_size > 0:
-                                progress = int((downloaded_size / total_size) * 100)
-                                self.download_progress.emit(progress)
+            self.output_view.append_lines("stdout", [f"{prefix}[proxy] {describe({}, proxy.snapshot())}"])
+            # Shutting the server down waits out its poll interval
+            threading.Thread(target=proxy.stop, daemon=True).start()
 
-                        self.download_complete.emit(content.getvalue())
+    def start_proxy(self, server_url, verify_ssl, cache_ttl):
+        # Deferred import: http.client and ssl are only needed once a run goes through a proxy
+        from local_proxy import LocalProxy, TokenBucket, mbps_to_bytes
 
-                    except Exception as e:
-                        self.download_error.emit(str(e))
+        if self.upload_bucket is None:
+            self.upload_bucket = TokenBucket(mbps_to_bytes(self.upload_mbps))
+        try:
+            return LocalProxy(server_url, verify_ssl, self.upload_bucket, cache_ttl=cache_ttl).start()
+        except (OSError, ValueError) as e:
+            print(f"Cannot start the throttling proxy, uploading unthrottled: {e}")
+            return None
 
-            # Set up download thread
-            try:
-                download_url = self.get_download_url()
-
-                if not download_url:
-                    raise ValueError("Could not determine download URL for your system")
-
-                download_thread = DownloadThread(download_url)
-
-                # Connect signals
-                def update_progress(value):
-                    progress_bar.setValue(value)
-
-                def handle_download_complete(content):
-                    progress_dialog.accept()
-
-                    # Determine extraction method based on file type
-                    try:
-                        if download_url.endswith('.zip'):
-                            import zipfile
-                            with zipfile.ZipFile(io.BytesIO(content)) as z:
-                                # Extract the binary, handling different archive structures
-                                for filename in z.namelist():
-                                    if filename.endswith('immich-go') or filename.endswith('immich-go.exe'):
-                                        with z.open(filename) as source, open(binary_path, 'wb') as target:
-                                            target.write(source.read())
-                                        break
-                        elif download_url.endswith('.tar.gz'):
-                            import tarfile
-                            with tarfile.open(fileobj=io.BytesIO(content), mode='r:gz') as tar:
-                                # Extract the binary, handling different archive structures
-                                for member in tar.getmembers():
-                                    if member.name.endswith('immich-go') or member.name.endswith('immich-go.exe'):
-                                        source = tar.extractfile(member)
-                                        with open(binary_path, 'wb') as target:
-                                            target.write(source.read())
-                                        break
-                        else:
-                            raise ValueError("Unsupported archive type")
-
-                        # Set executable permissions for non-Windows systems
-                        if not sys.platform.startswith("win"):
-                            os.chmod(binary_path, 0o755)
-
-                    except Exception as extraction_error:
-                        QMessageBox.critical(self, "Extraction Error",
-                            f"Failed to extract binary: {str(extraction_error)}\n\n"
-                            "Please download manually from GitHub.")
-
-                def handle_download_error(error):
-                    progress_dialog.reject()
-                    # If download fails, show manual download dialog
-                    error_dialog = QDialog(self)
-                    error_dialog.setWindowTitle("Binary Download Failed")
-                    error_dialog.setFixedWidth(450)
-
-                    layout = QVBoxLayout()
-
-                    # Error message
-                    error_label = QLabel("Automatic binary download failed")
-                    error_label.setStyleSheet("color: red; font-weight: bold;")
-                    layout.addWidget(error_label)
-
-                    # Detailed error information
-                    details_label = QLabel(f"Error: {error}")
-                    details_label.setWordWrap(True)
-                    layout.addWidget(details_label)
-
-                    # Manual download instructions
-                    version = self.get_latest_release_info() or "latest"
-                    download_url = "https://github.com/simulot/immich-go/releases/tag/" + version
-
-                    instructions_label = QLabel(
-                        "Please download the binary manually:\n\n"
-                        f"1. Visit: {download_url}\n"
-                        f"2. Download the appropriate binary for your system\n"
-                        f"3. Place it in: {binary_folder}\n"
-                        "4. Rename to 'immich-go' (or 'immich-go.exe' on Windows)\n"
-                        "5. Ensure it has executable permissions"
-                    )
-                    instructions_label.setWordWrap(True)
-                    layout.addWidget(instructions_label)
-
-                    # URL copy button
-                    url_layout = QHBoxLayout()
-                    url_edit = QLineEdit(download_url)
-                    url_edit.setReadOnly(True)
-                    copy_btn = QPushButton("Copy URL")
-                    copy_btn.clicked.connect(lambda: QApplication.clipboard().setText(download_url))
-                    url_layout.addWidget(url_edit)
-                    url_layout.addWidget(copy_btn)
-                    layout.addLayout(url_layout)
-
-                    # Open browser button
-                    open_btn = QPushButton("Open Download Page")
-                    open_btn.clicked.connect(lambda: webbrowser.open(download_url))
-                    layout.addWidget(open_btn)
-
-                    error_dialog.setLayout(layout)
-                    error_dialog.exec()
-
-                # Connect thread signals
-                download_thread.download_progress.connect(update_progress)
-                download_thread.download_complete.connect(handle_download_complete)
-                download_thread.download_error.connect(handle_download_error)
-
-                # Setup cancel button
-                def cancel_download():
-                    download_thread.terminate()
-                    progress_dialog.reject()
-
-                cancel_button.clicked.connect(cancel_download)
-
-                # Start the download
-                progress_dialog.show()
-                download_thread.start()
-
-                # Block until dialog is closed
-                progress_dialog.exec()
-
-            except Exception as e:
-                QMessageBox.critical(self, "Download Error",
-                    f"Failed to initiate download: {str(e)}\n\n"
-                    "Please download manually from GitHub.")
-                return False
+    def current_throttle(self):
+        return ThrottleSchedule(
+            enabled=self.throttle_group.isChecked(),
+            day_start=self.throttle_start_edit.time().toString("HH:mm"),
+            day_end=self.throttle_end_edit.time().toString("HH:mm"),
+            day_mbps=self.throttle_day_spin.value(),
+            night_mbps=self.throttle_night_spin.value(),
+            day_priority=PRIORITIES[self.throttle_day_priority_combo.currentIndex()],
+            night_priority=PRIORITIES[self.throttle_night_priority_combo.currentIndex()],
+        )
+
+    def apply_throttle(self, schedule):
+        self.throttle_group.setChecked(schedule.enabled)
+        self.throttle_start_edit.setTime(QTime.fromString(schedule.day_start, "HH:mm"))
+        self.throttle_end_edit.setTime(QTime.fromString(schedule.day_end, "HH:mm"))
+        self.throttle_day_spin.setValue(schedule.day_mbps)
+        self.throttle_night_spin.setValue(schedule.night_mbps)
+        for combo, priority in ((self.throttle_day_priority_combo, schedule.day_priority),
+                                (self.throttle_night_priority_combo, schedule.night_priority)):
+            combo.setCurrentIndex(PRIORITIES.index(priority) if priority in PRIORITIES else 0)
+
+    def running_pids(self):
+        processes = [process for process, _ in self.job_runs.values()]
+        if self.running_process is not None:
+            processes.append(self.running_process)
+        return [process.pid() for process in processes if process.pid() > 0]
+
+    def apply_throttle_schedule(self, *args):
+        """Bring the upload limit and the priority of running processes in line with the schedule."""
+        schedule = self.current_throttle()
+        mbps, priority = schedule.current()
+        self.upload_mbps = mbps
+        if self.upload_bucket is not None:
+            from local_proxy import mbps_to_bytes
+
+            self.upload_bucket.set_rate(mbps_to_bytes(mbps))
+        for pid in self.running_pids():
+            self.prioritize(pid, priority)
+        self.throttle_status_label.setText(schedule.describe())
+        if schedule.enabled:
+            self.throttle_timer.start()
+        else:
+            self.throttle_timer.stop()
 
-        return True
+    def prioritize(self, pid, priority=None):
+        if priority is None:
+            priority = self.current_throttle().current()[1]
+        # A process starts at normal priority; only changes are applied
+        if self.process_priorities.get(pid, "normal") != priority:
+            apply_priority(pid, priority)
+            self.process_priorities[pid] = priority
 
+    def prioritize_new(self, pid):
+        self.process_priorities.pop(pid, None)  # A reused PID starts at normal priority again
+        self.prioritize(pid)
 
     def run_command(self, command_parts=None):
         if command_parts is None:
             command_parts = []
 
         # Ensure binary path is correctly referenced
-        if not hasattr(self, 'binary_path') or not os.path.exists(self.binary_path):
-            if not self.update_binary():  # Check and update binary path
-                QMessageBox.critical(self, "Error", "Immich-Go binary is missing or not executable.")
+        if not os.path.exists(self.binary_path):
+            self.update_binary()  # Starts a background download
+            QMessageBox.critical(self, "Error",
+                "Immich-Go binary is missing or not executable.\n\n"
+                "It is being downloaded; try again once the status bar shows it is ready.")
+            return
+
+        if self.running_process is not None:
+            return
+        if self.dry_run_check_thread is not None and self.dry_run_check_thread.isRunning():
+            return
+
+        kind, sources = self.upload_sources(command_parts)
+        if kind is not None:
+            dry_run = "--dry-run" in command_parts
+            key = cache_key(kind, self.server_url_edit.text(), command_parts)
+            cache = self.get_dry_run_cache()
+            # The sources are fingerprinted before a dry run, and before a real run with a cached dry run
+            if dry_run or os.path.exists(cache.path_for(key)):
+                self.dry_run_check_thread = DryRunCheckThread(cache, key, kind, sources, dry_run)
+                self.dry_run_check_thread.check_complete.connect(
+                    lambda result: self.run_checked_command(command_parts, kind, sources, result))
+                self.run_local_button.setDisabled(True)
+                self.run_takeout_button.setDisabled(True)
+                self.status_indicator.setText("⏳ Checking the sources against the last dry run...")
+                self.status_indicator.setStyleSheet("color: orange; font-weight: bold;")
+                self.dry_run_check_thread.start()
                 return
-
-        # Command structure changed: [binary] [main command] [sub-command] [options]
-        command = [self.binary_path] + command_parts + self.get_config_options()
-
-        try:
-            self.run_local_button.setDisabled(True)
-            self.run_takeout_button.setDisabled(True)
-
-            if sys.platform.startswith("win"):
-                # Properly format the command line for Windows
-                cmd_string = subprocess.list2cmdline(command)
-                proc = subprocess.Popen(
-                    ['cmd', '/c', 'start', 'cmd', '/k', cmd_string],
-                    shell=True,
-                    creationflags=subprocess.CREATE_NEW_CONSOLE
-                )
-                self.running_process = proc.pid
-
-            elif sys.platform.startswith("darwin"):
-                # MacOS handling (unchanged)
-                apple_script = f'tell application "Terminal" to do script "{shlex.join(command)}; exec bash"'
-                proc = subprocess.Popen(["osascript", "-e", apple_script])
-                self.running_process = proc
-
-            else:  # Linux
-                # Linux handling (unchanged)
-                terminals = [
-                    ("gnome-terminal", "--", "bash", "-c", f"{shlex.join(command)}; exec bash"),
-                    ("konsole", "-e", "bash", "-c", f"{shlex.join(command)}; exec bash"),
-                    ("xfce4-terminal", "-e", "bash", "-c", f"{shlex.join(command)}; exec bash"),
-                    ("xterm", "-hold", "-e", shlex.join(command))
-                ]
-                for term in terminals:
-                    try:
-                        proc = subprocess.Popen(term)
-                        self.running_process = proc
-                        break
-                    except FileNotFoundError:
-                        continue
-                else:
-                    QMessageBox.critical(self, "Error", "No suitable terminal emulator found.")
-                    self.run_local_button.setDisabled(False)
-                    self.run_takeout_button.setDisabled(False)
-                    return
-
-            # Start timer to monitor process
-            self.check_process_timer = QTimer()
-            self.check_process_timer.timeout.connect(self.check_if_process_running)
-            self.check_process_timer.start(1000)
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to run command: {e}")
-            self.run_local_button.setDisabled(False)
-            self.run_takeout_button.setDisabled(False)
-            self.running_process = None
-
-
-    def check_if_process_running(self):
-        still_running = False
-
-        if sys.platform.startswith("win"):
-            # On Windows, check if the stored PID is still running
-            if psutil.pid_exists(self.running_process):
-                still_running = True
-
+        self.start_run(command_parts)
+
+    def get_dry_run_cache(self):
+        return DryRunCache(os.path.join(self.get_binary_folder(), "dry-runs"))
+
+    def upload_sources(self, command_parts):
+        """("takeout" or "local", source paths) of a Run button's command, or (None, None)."""
+        config = self.current_config()
+        if command_parts[:2] == ["upload", "from-google-photos"]:
+            kind, sources = "takeout", config.takeout_sources()
+        elif command_parts[:2] == ["upload", "from-folder"] and config.local_path:
+            kind, sources = "local", [config.local_path]
         else:
-            # On Linux/macOS, use the Popen object to check process status
-            if hasattr(self.running_process, "poll") and self.running_process.poll() is None:
-                still_running = True
-
-        if still_running:
-            self.status_indicator.setText("⚠️ Please close the Immich-Go terminal window to process more.")
-            self.status_indicator.setStyleSheet("color: orange; font-weight: bold;")
+            return None, None
+        if not sources or command_parts[-len(sources):] != sources:
+            return None, None
+        return kind, sources
+
+    def run_checked_command(self, command_parts, kind, sources, result):
+        """Run after the dry-run check: record a dry run, or narrow a real run with a cached one."""
+        notes = []
+        if "--dry-run" in command_parts:
+            self.start_run(command_parts)
+            self.dry_run_recording = (result, kind, command_parts, sources, DryRunRecorder())
+            return
+        entry = result.entry
+        if entry is not None and result.changed:
+            notes.append(f"[dry-run cache] Stale: {len(result.changed)} source(s) changed since the "
+                         f"{describe_dry_run(entry)}; running the full analysis")
+            self.get_dry_run_cache().remove(result.key)
+        elif entry is not None:
+            command_parts, note = self.reuse_dry_run(command_parts, kind, sources, result)
+            if command_parts is None:
+                self.update_status()
+                self.statusBar().showMessage(note, 10000)
+                return
+            notes.append(note)
+            # The real run changes what is on the server, so the dry run is used up
+            self.get_dry_run_cache().remove(result.key)
+        self.start_run(command_parts)
+        self.output_view.append_lines("stdout", notes)
+
+    def reuse_dry_run(self, command_parts, kind, sources, result):
+        """(command parts, note) for a real run whose sources match a cached dry run; parts are None if nothing runs."""
+        entry = result.entry
+        summary = describe_dry_run(entry)
+        base_parts = command_parts[:len(command_parts) - len(sources)]
+        if nothing_to_upload(entry):
+            answer = QMessageBox.question(self, "Reuse Dry Run",
+                f"The {summary} found nothing to upload, and the sources have not changed since.\n\n"
+                "Run immich-go anyway?")
+            if answer != QMessageBox.Yes:
+                return None, f"Skipped: the {summary} found nothing to upload"
+            return command_parts, f"[dry-run cache] Running although the {summary} found nothing to upload"
+        if not result.narrowed or kind == "takeout" and len(result.narrowed) == len(sources):
+            return command_parts, f"[dry-run cache] The {summary} matches, but cannot narrow this run down"
+        if kind == "takeout":
+            question = (f"leave out the {len(sources) - len(result.narrowed)} of {len(sources)} ZIPs "
+                        "with nothing to upload")
         else:
-            # Process has finished
-            self.check_process_timer.stop()
-            self.running_process = None
-            self.run_local_button.setDisabled(False)
-            self.run_takeout_button.setDisabled(False)
-            self.status_indicator.setText("✓ Ready to go!")
+            question = f"upload only the {len(result.narrowed):,} files it would upload"
+        answer = QMessageBox.question(self, "Reuse Dry Run",
+            f"The {summary} still matches the sources.\n\nReuse it and {question}?")
+        if answer != QMessageBox.Yes:
+            return command_parts, f"[dry-run cache] Not reused: {summary}"
+        if kind == "takeout":
+            return base_parts + result.narrowed, f"[dry-run cache] Reused the {summary}: {question}"
+        batches = argument_batches(result.narrowed)
+        if len(batches) == 1:
+            return base_parts + batches[0], f"[dry-run cache] Reused the {summary}: {question}"
+        # Too many files for one command line: queue them like a delta upload
+        for number, batch in enumerate(batches, 1):
+            self.queue_job(f"{sources[0]} (dry run {number}/{len(batches)})", "local", base_parts + batch)
+        self.refresh_jobs_table()
+        if not self.job_queue_active:
+            self.toggle_job_queue()
+        return None, f"Queued the files of the {summary} as {len(batches)} jobs"
+
+    def start_run(self, command_parts):
+        command, proxy = self.launch_command(command_parts)
+        if proxy is not None:
+            self.run_proxies["run"] = proxy
+
+        self.run_local_button.setDisabled(True)
+        self.run_takeout_button.setDisabled(True)
+        self.stop_button.setEnabled(True)
+        self.output_view.clear()
+        self.progress_parser = ProgressParser()
+        self.progress_dashboard.show()
+        self.progress_dashboard.start(self.progress_parser)
+
+        self.running_process = ImmichGoProcess(command, self)
+        self.running_process.output_received.connect(self.append_process_output)
+        self.running_process.process_finished.connect(self.handle_process_finished)
+        self.running_process.process_started.connect(self.prioritize_new)
+        self.running_process.process_started.connect(lambda pid: self.monitor_process(
+            "run", pid, self.get_metrics_path(time.strftime("run-%Y%m%d-%H%M%S"))))
+        self.running_process.start()
+
+        self.status_indicator.setText("⏳ Immich-Go is running...")
+        self.status_indicator.setStyleSheet("color: orange; font-weight: bold;")
+
+    def stop_command(self):
+        if self.running_process is not None:
+            self.running_process.stop()
+            self.status_indicator.setText("⏳ Stopping Immich-Go...")
+
+    def append_process_output(self, stream, lines):
+        self.progress_parser.feed_lines(lines)
+        if self.dry_run_recording is not None:
+            self.dry_run_recording[4].feed_lines(lines)
+        self.output_view.append_lines(stream, lines)
+
+    def handle_process_finished(self, exit_code, status):
+        self.report_proxy("run")
+        self.output_view.flush()
+        self.progress_dashboard.stop()
+        self.unmonitor_process("run")
+        stopped = self.running_process.stop_requested
+        self.running_process.deleteLater()
+        self.running_process = None
+        self.stop_button.setEnabled(False)
+
+        recording, self.dry_run_recording = self.dry_run_recording, None
+        if status == "normal" and exit_code == 0:
+            self.status_indicator.setText("✓ Immich-Go finished successfully")
             self.status_indicator.setStyleSheet("color: green; font-weight: bold;")
+            if recording is not None:
+                self.save_dry_run(*recording)
+        elif stopped:
+            self.status_indicator.setText("⚠️ Immich-Go was stopped")
+            self.status_indicator.setStyleSheet("color: orange; font-weight: bold;")
+        elif status == "normal":
+            self.status_indicator.setText(f"❌ Immich-Go exited with code {exit_code}")
+            self.status_indicator.setStyleSheet("color: red; font-weight: bold;")
+        else:
+            self.status_indicator.setText(f"❌ Immich-Go {status}")
+            self.status_indicator.setStyleSheet("color: red; font-weight: bold;")
+
+        is_valid_config = self.validate_inputs()
+        self.run_local_button.setEnabled(is_valid_config)
+        self.run_takeout_button.setEnabled(is_valid_config)
 
+    def save_dry_run(self, result, kind, command_parts, sources, recorder):
+        entry = recorder.entry(kind, self.server_url_edit.text(), command_parts, sources, result.fingerprints,
+                               self.progress_parser.snapshot())
+        try:
+            self.get_dry_run_cache().save(result.key, entry)
+        except OSError as e:
+            print(f"Error saving the dry run: {e}")
+            return
+        note = f"[dry-run cache] Saved the {describe_dry_run(entry)}"
+        if not entry["complete"]:
+            note += " (no per-file decisions in the output; log level INFO records them)"
+        self.output_view.append_lines("stdout", [note + ". A real run of the same sources can reuse it."])
 
     def create_menu_bar(self):
         menu_bar = self.menuBar()
@@ -460,6 +1125,14 @@ class ImmichGoGUI(QMainWindow):
         load_action.triggered.connect(self.load_configuration)
         file_menu.addAction(load_action)
 
+        import_action = QAction("Import Profiles...", self)
+        import_action.triggered.connect(self.import_profiles)
+        file_menu.addAction(import_action)
+
+        export_action = QAction("Export Profiles...", self)
+        export_action.triggered.connect(self.export_profiles)
+        file_menu.addAction(export_action)
+
         exit_action = QAction("Exit", self)
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
@@ -469,6 +1142,27 @@ class ImmichGoGUI(QMainWindow):
         about_action.triggered.connect(self.open_github_link)
         help_menu.addAction(about_action)
 
+    def create_profile_bar(self):
+        bar = QHBoxLayout()
+        bar.addWidget(QLabel("Profile:"))
+        self.profile_combo = QComboBox()
+        self.profile_combo.setMinimumWidth(200)
+        self.profile_combo.setToolTip("Saved configurations, e.g. one per server or per source")
+        bar.addWidget(self.profile_combo)
+        self.profile_save_button = QPushButton("Save")
+        self.profile_save_as_button = QPushButton("Save As...")
+        self.profile_delete_button = QPushButton("Delete")
+        bar.addWidget(self.profile_save_button)
+        bar.addWidget(self.profile_save_as_button)
+        bar.addWidget(self.profile_delete_button)
+        bar.addStretch()
+        self.main_layout.addLayout(bar)
+
+        self.profile_combo.activated.connect(self.switch_profile)
+        self.profile_save_button.clicked.connect(self.save_configuration)
+        self.profile_save_as_button.clicked.connect(self.save_profile_as)
+        self.profile_delete_button.clicked.connect(self.delete_profile)
+
     def create_configuration_tab(self):
         config_tab = QWidget()
         config_scroll = QScrollArea()
@@ -524,11 +1218,73 @@ class ImmichGoGUI(QMainWindow):
         adv_group.setLayout(adv_form)
         layout.addWidget(adv_group)
 
+        # Throttling: applied when immich-go is started, see launch_command
+        self.throttle_group = QGroupBox("Throttling")
+        self.throttle_group.setCheckable(True)
+        self.throttle_group.setChecked(False)
+        self.throttle_group.setToolTip(
+            "Limit upload bandwidth (immich-go then talks to the server through a local proxy) "
+            "and lower immich-go's CPU and disk priority, with separate daytime and night settings.")
+        throttle_form = QFormLayout()
+        hours_row = QHBoxLayout()
+        self.throttle_start_edit = QTimeEdit()
+        self.throttle_end_edit = QTimeEdit()
+        for edit in (self.throttle_start_edit, self.throttle_end_edit):
+            edit.setDisplayFormat("HH:mm")
+        hours_row.addWidget(self.throttle_start_edit)
+        hours_row.addWidget(QLabel("to"))
+        hours_row.addWidget(self.throttle_end_edit)
+        hours_row.addStretch()
+        self.throttle_day_spin = QDoubleSpinBox()
+        self.throttle_night_spin = QDoubleSpinBox()
+        for spin in (self.throttle_day_spin, self.throttle_night_spin):
+            spin.setRange(0, 10000)
+            spin.setDecimals(1)
+            spin.setSuffix(" Mbit/s")
+            spin.setSpecialValueText("Unlimited")
+        self.throttle_day_priority_combo = QComboBox()
+        self.throttle_night_priority_combo = QComboBox()
+        for combo in (self.throttle_day_priority_combo, self.throttle_night_priority_combo):
+            combo.addItems([priority.capitalize() for priority in PRIORITIES])
+        self.throttle_status_label = QLabel()
+        self.throttle_status_label.setStyleSheet("color: #555;")
+        throttle_form.addRow("Daytime Hours:", hours_row)
+        throttle_form.addRow("Daytime Upload Limit:", self.throttle_day_spin)
+        throttle_form.addRow("Daytime Priority:", self.throttle_day_priority_combo)
+        throttle_form.addRow("Night Upload Limit:", self.throttle_night_spin)
+        throttle_form.addRow("Night Priority:", self.throttle_night_priority_combo)
+        throttle_form.addRow(self.throttle_status_label)
+        self.throttle_group.setLayout(throttle_form)
+        layout.addWidget(self.throttle_group)
+        self.apply_throttle(ThrottleSchedule())
+
+        self.cache_group = QGroupBox("Metadata Cache")
+        self.cache_group.setCheckable(True)
+        self.cache_group.setChecked(False)
+        self.cache_group.setToolTip(
+            "Run immich-go through a local proxy that keeps server connections open and briefly caches "
+            "album lists, server info and other lookups. Helps on high-latency links such as VPNs.")
+        cache_form = QFormLayout()
+        self.cache_ttl_spin = QSpinBox()
+        self.cache_ttl_spin.setRange(1, 600)
+        self.cache_ttl_spin.setValue(10)
+        self.cache_ttl_spin.setSuffix(" seconds")
+        cache_form.addRow("Keep Responses For:", self.cache_ttl_spin)
+        self.cache_group.setLayout(cache_form)
+        layout.addWidget(self.cache_group)
+
         layout.addStretch()
         self.tab_widget.addTab(config_scroll, "Configuration")
 
         self.server_url_edit.textChanged.connect(self.validate_inputs)
         self.api_key_edit.textChanged.connect(self.validate_inputs)
+        self.throttle_group.toggled.connect(self.apply_throttle_schedule)
+        self.throttle_start_edit.timeChanged.connect(self.apply_throttle_schedule)
+        self.throttle_end_edit.timeChanged.connect(self.apply_throttle_schedule)
+        self.throttle_day_spin.valueChanged.connect(self.apply_throttle_schedule)
+        self.throttle_night_spin.valueChanged.connect(self.apply_throttle_schedule)
+        self.throttle_day_priority_combo.currentIndexChanged.connect(self.apply_throttle_schedule)
+        self.throttle_night_priority_combo.currentIndexChanged.connect(self.apply_throttle_schedule)
         self.server_url_edit.textChanged.connect(self.update_status)
         self.api_key_edit.textChanged.connect(self.update_status)
 
@@ -570,6 +1326,38 @@ class ImmichGoGUI(QMainWindow):
 
         file_layout.addRow("Path:", source_row)
         file_layout.addRow(self.browse_btn)
+
+        self.takeout_dedup_button = QPushButton("Find Duplicates")
+        self.takeout_dedup_button.setToolTip(
+            "Count media that appears more than once in the selected Takeout. "
+            "ZIPs are compared by the checksums in their directories, without extracting them.")
+        self.takeout_dedup_label = QLabel()
+        self.takeout_dedup_label.setWordWrap(True)
+        self.takeout_dedup_label.setStyleSheet("color: #555;")
+        dedup_row = QHBoxLayout()
+        dedup_row.addWidget(self.takeout_dedup_button)
+        dedup_row.addWidget(self.takeout_dedup_label, 1)
+        file_layout.addRow(dedup_row)
+        self.takeout_dedup_thread = None
+
+        self.takeout_inspect_button = QPushButton("Inspect Takeout")
+        self.takeout_inspect_button.setToolTip(
+            "List what the Takeout contains (media, JSON sidecars, albums, unmatched files) "
+            "by reading the ZIP directories, without extracting anything.")
+        self.takeout_inspect_label = QLabel()
+        self.takeout_inspect_label.setWordWrap(True)
+        self.takeout_inspect_label.setStyleSheet("color: #555;")
+        inspect_row = QHBoxLayout()
+        self.takeout_pairing_button = QPushButton("Export Pairing...")
+        self.takeout_pairing_button.setToolTip(
+            "Save which JSON sidecar was matched to each media file, and the files left unmatched, as CSV.")
+        self.takeout_pairing_button.setEnabled(False)
+        inspect_row.addWidget(self.takeout_inspect_button)
+        inspect_row.addWidget(self.takeout_inspect_label, 1)
+        inspect_row.addWidget(self.takeout_pairing_button, 0, Qt.AlignTop)
+        file_layout.addRow(inspect_row)
+        self.takeout_inspect_thread = None
+        self.takeout_inventory = None
         file_group.setLayout(file_layout)
         layout.addWidget(file_group)
 
@@ -594,6 +1382,8 @@ class ImmichGoGUI(QMainWindow):
         self.takeout_dry_run_check = QCheckBox("Dry Run Mode")
         self.run_takeout_button = QPushButton("Run Google Takeout")
         self.run_takeout_button.setEnabled(False) # Initially disabled
+        self.queue_takeout_button = QPushButton("Add to Queue")
+        self.queue_takeout_button.setEnabled(False)
 
         def add_form_row(form, widget, tooltip):
             row = QHBoxLayout()
@@ -608,7 +1398,10 @@ class ImmichGoGUI(QMainWindow):
         add_form_row(core_form, self.takeout_dry_run_check, "Simulate the upload without actually transferring files.")
         core_group.setLayout(core_form)
         layout.addWidget(core_group)
-        layout.addWidget(self.run_takeout_button)
+        takeout_run_row = QHBoxLayout()
+        takeout_run_row.addWidget(self.run_takeout_button)
+        takeout_run_row.addWidget(self.queue_takeout_button)
+        layout.addLayout(takeout_run_row)
 
         adv_group = QGroupBox("Advanced Options")
         adv_group.setObjectName("Advanced Options")
@@ -633,6 +1426,12 @@ class ImmichGoGUI(QMainWindow):
         self.zip_radio.toggled.connect(self.update_browse_mode)
         self.folder_radio.toggled.connect(self.update_browse_mode)
         self.run_takeout_button.clicked.connect(lambda: self.run_command(self.get_google_takeout_options()))
+        self.queue_takeout_button.clicked.connect(lambda: self.add_job("takeout"))
+        self.takeout_dedup_button.clicked.connect(self.find_takeout_duplicates)
+        self.source_path_edit.textChanged.connect(self.takeout_dedup_label.clear)
+        self.takeout_inspect_button.clicked.connect(self.inspect_takeout_sources)
+        self.source_path_edit.textChanged.connect(self.clear_takeout_inventory)
+        self.takeout_pairing_button.clicked.connect(self.export_takeout_pairing)
 
     def create_local_upload_tab(self):
         tab = QWidget()
@@ -664,6 +1463,34 @@ class ImmichGoGUI(QMainWindow):
         local_path_row.addStretch()
         source_layout.addRow("Path:", local_path_row)
         source_layout.addRow(self.local_browse_btn)
+
+        self.local_scan_button = QPushButton("Scan Folder")
+        self.local_scan_label = QLabel()
+        self.local_scan_label.setWordWrap(True)
+        self.local_scan_label.setStyleSheet("color: #555;")
+        scan_row = QHBoxLayout()
+        scan_row.addWidget(self.local_scan_button)
+        scan_row.addWidget(self.local_scan_label, 1)
+        source_layout.addRow(scan_row)
+        self.folder_scan_thread = None
+
+        self.local_delta_button = QPushButton("Queue New/Changed Files")
+        self.local_delta_button.setToolTip(
+            "Update the folder index and queue only the files that are new or changed "
+            "since the last successful upload to this server.")
+        self.local_delta_label = QLabel()
+        self.local_delta_label.setWordWrap(True)
+        self.local_delta_label.setStyleSheet("color: #555;")
+        delta_row = QHBoxLayout()
+        delta_row.addWidget(self.local_delta_button)
+        delta_row.addWidget(self.local_delta_label, 1)
+        source_layout.addRow(delta_row)
+        self.local_dedup_check = QCheckBox("Skip duplicate files (content hash)")
+        self.local_dedup_check.setToolTip(
+            "Before queueing, hash files of equal size and leave out copies of files that are "
+            "already uploaded or queued. Hashes are cached, so only new or changed files are read.")
+        source_layout.addRow(self.local_dedup_check)
+        self.index_thread = None
         source_group.setLayout(source_layout)
         layout.addWidget(source_group)
 
@@ -686,6 +1513,23 @@ class ImmichGoGUI(QMainWindow):
         date_layout.addWidget(self.start_date)
         date_layout.addWidget(QLabel("End Date:"))
         date_layout.addWidget(self.end_date)
+
+        self.date_scan_button = QPushButton("Analyze Dates")
+        self.date_scan_button.setToolTip(
+            "Read the capture date of every file (EXIF, video header, JSON sidecar or file name) "
+            "to preview how many files the date range selects.")
+        self.date_scan_label = QLabel()
+        self.date_scan_label.setWordWrap(True)
+        self.date_scan_label.setStyleSheet("color: #555;")
+        date_scan_row = QHBoxLayout()
+        date_scan_row.addWidget(self.date_scan_button)
+        date_scan_row.addWidget(self.date_scan_label, 1)
+        date_layout.addLayout(date_scan_row)
+        self.date_histogram = DateHistogram()
+        self.date_histogram.hide()
+        date_layout.addWidget(self.date_histogram)
+        self.date_scan_thread = None
+        self.date_summary = None
         date_group.setLayout(date_layout)
         layout.addWidget(date_group)
 
@@ -724,6 +1568,8 @@ class ImmichGoGUI(QMainWindow):
         self.dry_run_check = QCheckBox("Dry Run Mode")
         self.run_local_button = QPushButton("Run Local Upload")
         self.run_local_button.setEnabled(False) # Initially disabled
+        self.queue_local_button = QPushButton("Add to Queue")
+        self.queue_local_button.setEnabled(False)
 
 
         album_name_row = QHBoxLayout()
@@ -746,7 +1592,10 @@ class ImmichGoGUI(QMainWindow):
 
         upload_group.setLayout(upload_form)
         layout.addWidget(upload_group)
-        layout.addWidget(self.run_local_button)
+        local_run_row = QHBoxLayout()
+        local_run_row.addWidget(self.run_local_button)
+        local_run_row.addWidget(self.queue_local_button)
+        layout.addLayout(local_run_row)
 
         layout.addStretch()
         self.tab_widget.addTab(scroll, "Local Upload")
@@ -754,7 +1603,739 @@ class ImmichGoGUI(QMainWindow):
         self.date_check.toggled.connect(lambda checked: self.toggle_dates(checked))
         self.type_check.toggled.connect(lambda checked: self.type_edit.setEnabled(checked))
         self.local_browse_btn.clicked.connect(self.browse_local_folder)
+        self.local_scan_button.clicked.connect(self.toggle_folder_scan)
+        self.local_path_edit.textChanged.connect(self.cancel_folder_scan)
+        self.type_check.toggled.connect(self.cancel_folder_scan)
+        self.type_edit.textChanged.connect(self.cancel_folder_scan)
         self.run_local_button.clicked.connect(lambda: self.run_command(self.get_local_upload_options()))
+        self.queue_local_button.clicked.connect(lambda: self.add_job("local"))
+        self.local_delta_button.clicked.connect(self.queue_local_delta)
+        self.date_scan_button.clicked.connect(self.toggle_date_scan)
+        self.local_path_edit.textChanged.connect(self.cancel_date_scan)
+        self.type_check.toggled.connect(self.cancel_date_scan)
+        self.type_edit.textChanged.connect(self.cancel_date_scan)
+        self.date_check.toggled.connect(self.update_date_preview)
+        self.start_date.dateChanged.connect(self.update_date_preview)
+        self.end_date.dateChanged.connect(self.update_date_preview)
+
+    def toggle_folder_scan(self):
+        if self.folder_scan_thread is not None and self.folder_scan_thread.isRunning():
+            self.cancel_folder_scan()
+            return
+        folder = self.local_path_edit.text()
+        if not folder or not os.path.isdir(folder):
+            self.local_scan_label.setText("❌ Select an existing folder first")
+            return
+        extensions = parse_extensions(self.type_edit.text()) if self.type_check.isChecked() else None
+        self.folder_scan_thread = FolderScanThread(folder, extensions)
+        self.folder_scan_thread.scan_progress.connect(self.show_scan_summary)
+        self.folder_scan_thread.scan_complete.connect(self.show_scan_summary)
+        self.folder_scan_thread.finished.connect(lambda: self.local_scan_button.setText("Scan Folder"))
+        self.local_scan_button.setText("Cancel Scan")
+        self.local_scan_label.setText("Scanning...")
+        self.folder_scan_thread.start()
+
+    def cancel_folder_scan(self, *args):
+        """Stop a running scan; the summary no longer matches the path or filter."""
+        if self.folder_scan_thread is not None and self.folder_scan_thread.isRunning():
+            self.folder_scan_thread.cancel()
+        self.local_scan_label.clear()
+
+    def show_scan_summary(self, summary):
+        if self.sender() is not self.folder_scan_thread:
+            return  # Late result of a scan that was replaced
+        scanner = self.folder_scan_thread.scanner
+        extensions = parse_extensions(self.type_edit.text()) if self.type_check.isChecked() else set()
+        if scanner.root != self.local_path_edit.text() or scanner.extensions != extensions:
+            return  # Cancelled for a change of path or filter, but still reporting
+        text = (f"{summary.files:,} files · {format_bytes(summary.bytes)} · "
+                f"{summary.dirs:,} folders")
+        if summary.skipped:
+            text += f" · {summary.skipped:,} filtered out"
+        if summary.errors:
+            text += f" · {summary.errors:,} unreadable"
+        if summary.cancelled:
+            text += " (cancelled)"
+        elif summary.complete:
+            text += f" ({summary.elapsed:.1f} s)"
+        else:
+            text += " (scanning...)"
+        top = ", ".join(
+            f"{extension or '(none)'} {files:,} ({format_bytes(size)})"
+            for extension, (files, size) in summary.top_extensions()
+        )
+        if top:
+            text += "\n" + top
+        self.local_scan_label.setText(text)
+
+    def inspect_takeout_sources(self):
+        if self.takeout_inspect_thread is not None and self.takeout_inspect_thread.isRunning():
+            return
+        sources = [path.strip() for path in self.source_path_edit.text().split(";") if path.strip()]
+        if not sources or not all(os.path.exists(path) for path in sources):
+            self.takeout_inspect_label.setText("❌ Select existing Takeout files or folder first")
+            return
+        self.takeout_inspect_thread = TakeoutInspectThread(sources)
+        self.takeout_inspect_thread.inspect_complete.connect(self.show_takeout_inventory)
+        self.takeout_inspect_thread.finished.connect(lambda: self.takeout_inspect_button.setEnabled(True))
+        self.takeout_inspect_button.setEnabled(False)
+        self.takeout_inspect_label.setText("Reading archive directories...")
+        self.takeout_inspect_thread.start()
+
+    def show_takeout_inventory(self, inventory):
+        text = (f"{inventory.media:,} media files ({format_bytes(inventory.media_bytes)}) · "
+                f"{inventory.sidecars:,} JSON sidecars · {len(inventory.albums):,} albums · "
+                f"{inventory.year_folders:,} year folders")
+        text += (f"\n{len(inventory.orphan_sidecars):,} JSON without media · "
+                 f"{len(inventory.missing_sidecars):,} media without JSON · "
+                 f"{inventory.other:,} other files")
+        text += f"\n{inventory.archives:,} sources read in {inventory.elapsed:.1f} s"
+        for source, error in inventory.errors:
+            text += f"\n❌ {os.path.basename(source)}: {error}"
+        pairing = inventory.pairing
+        if pairing is not None and pairing.pairs:
+            text += "\nPaired " + ", ".join(
+                f"{pairing.methods[method]:,} {method}" for method in METHODS if pairing.methods[method])
+        self.takeout_inspect_label.setText(text)
+        self.takeout_inventory = inventory
+        self.takeout_pairing_button.setEnabled(pairing is not None)
+
+        # Details on hover: the largest albums and the first unmatched files
+        details = ["Largest albums:"]
+        details += [f"  {name}: {count:,}" for name, count in
+                    sorted(inventory.albums.items(), key=lambda item: item[1], reverse=True)[:10]]
+        for title, paths in (("JSON without media:", inventory.orphan_sidecars),
+                             ("Media without JSON:", inventory.missing_sidecars)):
+            if paths:
+                details.append(title)
+                details += [f"  {path}" for path in paths[:10]]
+                if len(paths) > 10:
+                    details.append(f"  ... and {len(paths) - 10:,} more")
+        self.takeout_inspect_label.setToolTip("\n".join(details))
+
+    def clear_takeout_inventory(self):
+        self.takeout_inspect_label.clear()
+        self.takeout_inspect_label.setToolTip("")
+        self.takeout_inventory = None
+        self.takeout_pairing_button.setEnabled(False)
+
+    def export_takeout_pairing(self):
+        if self.takeout_inventory is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Pairing", "takeout-pairing.csv", "CSV files (*.csv)")
+        if not path:
+            return
+        try:
+            rows = self.takeout_inventory.pairing.export_csv(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Pairing", f"Could not export to {path}: {e}")
+            return
+        QMessageBox.information(self, "Export Pairing", f"Exported {rows:,} rows to {path}.")
+
+    def find_takeout_duplicates(self):
+        if self.takeout_dedup_thread is not None and self.takeout_dedup_thread.isRunning():
+            return
+        sources = [path.strip() for path in self.source_path_edit.text().split(";") if path.strip()]
+        if not sources or not all(os.path.exists(path) for path in sources):
+            self.takeout_dedup_label.setText("❌ Select existing Takeout files or folder first")
+            return
+        self.takeout_dedup_thread = TakeoutDuplicateThread(
+            sources, self.zip_radio.isChecked(), self.get_index_path())
+        self.takeout_dedup_thread.check_complete.connect(self.show_takeout_duplicates)
+        self.takeout_dedup_thread.check_error.connect(
+            lambda error: self.takeout_dedup_label.setText(f"❌ {error}"))
+        self.takeout_dedup_thread.finished.connect(lambda: self.takeout_dedup_button.setEnabled(True))
+        self.takeout_dedup_button.setEnabled(False)
+        self.takeout_dedup_label.setText("Looking for duplicates...")
+        self.takeout_dedup_thread.start()
+
+    def show_takeout_duplicates(self, files, duplicates, saved_bytes):
+        # immich-go already skips duplicates within one Takeout; this shows how much it will skip
+        self.takeout_dedup_label.setText(
+            f"{duplicates:,} of {files:,} media files are duplicates "
+            f"({format_bytes(saved_bytes)} immich-go will not upload again)")
+
+    def get_index_path(self):
+        return os.path.join(self.get_binary_folder(), "index.sqlite")
+
+    def queue_local_delta(self):
+        if self.index_thread is not None and self.index_thread.isRunning():
+            return
+        folder = self.local_path_edit.text()
+        if not folder or not os.path.isdir(folder):
+            self.local_delta_label.setText("❌ Select an existing folder first")
+            return
+        if not self.server_url_edit.text():
+            self.local_delta_label.setText("❌ Server URL required")
+            return
+        self.index_thread = IndexRefreshThread(
+            self.get_index_path(), folder, self.server_url_edit.text(), self.local_dedup_check.isChecked())
+        # Snapshot the options now; the delta jobs use them with the folder replaced
+        self.index_thread.base_parts = self.current_config().local_upload_flags()
+        self.index_thread.refresh_complete.connect(self.handle_index_refresh)
+        self.index_thread.refresh_error.connect(lambda error: self.local_delta_label.setText(f"❌ {error}"))
+        self.index_thread.finished.connect(lambda: self.local_delta_button.setEnabled(True))
+        self.local_delta_button.setEnabled(False)
+        self.local_delta_label.setText(
+            "Updating folder index and hashing..." if self.index_thread.dedup else "Updating folder index...")
+        self.index_thread.start()
+
+    def handle_index_refresh(self, result, batches, dedup_result):
+        if result.cancelled:
+            return
+        text = (f"{result.new:,} new · {result.changed:,} changed · {result.removed:,} removed "
+                f"({result.dirs_listed:,} of {result.dirs_checked:,} folders re-read)")
+        if dedup_result is not None:
+            text += (f"\n{len(dedup_result.duplicates):,} duplicates skipped, saving "
+                     f"{format_bytes(dedup_result.saved_bytes)} "
+                     f"({format_bytes(dedup_result.hashed_bytes)} hashed in {dedup_result.elapsed:.1f} s)")
+        if not batches:
+            self.local_delta_label.setText(text + "\n✓ Nothing to upload since the last run")
+            return
+
+        root, server = self.index_thread.root, self.index_thread.server
+        base_parts = self.index_thread.base_parts
+        for number, batch in enumerate(batches, 1):
+            name = f"{root} (new/changed"
+            name += f" {number}/{len(batches)})" if len(batches) > 1 else ")"
+            self.queue_job(name, "local", base_parts + batch, server, meta={
+                "index_root": root, "index_server": server, "index_paths": batch})
+        self.refresh_jobs_table()
+        self.local_delta_label.setText(
+            text + f"\n{result.pending_files:,} files ({format_bytes(result.pending_bytes)}) "
+            f"queued as {len(batches)} job(s)")
+
+    def mark_index_uploaded(self, job):
+        """Record a successful delta upload in the folder index."""
+        if "index_paths" not in job.meta or "--dry-run" in job.command_parts:
+            return
+        try:
+            index = FolderIndex(self.get_index_path(), job.meta["index_root"], job.meta["index_server"])
+        except Exception as e:
+            print(f"Error updating the folder index: {e}")
+            return
+        try:
+            index.mark_uploaded(job.meta["index_paths"], upload_filter(job.command_parts, self.get_index_path()))
+        finally:
+            index.close()
+
+    def toggle_date_scan(self):
+        if self.date_scan_thread is not None and self.date_scan_thread.isRunning():
+            self.date_scan_thread.cancel()
+            return
+        folder = self.local_path_edit.text()
+        if not folder or not os.path.isdir(folder):
+            self.date_scan_label.setText("❌ Select an existing folder first")
+            return
+        extensions = parse_extensions(self.type_edit.text()) if self.type_check.isChecked() else None
+        self.date_scan_thread = DateScanThread(folder, self.get_index_path(), extensions)
+        self.date_scan_thread.scan_progress.connect(self.show_date_summary)
+        self.date_scan_thread.scan_complete.connect(self.show_date_summary)
+        self.date_scan_thread.finished.connect(lambda: self.date_scan_button.setText("Analyze Dates"))
+        self.date_scan_button.setText("Cancel")
+        self.date_scan_label.setText("Reading dates...")
+        self.date_scan_thread.start()
+
+    def cancel_date_scan(self, *args):
+        """Stop a running date scan and drop the histogram; it belongs to another folder or filter."""
+        if self.date_scan_thread is not None and self.date_scan_thread.isRunning():
+            self.date_scan_thread.cancel()
+        self.date_summary = None
+        self.date_histogram.hide()
+        self.date_scan_label.clear()
+
+    def show_date_summary(self, summary):
+        if self.sender() is not self.date_scan_thread or self.date_scan_thread is None:
+            return  # Late result of a scan that was replaced
+        scanner = self.date_scan_thread.scanner
+        extensions = parse_extensions(self.type_edit.text()) if self.type_check.isChecked() else None
+        if scanner.root != self.local_path_edit.text() or scanner.extensions != (extensions or MEDIA_EXTENSIONS):
+            return  # Cancelled for a change of path or filter, but still reporting
+        self.date_summary = summary
+        self.date_histogram.set_summary(summary)
+        self.date_histogram.show()
+        self.update_date_preview()
+
+    def update_date_preview(self, *args):
+        summary = self.date_summary
+        if summary is None:
+            return
+        start = self.start_date.date().toPython()
+        end = self.end_date.date().toPython()
+        if self.date_check.isChecked():
+            self.date_histogram.set_range(start, end)
+            files, size = summary.range_totals(start, end)
+            text = f"In range: {files:,} files ({format_bytes(size)}) · outside: {summary.files - files - summary.unknown[0]:,}"
+        else:
+            self.date_histogram.set_range(None, None)
+            text = f"{summary.files - summary.unknown[0]:,} dated files"
+        text += f" · no date: {summary.unknown[0]:,}"
+        if summary.cancelled:
+            text += " (cancelled)"
+        elif not summary.complete:
+            text += f" (reading {summary.files:,} of {summary.total:,}...)"
+        else:
+            text += f" ({summary.cached:,} cached, {summary.elapsed:.1f} s)"
+        self.date_scan_label.setText(text)
+
+    def create_jobs_tab(self):
+        self.job_queue = JobQueue(os.path.join(self.get_binary_folder(), "jobs.json"))
+        self.job_runs = {}  # job id -> (ImmichGoProcess, ProgressParser)
+        self.takeout_journal = TakeoutJournal(os.path.join(self.get_binary_folder(), "takeout-journal.json"))
+        self.archive_trackers = {}  # job id -> ArchiveTracker of a checkpointed Takeout group
+        self.job_queue_active = False
+
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        layout.setSpacing(15)
+        layout.setContentsMargins(15, 15, 15, 15)
+
+        queue_group = QGroupBox("Job Queue")
+        queue_layout = QVBoxLayout()
+
+        self.jobs_table = QTableWidget(0, 4)
+        self.jobs_table.setHorizontalHeaderLabels(["Name", "Type", "Status", "Progress"])
+        self.jobs_table.horizontalHeader().setStretchLastSection(True)
+        self.jobs_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.jobs_table.verticalHeader().setVisible(False)
+        self.jobs_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.jobs_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.jobs_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        queue_layout.addWidget(self.jobs_table)
+
+        edit_row = QHBoxLayout()
+        move_up_button = QPushButton("Move Up")
+        move_down_button = QPushButton("Move Down")
+        cancel_job_button = QPushButton("Cancel")
+        retry_job_button = QPushButton("Retry")
+        remove_job_button = QPushButton("Remove")
+        for button in (move_up_button, move_down_button, cancel_job_button, retry_job_button, remove_job_button):
+            edit_row.addWidget(button)
+        edit_row.addStretch()
+        queue_layout.addLayout(edit_row)
+
+        control_row = QHBoxLayout()
+        control_row.addWidget(QLabel("Parallel jobs:"))
+        self.job_concurrency_spin = QSpinBox()
+        self.job_concurrency_spin.setRange(1, 8)
+        self.job_concurrency_spin.setValue(self.job_queue.concurrency)
+        control_row.addWidget(self.job_concurrency_spin)
+        control_row.addStretch()
+        self.job_queue_button = QPushButton("Start Queue")
+        control_row.addWidget(self.job_queue_button)
+        queue_layout.addLayout(control_row)
+
+        queue_group.setLayout(queue_layout)
+        layout.addWidget(queue_group)
+
+        shard_group = QGroupBox("Sharded Upload")
+        shard_layout = QVBoxLayout()
+        shard_row = QHBoxLayout()
+        shard_row.addWidget(QLabel("Source:"))
+        self.shard_source_combo = QComboBox()
+        self.shard_source_combo.addItem("Local Upload folder", "local")
+        self.shard_source_combo.addItem("Google Takeout ZIPs", "takeout")
+        shard_row.addWidget(self.shard_source_combo)
+        shard_row.addWidget(QLabel("Shards:"))
+        self.shard_count_spin = QSpinBox()
+        self.shard_count_spin.setRange(2, 32)
+        self.shard_count_spin.setValue(4)
+        shard_row.addWidget(self.shard_count_spin)
+        shard_row.addStretch()
+        self.shard_plan_button = QPushButton("Plan && Queue Shards")
+        self.shard_plan_button.setToolTip(
+            "Split the source into shards of about equal size and queue one job per shard. "
+            "\"Parallel jobs\" caps how many shards upload at the same time.")
+        shard_row.addWidget(self.shard_plan_button)
+        shard_layout.addLayout(shard_row)
+        self.shard_plan_label = QLabel()
+        self.shard_plan_label.setWordWrap(True)
+        self.shard_plan_label.setStyleSheet("color: #555;")
+        shard_layout.addWidget(self.shard_plan_label)
+        shard_group.setLayout(shard_layout)
+        layout.addWidget(shard_group)
+        self.shard_plan_thread = None
+
+        checkpoint_group = QGroupBox("Checkpointed Takeout")
+        checkpoint_layout = QVBoxLayout()
+        checkpoint_row = QHBoxLayout()
+        checkpoint_row.addWidget(QLabel("ZIPs per run:"))
+        self.checkpoint_group_spin = QSpinBox()
+        self.checkpoint_group_spin.setRange(1, 100)
+        self.checkpoint_group_spin.setValue(DEFAULT_GROUP_SIZE)
+        self.checkpoint_group_spin.setToolTip(
+            "Fewer ZIPs per run keep immich-go's memory down and lose less work when a run fails.")
+        checkpoint_row.addWidget(self.checkpoint_group_spin)
+        checkpoint_row.addStretch()
+        self.checkpoint_button = QPushButton("Queue Checkpointed Run")
+        self.checkpoint_button.setToolTip(
+            "Upload the Takeout ZIPs a few at a time, one job per group. Finished ZIPs are recorded, "
+            "so a failed or interrupted group is re-run with only the ZIPs it had not finished.")
+        checkpoint_row.addWidget(self.checkpoint_button)
+        checkpoint_layout.addLayout(checkpoint_row)
+        self.checkpoint_label = QLabel()
+        self.checkpoint_label.setWordWrap(True)
+        self.checkpoint_label.setStyleSheet("color: #555;")
+        checkpoint_layout.addWidget(self.checkpoint_label)
+        checkpoint_group.setLayout(checkpoint_layout)
+        layout.addWidget(checkpoint_group)
+        self.archive_count_thread = None
+
+        # Combined progress of the shards of the most recent plan
+        self.plan_dashboard = ProgressDashboard("Sharded Upload Progress")
+        self.plan_dashboard.hide()
+        layout.addWidget(self.plan_dashboard)
+        self.plan_progress = None  # (plan id, AggregateProgress)
+        layout.addStretch()
+        self.tab_widget.addTab(tab, "Jobs")
+
+        move_up_button.clicked.connect(lambda: self.move_selected_job(-1))
+        move_down_button.clicked.connect(lambda: self.move_selected_job(1))
+        cancel_job_button.clicked.connect(self.cancel_selected_job)
+        retry_job_button.clicked.connect(self.retry_selected_job)
+        remove_job_button.clicked.connect(self.remove_selected_job)
+        self.job_concurrency_spin.valueChanged.connect(self.set_job_concurrency)
+        self.job_queue_button.clicked.connect(self.toggle_job_queue)
+        self.shard_plan_button.clicked.connect(self.plan_shards)
+        self.checkpoint_button.clicked.connect(self.queue_checkpointed_takeout)
+        self.update_checkpoint_label(self.takeout_journal.latest())
+
+        # Refreshes the progress column while jobs run
+        self.jobs_refresh_timer = QTimer(self)
+        self.jobs_refresh_timer.setInterval(1000)
+        self.jobs_refresh_timer.timeout.connect(self.refresh_jobs_table)
+        self.refresh_jobs_table()
+
+    def add_job(self, kind):
+        """Queue a snapshot of the current Google Takeout or Local Upload options."""
+        if kind == "takeout":
+            command_parts = self.get_google_takeout_options()
+            sources = [path.strip() for path in self.source_path_edit.text().split(";") if path.strip()]
+            name = os.path.basename(sources[0]) if sources else "Google Takeout"
+            if len(sources) > 1:
+                name += f" (+{len(sources) - 1})"
+        else:
+            command_parts = self.get_local_upload_options()
+            name = self.local_path_edit.text() or "Local Upload"
+        self.queue_job(name, kind, command_parts)
+        self.refresh_jobs_table()
+
+    def queue_job(self, name, kind, command_parts, server=None, meta=None):
+        """Add a job for the given server (the current one by default); the API key is not stored."""
+        meta = dict(meta or {}, server=self.server_url_edit.text() if server is None else server)
+        return self.job_queue.add(name, kind, command_parts, meta=meta)
+
+    def plan_shards(self):
+        if self.shard_plan_thread is not None and self.shard_plan_thread.isRunning():
+            self.shard_plan_thread.cancel()
+            return
+        kind = self.shard_source_combo.currentData()
+        extensions = None
+        if kind == "takeout":
+            sources = [path.strip() for path in self.source_path_edit.text().split(";") if path.strip()]
+            if not self.zip_radio.isChecked() or not sources or not all(os.path.isfile(path) for path in sources):
+                self.shard_plan_label.setText("❌ Select Takeout ZIP files on the Google Takeout tab first")
+                return
+            answer = QMessageBox.question(self, "Shard Google Takeout",
+                "immich-go matches photos with their JSON sidecars within one run. A photo whose "
+                "sidecar is in a ZIP of another shard is uploaded without that metadata.\n\n"
+                "Shard the Takeout anyway?")
+            if answer != QMessageBox.Yes:
+                return
+        else:
+            sources = [self.local_path_edit.text()]
+            if not sources[0] or not os.path.isdir(sources[0]):
+                self.shard_plan_label.setText("❌ Select an existing folder on the Local Upload tab first")
+                return
+            if self.type_check.isChecked():
+                extensions = parse_extensions(self.type_edit.text())
+        self.shard_plan_thread = ShardPlanThread(kind, sources, self.shard_count_spin.value(), extensions)
+        # Snapshot the options now; the shard jobs use them with their own sources
+        config = self.current_config()
+        self.shard_plan_thread.base_parts = (
+            config.google_takeout_flags() if kind == "takeout" else config.local_upload_flags())
+        self.shard_plan_thread.server = config.server_url
+        self.shard_plan_thread.plan_complete.connect(self.queue_shards)
+        self.shard_plan_thread.plan_error.connect(lambda error: self.shard_plan_label.setText(f"❌ {error}"))
+        self.shard_plan_thread.finished.connect(lambda: self.shard_plan_button.setText("Plan && Queue Shards"))
+        self.shard_plan_button.setText("Cancel Planning")
+        self.shard_plan_label.setText("Measuring source...")
+        self.shard_plan_thread.start()
+
+    def queue_shards(self, shards, total_files, total_bytes):
+        kind, sources = self.shard_plan_thread.kind, self.shard_plan_thread.sources
+        base_parts, server = self.shard_plan_thread.base_parts, self.shard_plan_thread.server
+        name = os.path.basename(sources[0]) if kind == "takeout" else sources[0]
+        plan_id = uuid.uuid4().hex[:8]
+        for shard in shards:
+            self.queue_job(f"{name} shard {shard.number + 1}/{len(shards)}", kind, base_parts + shard.paths, server,
+                           meta={"plan": plan_id, "plan_files": total_files, "plan_bytes": total_bytes})
+        self.refresh_jobs_table()
+        sizes = ", ".join(format_bytes(shard.bytes) for shard in shards)
+        self.shard_plan_label.setText(
+            f"{len(shards)} shards queued ({sizes}); up to {self.job_queue.concurrency} run at a time")
+        if not self.job_queue_active:
+            self.toggle_job_queue()
+
+    def queue_checkpointed_takeout(self):
+        if self.archive_count_thread is not None and self.archive_count_thread.isRunning():
+            return
+        sources = [path.strip() for path in self.source_path_edit.text().split(";") if path.strip()]
+        if not self.zip_radio.isChecked() or not sources or not all(os.path.isfile(path) for path in sources):
+            self.checkpoint_label.setText("❌ Select Takeout ZIP files on the Google Takeout tab first")
+            return
+        if self.checkpoint_group_spin.value() < len(sources):
+            answer = QMessageBox.question(self, "Checkpointed Takeout",
+                "immich-go matches photos with their JSON sidecars within one run. A photo whose "
+                "sidecar is in a ZIP of another group is uploaded without that metadata.\n\n"
+                "Upload the Takeout in groups anyway?")
+            if answer != QMessageBox.Yes:
+                return
+        self.archive_count_thread = ArchiveCountThread(sources)
+        # Snapshot the options now; the group jobs use them with their own ZIPs
+        config = self.current_config()
+        self.archive_count_thread.base_parts = config.google_takeout_flags()
+        self.archive_count_thread.server = config.server_url
+        self.archive_count_thread.count_complete.connect(self.queue_checkpoint_groups)
+        self.archive_count_thread.count_error.connect(lambda error: self.checkpoint_label.setText(f"❌ {error}"))
+        self.archive_count_thread.finished.connect(lambda: self.checkpoint_button.setEnabled(True))
+        self.checkpoint_button.setEnabled(False)
+        self.checkpoint_label.setText("Counting media in the archives...")
+        self.archive_count_thread.start()
+
+    def queue_checkpoint_groups(self, media_counts):
+        sources = list(media_counts)
+        base_parts, server = self.archive_count_thread.base_parts, self.archive_count_thread.server
+        name = os.path.basename(sources[0])
+        set_id = self.takeout_journal.create(name, media_counts)
+        groups = make_groups(sources, self.checkpoint_group_spin.value())
+        total_bytes = sum(os.path.getsize(path) for path in sources)
+        for number, group in enumerate(groups):
+            self.queue_job(f"{name} ZIPs {number + 1}/{len(groups)}", "takeout", base_parts + group, server, meta={
+                "checkpoint": set_id, "archives": group, "plan": set_id,
+                "plan_files": sum(media_counts.values()), "plan_bytes": total_bytes})
+        self.refresh_jobs_table()
+        self.update_checkpoint_label(set_id)
+        if not self.job_queue_active:
+            self.toggle_job_queue()
+
+    def update_checkpoint_label(self, set_id):
+        if set_id is None:
+            return
+        done, total = self.takeout_journal.progress(set_id)
+        name = self.takeout_journal.sets[set_id]["name"]
+        self.checkpoint_label.setText(f"{name}: {done} of {total} ZIPs done")
+
+    def checkpoint_parts(self, job):
+        """Command parts of a checkpointed group without its finished archives; None when all are done."""
+        set_id, archives = job.meta["checkpoint"], job.meta["archives"]
+        remaining = self.takeout_journal.remaining(set_id, archives)
+        if not remaining:
+            return None
+        self.takeout_journal.start_attempt(set_id, remaining)
+        self.archive_trackers[job.id] = ArchiveTracker(self.takeout_journal.media_counts(set_id, remaining))
+        return job.command_parts[:len(job.command_parts) - len(archives)] + remaining
+
+    def follow_plan(self, job, parser):
+        """Add a shard's parser to the combined view of its plan."""
+        plan_id = job.meta.get("plan")
+        if plan_id is None:
+            return
+        if self.plan_progress is None or self.plan_progress[0] != plan_id:
+            aggregate = AggregateProgress(job.meta.get("plan_files") or None, job.meta.get("plan_bytes") or None)
+            self.plan_progress = (plan_id, aggregate)
+            self.plan_dashboard.show()
+            self.plan_dashboard.start(aggregate)
+        self.plan_progress[1].add(job.id, parser)
+
+    def selected_job(self):
+        row = self.jobs_table.currentRow()
+        if row < 0:
+            return None
+        return self.job_queue.get(self.jobs_table.item(row, 0).data(Qt.UserRole))
+
+    def move_selected_job(self, offset):
+        job = self.selected_job()
+        if job is not None and self.job_queue.move(job.id, offset):
+            self.refresh_jobs_table()
+            self.jobs_table.selectRow(self.job_queue.jobs.index(job))
+
+    def cancel_selected_job(self):
+        job = self.selected_job()
+        if job is None:
+            return
+        if job.id in self.job_runs:
+            self.job_runs[job.id][0].stop()
+        elif job.status == QUEUED:
+            self.job_queue.mark_finished(job, CANCELLED)
+            self.refresh_jobs_table()
+
+    def retry_selected_job(self):
+        job = self.selected_job()
+        if job is not None and self.job_queue.requeue(job.id):
+            self.refresh_jobs_table()
+            self.schedule_jobs()
+
+    def remove_selected_job(self):
+        job = self.selected_job()
+        if job is not None and self.job_queue.remove(job.id):
+            self.refresh_jobs_table()
+
+    def set_job_concurrency(self, value):
+        self.job_queue.concurrency = value
+        self.job_queue.save()
+        self.schedule_jobs()
+
+    def toggle_job_queue(self):
+        self.job_queue_active = not self.job_queue_active
+        self.job_queue_button.setText("Pause Queue" if self.job_queue_active else "Start Queue")
+        self.schedule_jobs()
+
+    def schedule_jobs(self):
+        """Start queued jobs while the queue is active and the concurrency limit allows."""
+        if not self.job_queue_active:
+            return
+        if not os.path.exists(self.binary_path):
+            self.toggle_job_queue()
+            self.update_binary()
+            QMessageBox.critical(self, "Error",
+                "Immich-Go binary is missing or not executable.\n\n"
+                "It is being downloaded; start the queue again once the status bar shows it is ready.")
+            return
+        # A job can finish without a process (nothing left to upload), which
+        # frees its slot again: fill slots until they are taken or nothing is queued
+        jobs = self.job_queue.next_jobs()
+        while jobs:
+            if all([self.start_job(job) for job in jobs]):
+                break
+            jobs = self.job_queue.next_jobs()
+        if not self.job_runs and not self.job_queue.next_jobs():
+            # Everything has run: stop so that newly added jobs wait for the user
+            self.toggle_job_queue()
+        self.refresh_jobs_table()
+
+    def start_job(self, job):
+        """Start a queued job's process; returns False if the job was finished without one."""
+        server = job.meta.get("server")
+        if server is not None and server.rstrip("/") != self.server_url_edit.text().rstrip("/"):
+            # The API key and the rest of the connection come from the current settings
+            self.job_queue.mark_finished(job, FAILED, summary=f"queued for {server or 'no server'}, "
+                                         f"but the server is now {self.server_url_edit.text() or 'not set'}")
+            return False
+        command_parts = job.command_parts
+        if "checkpoint" in job.meta:
+            command_parts = self.checkpoint_parts(job)
+            if command_parts is None:
+                self.job_queue.mark_finished(job, DONE, summary="all ZIPs already uploaded")
+                return False
+        command, proxy = self.launch_command(command_parts)
+        if proxy is not None:
+            self.run_proxies[job.id] = proxy
+        process = ImmichGoProcess(command, self)
+        parser = ProgressParser()
+        self.job_runs[job.id] = (process, parser)
+        process.output_received.connect(
+            lambda stream, lines, job_id=job.id: self.append_job_output(job_id, stream, lines))
+        process.process_finished.connect(
+            lambda exit_code, status, job_id=job.id: self.handle_job_finished(job_id, exit_code, status))
+        process.process_started.connect(self.prioritize_new)
+        process.process_started.connect(
+            lambda pid, job_id=job.id: self.monitor_process(job_id, pid, self.get_metrics_path(job_id)))
+        self.follow_plan(job, parser)
+        self.job_queue.mark_started(job)
+        process.start()
+        self.jobs_refresh_timer.start()
+        return True
+
+    def append_job_output(self, job_id, stream, lines):
+        self.job_runs[job_id][1].feed_lines(lines)
+        job = self.job_queue.get(job_id)
+        tracker = self.archive_trackers.get(job_id)
+        if tracker is not None:
+            for line in lines:
+                archive = tracker.feed(line)
+                if archive is not None:
+                    self.takeout_journal.mark_done(job.meta["checkpoint"], [archive])
+                    self.update_checkpoint_label(job.meta["checkpoint"])
+        self.output_view.append_lines(stream, [f"[{job.name}] {line}" for line in lines])
+
+    def handle_job_finished(self, job_id, exit_code, status):
+        process, parser = self.job_runs.pop(job_id)
+        job = self.job_queue.get(job_id)
+        self.report_proxy(job_id, f"[{job.name}] ")
+        if status == "normal" and exit_code == 0:
+            job_status = DONE
+        elif process.stop_requested:
+            job_status = CANCELLED
+        else:
+            job_status = FAILED
+        summary = self.job_summary(parser)
+        resources = self.unmonitor_process(job_id)
+        if resources is not None:
+            # The time series stays next to the job; the peak shows memory blowups at a glance
+            job.meta.update(resources)
+            summary += f", peak memory {format_bytes(resources['peak_rss'])}"
+        self.job_queue.mark_finished(job, job_status, exit_code, summary)
+        if job_status == DONE:
+            self.mark_index_uploaded(job)
+        if "checkpoint" in job.meta:
+            self.finish_checkpoint_group(job)
+        plan_id = job.meta.get("plan")
+        if self.plan_progress is not None and plan_id == self.plan_progress[0] and not any(
+                other.meta.get("plan") == plan_id and other.status not in FINISHED_STATES
+                for other in self.job_queue.jobs):
+            self.plan_dashboard.stop()
+        process.deleteLater()
+        if not self.job_runs:
+            self.jobs_refresh_timer.stop()
+        self.schedule_jobs()
+        self.refresh_jobs_table()
+
+    def finish_checkpoint_group(self, job):
+        """Record a group's finished archives; a failed group is re-queued with the rest while attempts remain."""
+        self.archive_trackers.pop(job.id, None)
+        set_id, archives = job.meta["checkpoint"], job.meta["archives"]
+        if job.status == DONE:
+            self.takeout_journal.mark_done(set_id, archives)
+        self.update_checkpoint_label(set_id)
+        remaining = self.takeout_journal.remaining(set_id, archives)
+        if job.status != FAILED or not remaining:
+            return
+        if self.takeout_journal.exhausted(set_id, remaining):
+            job.summary += f"; {len(remaining)} ZIPs left, retry to run them again"
+            self.job_queue.save()
+            return
+        summary = job.summary
+        self.job_queue.requeue(job.id)
+        job.summary = f"failed ({summary}), re-queued with {len(remaining)} of {len(archives)} ZIPs"
+        self.job_queue.save()
+
+    @staticmethod
+    def job_summary(parser):
+        snapshot = parser.snapshot()
+        return (f"{snapshot['uploaded']:,} uploaded, {snapshot['duplicates']:,} duplicates, "
+                f"{snapshot['errors']:,} errors")
+
+    def refresh_jobs_table(self):
+        selected = self.selected_job()
+        self.jobs_table.setRowCount(len(self.job_queue.jobs))
+        for row, job in enumerate(self.job_queue.jobs):
+            if job.id in self.job_runs:
+                progress = self.job_summary(self.job_runs[job.id][1])
+            elif job.exit_code not in (None, 0):
+                progress = f"exit code {job.exit_code}; {job.summary}"
+            else:
+                progress = job.summary
+            name_item = QTableWidgetItem(job.name)
+            name_item.setData(Qt.UserRole, job.id)
+            name_item.setToolTip(" ".join(job.command_parts))
+            self.jobs_table.setItem(row, 0, name_item)
+            self.jobs_table.setItem(row, 1, QTableWidgetItem(
+                "Google Takeout" if job.kind == "takeout" else "Local Upload"))
+            self.jobs_table.setItem(row, 2, QTableWidgetItem(job.status))
+            self.jobs_table.setItem(row, 3, QTableWidgetItem(progress))
+        if selected is not None and selected in self.job_queue.jobs:
+            self.jobs_table.selectRow(self.job_queue.jobs.index(selected))
 
     def validate_inputs(self):
         required = [
@@ -794,134 +2375,248 @@ class ImmichGoGUI(QMainWindow):
             )
             if files:
                 self.source_path_edit.setText("; ".join(files))
-                self.update_command_preview()
+                self.schedule_command_preview()
         else:
             folder = QFileDialog.getExistingDirectory(self, "Select Extracted Folder")
             if folder:
                 self.source_path_edit.setText(folder)
-                self.update_command_preview()
+                self.schedule_command_preview()
 
     def update_browse_mode(self, checked):
         self.source_path_edit.clear()
         self.browse_btn.setText("Browse ZIPs" if checked else "Browse Folder")
-        self.update_command_preview()
+        self.schedule_command_preview()
 
     def toggle_dates(self, enabled):
         self.start_date.setEnabled(enabled)
         self.end_date.setEnabled(enabled)
-        self.update_command_preview()
+        self.schedule_command_preview()
 
     def browse_local_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Upload Folder")
         if folder:
             self.local_path_edit.setText(folder)
-            self.update_command_preview()
-
-    def update_command_preview(self):
-        parts = [self.binary_path] if hasattr(self, "binary_path") else ["./immich-go"]
+            self.schedule_command_preview()
+
+    def connect_preview_signals(self):
+        """Schedule a preview rebuild whenever any option widget changes."""
+        for widget in self.central_widget.findChildren(QLineEdit):
+            widget.textChanged.connect(self.schedule_command_preview)
+        for widget in self.central_widget.findChildren(QCheckBox):
+            widget.toggled.connect(self.schedule_command_preview)
+        for widget in self.central_widget.findChildren(QRadioButton):
+            widget.toggled.connect(self.schedule_command_preview)
+        for widget in self.central_widget.findChildren(QComboBox):
+            widget.currentTextChanged.connect(self.schedule_command_preview)
+        for widget in self.central_widget.findChildren(QSpinBox):
+            widget.valueChanged.connect(self.schedule_command_preview)
+        for widget in self.central_widget.findChildren(QDateEdit):
+            widget.dateChanged.connect(self.schedule_command_preview)
+        self.tab_widget.currentChanged.connect(self.schedule_command_preview)
+
+    def schedule_command_preview(self, *args):
+        # Restarting the single-shot timer coalesces bursts of changes
+        self.preview_timer.start()
+
+    def get_command_preview_argv(self):
         current_tab = self.tab_widget.tabText(self.tab_widget.currentIndex())
 
         if current_tab == "Google Takeout":
-            parts += self.get_google_takeout_options()
+            parts = self.get_google_takeout_options()
         elif current_tab == "Local Upload":
-            parts += self.get_local_upload_options()
+            parts = self.get_local_upload_options()
+        else:
+            parts = []
+
+        # Same argv that run_command would start
+        return tuple(self.build_command(parts))
 
-        # Add config options after main commands
-        parts += self.get_config_options()
+    def update_command_preview(self):
+        argv = self.get_command_preview_argv()
+        missing = (not self.server_url_edit.text(), not self.api_key_edit.text())
+        # setPlainText resets the document, so only re-render on an actual change
+        if (argv, missing) == self.preview_cache:
+            return
+        self.preview_cache = (argv, missing)
 
         # Quote each part for accurate command preview
-        quoted_parts = [shlex.quote(part) for part in parts]
+        quoted_parts = [shlex.quote(part) for part in argv]
         command_text = " ".join(quoted_parts)
 
-        if not self.server_url_edit.text():
+        if missing[0]:
             command_text += "\n\n⚠️ MISSING SERVER URL"
-        if not self.api_key_edit.text():
+        if missing[1]:
             command_text += "\n⚠️ MISSING API KEY"
 
         self.command_preview.setPlainText(command_text)
 
+    def current_config(self):
+        """UploadConfig with the values currently shown in the tabs."""
+        return UploadConfig(
+            server_url=self.server_url_edit.text(),
+            api_key=self.api_key_edit.text(),
+            skip_ssl=self.skip_ssl_checkbox.isChecked(),
+            api_url=self.api_url_edit.text(),
+            client_timeout=self.client_timeout_spin.value(),
+            log_level=self.log_level_combo.currentText(),
+            device_uuid=self.device_uuid_edit.text(),
+            takeout_zip=self.zip_radio.isChecked(),
+            takeout_source=self.source_path_edit.text(),
+            create_albums=self.create_albums_check.isChecked(),
+            auto_archive=self.auto_archive_check.isChecked(),
+            untitled_albums=self.untitled_albums_check.isChecked(),
+            takeout_dry_run=self.takeout_dry_run_check.isChecked(),
+            missing_json=self.missing_json_check.isChecked(),
+            album_folder_name=self.album_folder_check.isChecked(),
+            discard_archived=self.discard_archived_check.isChecked(),
+            local_path=self.local_path_edit.text(),
+            date_filter=self.date_check.isChecked(),
+            start_date=self.start_date.date().toString("yyyy-MM-dd"),
+            end_date=self.end_date.date().toString("yyyy-MM-dd"),
+            type_filter=self.type_check.isChecked(),
+            extensions=self.type_edit.text(),
+            album_name=self.album_name_edit.text(),
+            create_album_folder=self.create_folder_check.isChecked(),
+            local_dry_run=self.dry_run_check.isChecked(),
+        )
+
+    def apply_config(self, config):
+        """Show an UploadConfig in the tabs."""
+        self.server_url_edit.setText(config.server_url)
+        self.api_key_edit.setText(config.api_key)
+        self.skip_ssl_checkbox.setChecked(config.skip_ssl)
+        self.api_url_edit.setText(config.api_url)
+        self.client_timeout_spin.setValue(config.client_timeout)
+        self.log_level_combo.setCurrentText(config.log_level)
+        self.device_uuid_edit.setText(config.device_uuid)
+
+        self.zip_radio.setChecked(config.takeout_zip)
+        self.folder_radio.setChecked(not config.takeout_zip)
+        self.update_browse_mode(self.zip_radio.isChecked())
+        self.source_path_edit.setText(config.takeout_source)
+        self.create_albums_check.setChecked(config.create_albums)
+        self.auto_archive_check.setChecked(config.auto_archive)
+        self.untitled_albums_check.setChecked(config.untitled_albums)
+        self.takeout_dry_run_check.setChecked(config.takeout_dry_run)
+        self.missing_json_check.setChecked(config.missing_json)
+        self.album_folder_check.setChecked(config.album_folder_name)
+        self.discard_archived_check.setChecked(config.discard_archived)
+
+        self.local_path_edit.setText(config.local_path)
+        self.date_check.setChecked(config.date_filter)
+        self.toggle_dates(self.date_check.isChecked())
+        self.start_date.setDate(QDate.fromString(config.start_date, "yyyy-MM-dd"))
+        self.end_date.setDate(QDate.fromString(config.end_date, "yyyy-MM-dd"))
+        self.type_check.setChecked(config.type_filter)
+        self.type_edit.setEnabled(self.type_check.isChecked())
+        self.type_edit.setText(config.extensions)
+        self.album_name_edit.setText(config.album_name)
+        self.create_folder_check.setChecked(config.create_album_folder)
+        self.dry_run_check.setChecked(config.local_dry_run)
+
+    def config_widgets(self):
+        return [
+            self.server_url_edit, self.api_key_edit, self.skip_ssl_checkbox, self.api_url_edit,
+            self.client_timeout_spin, self.log_level_combo, self.device_uuid_edit,
+            self.zip_radio, self.folder_radio, self.source_path_edit, self.create_albums_check,
+            self.auto_archive_check, self.untitled_albums_check, self.takeout_dry_run_check,
+            self.missing_json_check, self.album_folder_check, self.discard_archived_check,
+            self.local_path_edit, self.date_check, self.start_date, self.end_date, self.type_check,
+            self.type_edit, self.album_name_edit, self.create_folder_check, self.dry_run_check,
+        ]
+
+    def apply_profile(self, config):
+        """apply_config in one batch: widget signals are blocked while the values
+        are set, then the state they would have updated is refreshed once."""
+        blockers = [QSignalBlocker(widget) for widget in self.config_widgets()]
+        try:
+            self.apply_config(config)
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
+        # Scans and reports belong to the previous sources
+        self.cancel_folder_scan()
+        self.cancel_date_scan()
+        self.takeout_dedup_label.clear()
+        self.clear_takeout_inventory()
+        self.update_status()
+        self.preview_timer.stop()
+        self.update_command_preview()
+
+    def refresh_profile_combo(self, current):
+        self.profile_combo.clear()
+        self.profile_combo.addItems(self.profiles.names())
+        self.profile_combo.setCurrentText(current)
+
+    def switch_profile(self, *args):
+        name = self.profile_combo.currentText()
+        config = self.profiles.load(name)
+        if config is None:
+            self.refresh_profile_combo(self.profiles.current())
+            return
+        self.apply_profile(config)
+        self.profiles.set_current(name)
+
+    def save_profile_as(self):
+        name, ok = QInputDialog.getText(self, "Save Profile", "Profile name:", text=self.profile_combo.currentText())
+        name = name.strip()
+        if not ok or not name:
+            return
+        if not valid_name(name):
+            QMessageBox.warning(self, "Save Profile", "Profile names cannot contain slashes.")
+            return
+        if name != self.profile_combo.currentText() and name in self.profiles.names():
+            answer = QMessageBox.question(self, "Save Profile", f"Replace the profile \"{name}\"?")
+            if answer != QMessageBox.Yes:
+                return
+        self.profiles.save(name, self.current_config())
+        self.profiles.set_current(name)
+        self.refresh_profile_combo(name)
+
+    def delete_profile(self):
+        name = self.profile_combo.currentText()
+        if name == DEFAULT_PROFILE:
+            QMessageBox.information(self, "Delete Profile", "The default profile cannot be deleted.")
+            return
+        answer = QMessageBox.question(self, "Delete Profile", f"Delete the profile \"{name}\"?")
+        if answer != QMessageBox.Yes:
+            return
+        self.profiles.delete(name)
+        self.refresh_profile_combo(DEFAULT_PROFILE)
+        self.switch_profile()
+
+    def import_profiles(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Profiles", "", "JSON files (*.json)")
+        if not path:
+            return
+        try:
+            names = self.profiles.import_file(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Import Profiles", f"Could not import {path}: {e}")
+            return
+        self.refresh_profile_combo(self.profile_combo.currentText())
+        QMessageBox.information(self, "Import Profiles", f"Imported {len(names)} profile(s): {', '.join(names)}")
+
+    def export_profiles(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Profiles", "immich-go-profiles.json", "JSON files (*.json)")
+        if not path:
+            return
+        try:
+            names = self.profiles.export_file(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Profiles", f"Could not export to {path}: {e}")
+            return
+        QMessageBox.information(self, "Export Profiles",
+                                f"Exported {len(names)} profile(s) to {path}.\nThe file contains the API keys.")
+
     def get_config_options(self):
-        options = []
-        if self.server_url_edit.text():
-            options.append(f"--server={self.server_url_edit.text()}")
-        if self.api_key_edit.text():
-            # Change -key to --api-key
-            options.append(f"--api-key={self.api_key_edit.text()}")
-        if self.skip_ssl_checkbox.isChecked():
-            options.append("--skip-verify-ssl")
-        if self.api_url_edit.text():
-            options.append(f"--api-url={self.api_url_edit.text()}")
-        if self.client_timeout_spin.value() != 1:
-            options.append(f"--client-timeout={self.client_timeout_spin.value()}")
-        if self.log_level_combo.currentText() != "ERROR":
-            options.append(f"--log-level={self.log_level_combo.currentText()}")
-        if self.device_uuid_edit.text():
-            options.append(f"--device-uuid={self.device_uuid_edit.text()}")
-        return options
+        return self.current_config().config_options()
 
     def get_google_takeout_options(self):
-        # Update to use the new from-google-photos subcommand
-        options = ["upload", "from-google-photos"]
-        flag_options = []  # Temporarily store flag-like options.
-
-        if self.create_albums_check.isChecked():
-            flag_options.append("--create-albums")
-        if self.auto_archive_check.isChecked():
-            flag_options.append("--auto-archive")
-        if self.untitled_albums_check.isChecked():
-            flag_options.append("--keep-untitled-albums")
-        if self.takeout_dry_run_check.isChecked():
-            flag_options.append("--dry-run")
-        if self.missing_json_check.isChecked():
-            flag_options.append("--upload-when-missing-JSON")
-        if self.album_folder_check.isChecked():
-            flag_options.append("--use-album-folder-as-name")
-        if self.discard_archived_check.isChecked():
-            flag_options.append("--discard-archived")
-
-        source_path = self.source_path_edit.text()
-        if self.zip_radio.isChecked():
-            zip_files = [path.strip() for path in source_path.split(";") if path.strip()]
-            options += flag_options  # Append flag-like options first
-            if zip_files:
-                options += zip_files  # Then, append paths.
-        elif source_path:
-            options += flag_options  # Append flag-like options first
-            options.append(source_path) #Finally add the path
-        else:
-            options += flag_options #Add the rest of the options at last
-
-        return options
+        return self.current_config().google_takeout_options()
 
     def get_local_upload_options(self):
-        # Update to use the new from-folder subcommand
-        options = ["upload", "from-folder"]
-        flag_options = []  # Temp
-
-        if self.date_check.isChecked():
-            start = self.start_date.date().toString("yyyy-MM-dd")
-            end = self.end_date.date().toString("yyyy-MM-dd")
-            flag_options.append(f"--date-filter={start},{end}")
-        if self.type_check.isChecked() and self.type_edit.text():
-            exts = self.type_edit.text().replace(" ", "").strip()
-            if exts:
-                flag_options.append(f'--file-filter="{exts}"')
-
-        if self.album_name_edit.text():
-            album_name = self.album_name_edit.text()
-            flag_options.append(f'--album="{album_name}"') # Quote album name if it contains spaces
-        if self.create_folder_check.isChecked():
-            flag_options.append("--create-album-folder")
-        if self.dry_run_check.isChecked():
-            flag_options.append("--dry-run")
-
-        source_path = self.local_path_edit.text()
-        if source_path:
-            options += flag_options
-            options.append(source_path) # Finally add the Path
-        else:
-            options += flag_options #Add the rest of the options at last
-        return options
+        return self.current_config().local_upload_options()
 
     def update_status(self):
         is_valid_config = self.validate_inputs() # Validate config and get status
@@ -939,8 +2634,11 @@ class ImmichGoGUI(QMainWindow):
             self.status_indicator.setStyleSheet("color: green;")
 
         # Enable/Disable Run Buttons based on config validity
-        self.run_takeout_button.setEnabled(is_valid_config)
-        self.run_local_button.setEnabled(is_valid_config)
+        is_idle = self.running_process is None
+        self.run_takeout_button.setEnabled(is_valid_config and is_idle)
+        self.run_local_button.setEnabled(is_valid_config and is_idle)
+        self.queue_takeout_button.setEnabled(is_valid_config)
+        self.queue_local_button.setEnabled(is_valid_config)
 
 
     def open_github_link(self):
@@ -948,88 +2646,63 @@ class ImmichGoGUI(QMainWindow):
         QDesktopServices.openUrl(url)
 
     def save_configuration(self):
-        self.settings.setValue("server_url", self.server_url_edit.text())
-        # We're still saving as "api_key" in settings - just the command line flag name changed
-        self.settings.setValue("api_key", self.api_key_edit.text())
-        self.settings.setValue("skip_ssl", self.skip_ssl_checkbox.isChecked())
-        self.settings.setValue("api_url", self.api_url_edit.text())
-        self.settings.setValue("client_timeout", self.client_timeout_spin.value())
-        self.settings.setValue("log_level", self.log_level_combo.currentText())
-        self.settings.setValue("device_uuid", self.device_uuid_edit.text())
-
-        self.settings.setValue("google_takeout_zip_radio", self.zip_radio.isChecked())
-        self.settings.setValue("google_takeout_folder_radio", self.folder_radio.isChecked())
-        self.settings.setValue("google_takeout_source_path", self.source_path_edit.text())
-        self.settings.setValue("google_takeout_create_albums", self.create_albums_check.isChecked())
-        self.settings.setValue("google_takeout_auto_archive", self.auto_archive_check.isChecked())
-        self.settings.setValue("google_takeout_untitled_albums", self.untitled_albums_check.isChecked())
-        self.settings.setValue("google_takeout_dry_run", self.takeout_dry_run_check.isChecked())
-        self.settings.setValue("google_takeout_missing_json", self.missing_json_check.isChecked())
-        self.settings.setValue("google_takeout_album_folder_name", self.album_folder_check.isChecked())
-        self.settings.setValue("google_takeout_discard_archived", self.discard_archived_check.isChecked())
+        name = self.profile_combo.currentText()
+        self.profiles.save(name, self.current_config())
+        self.profiles.set_current(name)
         adv_group_config = self.tab_widget.widget(0).widget().findChild(QGroupBox, "Advanced Configuration")
         if adv_group_config is not None:
             self.settings.setValue("config_adv_group_checked", adv_group_config.isChecked())
         adv_group_google_takeout = self.tab_widget.widget(1).widget().findChild(QGroupBox, "Advanced Options")
         if adv_group_google_takeout is not None:
             self.settings.setValue("google_takeout_adv_group_checked", adv_group_google_takeout.isChecked())
-
-        self.settings.setValue("local_upload_path", self.local_path_edit.text())
-        self.settings.setValue("local_upload_date_check", self.date_check.isChecked())
-        self.settings.setValue("local_upload_start_date", self.start_date.date())
-        self.settings.setValue("local_upload_end_date", self.end_date.date())
-        self.settings.setValue("local_upload_type_check", self.type_check.isChecked())
-        self.settings.setValue("local_upload_type_edit", self.type_edit.text())
-        self.settings.setValue("local_upload_album_name", self.album_name_edit.text())
-        self.settings.setValue("local_upload_create_folder_check", self.create_folder_check.isChecked())
-        self.settings.setValue("local_upload_dry_run_check", self.dry_run_check.isChecked())
+        self.settings.setValue("local_upload_dedup_check", self.local_dedup_check.isChecked())
+        self.current_throttle().to_settings(self.settings)
+        self.settings.setValue("proxy_cache_enabled", self.cache_group.isChecked())
+        self.settings.setValue("proxy_cache_ttl", self.cache_ttl_spin.value())
 
     def load_configuration(self):
-        self.server_url_edit.setText(self.settings.value("server_url", ""))
-        self.api_key_edit.setText(self.settings.value("api_key", ""))
-        self.skip_ssl_checkbox.setChecked(self.settings.value("skip_ssl", False, type=bool))
-        self.api_url_edit.setText(self.settings.value("api_url", ""))
-        self.client_timeout_spin.setValue(self.settings.value("client_timeout", 1, type=int))
-        self.log_level_combo.setCurrentText(self.settings.value("log_level", "ERROR"))
-        self.device_uuid_edit.setText(self.settings.value("device_uuid", ""))
-
-        self.zip_radio.setChecked(self.settings.value("google_takeout_zip_radio", True, type=bool))
-        self.folder_radio.setChecked(self.settings.value("google_takeout_folder_radio", False, type=bool))
-        self.update_browse_mode(self.zip_radio.isChecked())
-        self.source_path_edit.setText(self.settings.value("google_takeout_source_path", ""))
-        self.create_albums_check.setChecked(self.settings.value("google_takeout_create_albums", True, type=bool))
-        self.auto_archive_check.setChecked(self.settings.value("google_takeout_auto_archive", True, type=bool))
-        self.untitled_albums_check.setChecked(self.settings.value("google_takeout_untitled_albums", False, type=bool))
-        self.takeout_dry_run_check.setChecked(self.settings.value("google_takeout_dry_run", False, type=bool))
-        self.missing_json_check.setChecked(self.settings.value("google_takeout_missing_json", False, type=bool))
-        self.album_folder_check.setChecked(self.settings.value("google_takeout_album_folder_name", False, type=bool))
-        self.discard_archived_check.setChecked(self.settings.value("google_takeout_discard_archived", False, type=bool))
+        name = self.profiles.current()
+        self.refresh_profile_combo(name)
+        self.apply_profile(self.profiles.load(name))
         adv_group_google_takeout = self.tab_widget.widget(1).widget().findChild(QGroupBox, "Advanced Options")
         if adv_group_google_takeout is not None:
             adv_group_google_takeout.setChecked(self.settings.value("google_takeout_adv_group_checked", False, type=bool))
-
-        self.local_path_edit.setText(self.settings.value("local_upload_path", ""))
-        self.date_check.setChecked(self.settings.value("local_upload_date_check", False, type=bool))
-        self.toggle_dates(self.date_check.isChecked())
-        self.start_date.setDate(self.settings.value("local_upload_start_date", QDate.currentDate().addYears(-1)))
-        self.end_date.setDate(self.settings.value("local_upload_end_date", QDate.currentDate()))
-        self.type_check.setChecked(self.settings.value("local_upload_type_check", False, type=bool))
-        self.type_edit.setEnabled(self.type_check.isChecked())
-        self.type_edit.setText(self.settings.value("local_upload_type_edit", ""))
-        self.album_name_edit.setText(self.settings.value("local_upload_album_name", ""))
-        self.create_folder_check.setChecked(self.settings.value("local_upload_create_folder_check", False, type=bool))
-        self.dry_run_check.setChecked(self.settings.value("local_upload_dry_run_check", False, type=bool))
+        self.local_dedup_check.setChecked(self.settings.value("local_upload_dedup_check", False, type=bool))
+        self.apply_throttle(ThrottleSchedule.from_settings(self.settings))
+        self.cache_group.setChecked(self.settings.value("proxy_cache_enabled", False, type=bool))
+        self.cache_ttl_spin.setValue(self.settings.value("proxy_cache_ttl", 10, type=int))
+        self.apply_throttle_schedule()
         adv_group_config = self.tab_widget.widget(0).widget().findChild(QGroupBox, "Advanced Configuration")
         if adv_group_config is not None:
             adv_group_config.setChecked(self.settings.value("config_adv_group_checked", False, type=bool))
 
-
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    app.setStyle("Fusion")
-    from PySide6.QtGui import QFont
-    app.setFont(QFont("Segoe UI", 10))
-    window = ImmichGoGUI()
+    # --profile-startup[=path] writes an import/construction time breakdown and exits
+    profile_path = None
+    for arg in sys.argv[1:]:
+        if arg == "--profile-startup":
+            profile_path = "startup_profile.json"
+        elif arg.startswith("--profile-startup="):
+            profile_path = arg.split("=", 1)[1]
+
+    with startup_phase("qapplication"):
+        app = QApplication(sys.argv)
+        app.setStyle("Fusion")
+        from PySide6.QtGui import QFont
+        app.setFont(QFont("Segoe UI", 10))
+    with startup_phase("main_window"):
+        window = ImmichGoGUI()
     window.show()
     window.update_status()
-    sys.exit(app.exec())
\ No newline at end of file
+
+    if profile_path:
+        from startup_profile import write_report
+
+        def finish_profile(first_paint_ms):
+            write_report(profile_path, STARTUP_TIME, first_paint_ms)
+            print(f"Startup profile written to {profile_path} (first paint {first_paint_ms:.0f} ms)")
+            window.close()
+
+        window.first_painted.connect(finish_profile, Qt.QueuedConnection)
+
+    sys.exit(app.exec())
@@ -0,0 +1,199 @@
+"""Upload configuration without any GUI.
+
+UploadConfig holds every setting of the Configuration, Google Takeout and
+Local Upload tabs as plain values and builds the immich-go arguments from
+them. The window fills one from its widgets; headless runs load one from
+the saved settings. Nothing here imports Qt: from_settings and to_settings
+accept any object with QSettings' value()/setValue().
+"""
+import datetime
+import os
+import re
+import sys
+
+
+EMBEDDED_RUN_OPTIONS = ["--no-ui"]
+
+# attribute -> (settings key, default)
+FIELDS = {
+    "server_url": ("server_url", ""),
+    "api_key": ("api_key", ""),
+    "skip_ssl": ("skip_ssl", False),
+    "api_url": ("api_url", ""),
+    "client_timeout": ("client_timeout", 1),
+    "log_level": ("log_level", "ERROR"),
+    "device_uuid": ("device_uuid", ""),
+    "takeout_zip": ("google_takeout_zip_radio", True),
+    "takeout_source": ("google_takeout_source_path", ""),
+    "create_albums": ("google_takeout_create_albums", True),
+    "auto_archive": ("google_takeout_auto_archive", True),
+    "untitled_albums": ("google_takeout_untitled_albums", False),
+    "takeout_dry_run": ("google_takeout_dry_run", False),
+    "missing_json": ("google_takeout_missing_json", False),
+    "album_folder_name": ("google_takeout_album_folder_name", False),
+    "discard_archived": ("google_takeout_discard_archived", False),
+    "local_path": ("local_upload_path", ""),
+    "date_filter": ("local_upload_date_check", False),
+    "start_date": ("local_upload_start_date", None),  # "yyyy-MM-dd"
+    "end_date": ("local_upload_end_date", None),
+    "type_filter": ("local_upload_type_check", False),
+    "extensions": ("local_upload_type_edit", ""),
+    "album_name": ("local_upload_album_name", ""),
+    "create_album_folder": ("local_upload_create_folder_check", False),
+    "local_dry_run": ("local_upload_dry_run_check", False),
+}
+DATE_FIELDS = ("start_date", "end_date")
+
+
+def default_dates():
+    """The GUI's initial date range: one year back from today."""
+    today = datetime.date.today()
+    try:
+        start = today.replace(year=today.year - 1)
+    except ValueError:
+        start = today.replace(year=today.year - 1, day=28)  # February 29th
+    return start.isoformat(), today.isoformat()
+
+
+def default_binary_path():
+    binary_filename = "immich-go.exe" if sys.platform.startswith("win") else "immich-go"
+    return os.path.abspath(os.path.join(os.getcwd(), "immich-go", binary_filename))
+
+
+def build_command(binary_path, command_parts, config_options):
+    # Command structure: [binary] [main command] [sub-command] [options]
+    command = [binary_path] + list(command_parts)
+    if command_parts[:1] == ["upload"]:
+        # Output is streamed by the caller, so immich-go's own terminal UI is not wanted
+        command += EMBEDDED_RUN_OPTIONS
+    return command + config_options
+
+
+class UploadConfig:
+    def __init__(self, **values):
+        for name, (_, default) in FIELDS.items():
+            setattr(self, name, default)
+        self.start_date, self.end_date = default_dates()
+        for name, value in values.items():
+            if name not in FIELDS:
+                raise TypeError(f"Unknown setting: {name}")
+            setattr(self, name, value)
+
+    @classmethod
+    def from_settings(cls, settings):
+        config = cls()
+        for name, (key, default) in FIELDS.items():
+            if name in DATE_FIELDS:
+                value = settings.value(key)
+                if hasattr(value, "toString"):
+                    value = value.toString("yyyy-MM-dd")  # Saved as a QDate by older versions
+                if value:
+                    setattr(config, name, str(value))
+            else:
+                setattr(config, name, settings.value(key, default, type=type(default)))
+        return config
+
+    def to_settings(self, settings):
+        for name, (key, _) in FIELDS.items():
+            settings.setValue(key, getattr(self, name))
+        settings.setValue("google_takeout_folder_radio", not self.takeout_zip)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in FIELDS}
+
+    @classmethod
+    def from_dict(cls, values):
+        """Inverse of to_dict; unknown keys and values of the wrong type are ignored."""
+        config = cls()
+        for name, (_, default) in FIELDS.items():
+            value = values.get(name)
+            if name in DATE_FIELDS:
+                if value and isinstance(value, str):
+                    setattr(config, name, value)
+            elif isinstance(value, type(default)):
+                setattr(config, name, value)
+        return config
+
+    def validate(self):
+        """Problems that prevent a run, as messages."""
+        errors = []
+        if not re.match(r"^https?://.+", self.server_url):
+            errors.append("Server URL required")
+        if not self.api_key:
+            errors.append("API Key required")
+        return errors
+
+    def config_options(self):
+        options = []
+        if self.server_url:
+            options.append(f"--server={self.server_url}")
+        if self.api_key:
+            # Change -key to --api-key
+            options.append(f"--api-key={self.api_key}")
+        if self.skip_ssl:
+            options.append("--skip-verify-ssl")
+        if self.api_url:
+            options.append(f"--api-url={self.api_url}")
+        if self.client_timeout != 1:
+            options.append(f"--client-timeout={self.client_timeout}")
+        if self.log_level != "ERROR":
+            options.append(f"--log-level={self.log_level}")
+        if self.device_uuid:
+            options.append(f"--device-uuid={self.device_uuid}")
+        return options
+
+    def takeout_sources(self):
+        if self.takeout_zip:
+            return [path.strip() for path in self.takeout_source.split(";") if path.strip()]
+        return [self.takeout_source] if self.takeout_source else []
+
+    def google_takeout_flags(self):
+        """google_takeout_options() without the ZIPs or folder, for runs given their own sources."""
+        # Update to use the new from-google-photos subcommand
+        options = ["upload", "from-google-photos"]
+
+        if self.create_albums:
+            options.append("--create-albums")
+        if self.auto_archive:
+            options.append("--auto-archive")
+        if self.untitled_albums:
+            options.append("--keep-untitled-albums")
+        if self.takeout_dry_run:
+            options.append("--dry-run")
+        if self.missing_json:
+            options.append("--upload-when-missing-JSON")
+        if self.album_folder_name:
+            options.append("--use-album-folder-as-name")
+        if self.discard_archived:
+            options.append("--discard-archived")
+        return options
+
+    def google_takeout_options(self):
+        # Flag-like options first, then the ZIPs or folder
+        return self.google_takeout_flags() + self.takeout_sources()
+
+    def local_upload_flags(self):
+        """local_upload_options() without the folder, for runs given their own paths."""
+        # Update to use the new from-folder subcommand
+        options = ["upload", "from-folder"]
+
+        if self.date_filter:
+            options.append(f"--date-filter={self.start_date},{self.end_date}")
+        if self.type_filter and self.extensions:
+            exts = self.extensions.replace(" ", "").strip()
+            if exts:
+                options.append(f'--file-filter="{exts}"')
+
+        if self.album_name:
+            options.append(f'--album="{self.album_name}"')  # Quote album name if it contains spaces
+        if self.create_album_folder:
+            options.append("--create-album-folder")
+        if self.local_dry_run:
+            options.append("--dry-run")
+        return options
+
+    def local_upload_options(self):
+        options = self.local_upload_flags()
+        if self.local_path:
+            options.append(self.local_path)  # Finally add the Path
+        return options
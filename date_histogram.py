@@ -0,0 +1,87 @@
+"""Files-per-month bar chart for the Local Upload date filter.
+
+Months inside the selected date range are highlighted; hovering a bar shows
+its exact counts.
+"""
+import datetime
+
+from PySide6.QtCore import QRectF, Qt
+from PySide6.QtGui import QColor, QPainter
+from PySide6.QtWidgets import QToolTip, QWidget
+
+from progress import format_bytes
+
+
+IN_RANGE_COLOR = QColor("#1565C0")
+OUT_OF_RANGE_COLOR = QColor("#B0BEC5")
+AXIS_COLOR = QColor("#666")
+LABEL_HEIGHT = 16
+
+
+class DateHistogram(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.months = []  # [((year, month), files, bytes)] without gaps, oldest first
+        self.start = None
+        self.end = None
+        self.setMinimumHeight(120)
+        self.setMouseTracking(True)
+
+    def set_summary(self, summary):
+        counts = summary.months()
+        self.months = []
+        if counts:
+            year, month = min(counts)
+            last = max(counts)
+            while (year, month) <= last:
+                files, size = counts.get((year, month), (0, 0))
+                self.months.append(((year, month), files, size))
+                year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        self.update()
+
+    def set_range(self, start, end):
+        self.start, self.end = start, end
+        self.update()
+
+    def in_range(self, year, month):
+        if self.start is None or self.end is None:
+            return True
+        first = datetime.date(year, month, 1)
+        last = datetime.date(year + 1, 1, 1) if month == 12 else datetime.date(year, month + 1, 1)
+        return first <= self.end and last > self.start
+
+    def bar_width(self):
+        return self.width() / max(1, len(self.months))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        chart_height = self.height() - LABEL_HEIGHT
+        if not self.months:
+            painter.setPen(AXIS_COLOR)
+            painter.drawText(self.rect(), Qt.AlignCenter, "No dated files")
+            return
+        highest = max(files for _, files, _ in self.months) or 1
+        width = self.bar_width()
+        painter.setPen(Qt.NoPen)
+        for position, ((year, month), files, _) in enumerate(self.months):
+            height = chart_height * files / highest
+            painter.setBrush(IN_RANGE_COLOR if self.in_range(year, month) else OUT_OF_RANGE_COLOR)
+            painter.drawRect(QRectF(position * width, chart_height - height, max(1.0, width - 1), height))
+
+        # Year labels under each January (and the first month), skipping ones that would overlap
+        painter.setPen(AXIS_COLOR)
+        last_label_end = -1.0
+        for position, ((year, month), _, _) in enumerate(self.months):
+            x = position * width
+            if (month == 1 or position == 0) and x > last_label_end and x + 30 <= self.width():
+                painter.drawText(QRectF(x, chart_height, 40, LABEL_HEIGHT), Qt.AlignLeft, str(year))
+                last_label_end = x + 40
+
+    def mouseMoveEvent(self, event):
+        if not self.months:
+            return
+        position = int(event.position().x() / self.bar_width())
+        if 0 <= position < len(self.months):
+            (year, month), files, size = self.months[position]
+            QToolTip.showText(event.globalPosition().toPoint(),
+                              f"{year}-{month:02d}: {files:,} files, {format_bytes(size)}", self)
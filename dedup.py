@@ -0,0 +1,254 @@
+"""Content-hash duplicate detection before upload.
+
+Files are narrowed down in three rounds so most of them are never read in
+full: only files sharing a size get a partial hash (first and last 64 KiB),
+and only files sharing size and partial hash get a full hash. Hashing runs
+in a process pool and every hash is cached in SQLite by path, size and
+mtime, so re-runs only hash what changed.
+
+Run "python dedup.py --benchmark" to measure hash throughput per core.
+"""
+import argparse
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+PARTIAL_BYTES = 64 * 1024
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_WORKERS = os.cpu_count() or 4
+SIDECAR_EXTENSIONS = (".json",)
+
+
+def process_pool(workers):
+    # Spawned workers: forking the multi-threaded GUI process is not safe
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    partial TEXT,
+    full TEXT
+);
+"""
+
+
+def partial_hash(path):
+    """Hash of the first and last PARTIAL_BYTES of a file; None if unreadable."""
+    try:
+        with open(path, "rb") as f:
+            digest = hashlib.blake2b(f.read(PARTIAL_BYTES), digest_size=16)
+            size = os.fstat(f.fileno()).st_size
+            if size > 2 * PARTIAL_BYTES:
+                f.seek(-PARTIAL_BYTES, os.SEEK_END)
+            digest.update(f.read(PARTIAL_BYTES))
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+def full_hash(path):
+    try:
+        digest = hashlib.blake2b(digest_size=32)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+class HashCache:
+    def __init__(self, db_path):
+        self.db = sqlite3.connect(db_path, timeout=30)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def get(self, path, size, mtime_ns, kind):
+        """Cached partial or full hash, if the file is unchanged since it was hashed."""
+        row = self.db.execute(
+            f"SELECT {kind} FROM hashes WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (path, size, mtime_ns)).fetchone()
+        return row[0] if row else None
+
+    def put(self, path, size, mtime_ns, kind, value):
+        row = self.db.execute("SELECT size, mtime_ns FROM hashes WHERE path = ?", (path,)).fetchone()
+        if row != (size, mtime_ns):
+            # New or changed file: drop the hashes of the old content
+            self.db.execute("INSERT OR REPLACE INTO hashes (path, size, mtime_ns) VALUES (?, ?, ?)",
+                            (path, size, mtime_ns))
+        self.db.execute(f"UPDATE hashes SET {kind} = ? WHERE path = ?", (value, path))
+
+    def commit(self):
+        self.db.commit()
+
+
+class DedupResult:
+    def __init__(self):
+        self.files = 0
+        self.duplicates = {}  # duplicate path -> path of the copy that is kept
+        self.saved_bytes = 0
+        self.hashed_bytes = 0  # Bytes actually read this run (cache misses)
+        self.cancelled = False
+        self.elapsed = 0.0
+
+
+def group_by(items, key):
+    groups = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def find_duplicates(files, cache=None, keep=(), workers=DEFAULT_WORKERS, cancel_event=None):
+    """Find files with identical content.
+
+    files is a list of (path, size, mtime_ns). In every group of identical
+    files one copy is kept (one listed in keep if possible, otherwise the
+    first path) and the others are reported as duplicates of it.
+    """
+    cancel_event = cancel_event or threading.Event()
+    keep = set(keep)
+    result = DedupResult()
+    result.files = len(files)
+    started = time.monotonic()
+
+    candidates = [item for group in group_by(files, lambda item: item[1]) for item in group if item[1] > 0]
+    with process_pool(workers) as pool:
+        hashes = {}
+        for kind, function in (("partial", partial_hash), ("full", full_hash)):
+            if cancel_event.is_set():
+                result.cancelled = True
+                break
+            missing = []
+            for path, size, mtime_ns in candidates:
+                value = cache.get(path, size, mtime_ns, kind) if cache else None
+                if value is None:
+                    missing.append((path, size, mtime_ns))
+                hashes[(kind, path)] = value
+            paths = [path for path, _, _ in missing]
+            for (path, size, mtime_ns), value in zip(missing, pool.map(function, paths, chunksize=16)):
+                hashes[(kind, path)] = value
+                result.hashed_bytes += min(size, 2 * PARTIAL_BYTES) if kind == "partial" else size
+                if cache and value is not None:
+                    cache.put(path, size, mtime_ns, kind, value)
+            if cache:
+                cache.commit()
+            # Unreadable files (None) never count as duplicates
+            readable = [item for item in candidates if hashes[(kind, item[0])] is not None]
+            candidates = [item for group in group_by(
+                readable, lambda item: (item[1], hashes[(kind, item[0])])) for item in group]
+
+    if not result.cancelled:
+        for group in group_by(candidates, lambda item: hashes[("full", item[0])]):
+            group.sort(key=lambda item: (item[0] not in keep, item[0]))
+            original = group[0][0]
+            for path, size, _ in group[1:]:
+                if path not in keep:
+                    result.duplicates[path] = original
+                    result.saved_bytes += size
+    result.elapsed = time.monotonic() - started
+    return result
+
+
+def zip_duplicates(zip_paths, cancel_event=None):
+    """Duplicates across and within ZIP archives, by CRC-32 and size from the central directories.
+
+    Returns (media files, duplicate count, duplicate bytes), or None if
+    cancel_event is set before every archive has been read. Nothing is
+    decompressed; JSON sidecars are ignored.
+    """
+    from takeout_inspector import read_central_directory
+
+    seen = set()
+    files = duplicates = saved_bytes = 0
+    for zip_path in zip_paths:
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        for name, size, _, crc in read_central_directory(zip_path):
+            if name.endswith("/") or not size or name.lower().endswith(SIDECAR_EXTENSIONS):
+                continue
+            files += 1
+            if (crc, size) in seen:
+                duplicates += 1
+                saved_bytes += size
+            else:
+                seen.add((crc, size))
+    return files, duplicates, saved_bytes
+
+
+def walk_files(root):
+    """(path, size, mtime_ns) for every regular file below root."""
+    files = []
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            files.append((entry.path, st.st_size, st.st_mtime_ns))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return files
+
+
+def benchmark(size_mb=256, workers=DEFAULT_WORKERS, file_mb=16):
+    """Full-hash throughput over temporary files; returns MB/s overall and per core."""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = []
+        block = os.urandom(CHUNK_SIZE)
+        for number in range(max(1, size_mb // file_mb)):
+            path = os.path.join(folder, f"bench{number}.bin")
+            with open(path, "wb") as f:
+                for _ in range(file_mb):
+                    f.write(block)
+            paths.append(path)
+        total_mb = len(paths) * file_mb
+
+        with process_pool(workers) as pool:
+            list(pool.map(full_hash, paths[:workers]))  # Start the workers before timing
+            started = time.perf_counter()
+            list(pool.map(full_hash, paths))
+            elapsed = time.perf_counter() - started
+
+    used = min(workers, len(paths))
+    return {
+        "total_mb": total_mb,
+        "workers": used,
+        "seconds": round(elapsed, 3),
+        "mb_per_s": round(total_mb / elapsed, 1),
+        "mb_per_s_per_core": round(total_mb / elapsed / used, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Content-hash duplicate detection for local uploads.")
+    parser.add_argument("--benchmark", action="store_true", help="measure full-hash throughput per core")
+    parser.add_argument("--size-mb", type=int, default=256, help="data hashed by the benchmark")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args(argv)
+    if not args.benchmark:
+        parser.error("nothing to do; pass --benchmark")
+    results = benchmark(args.size_mb, args.workers)
+    print(f"Hashed {results['total_mb']} MB with {results['workers']} workers in {results['seconds']} s: "
+          f"{results['mb_per_s']} MB/s ({results['mb_per_s_per_core']} MB/s per core)")
+
+
+if __name__ == "__main__":
+    main()
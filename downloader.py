@@ -0,0 +1,319 @@
+"""Resumable, range-aware downloader for immich-go release archives.
+
+A download is written to ``<dest>.part`` next to a ``<dest>.part.json``
+metadata file holding the validators (ETag, Last-Modified, size) of the
+remote file. An interrupted or failed download resumes with an HTTP Range
+request as long as the validators still match; otherwise it starts over.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3Error
+
+
+MIN_CHUNK_SIZE = 64 * 1024  # 64 KiB
+MAX_CHUNK_SIZE = 4 * 1024 * 1024  # 4 MiB
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024  # Don't split files smaller than this per segment
+META_SAVE_INTERVAL = 1.0  # Seconds between metadata checkpoints
+
+
+class DownloadError(Exception):
+    """Raised when a download fails after all retries."""
+
+
+class DownloadCancelled(Exception):
+    """Raised when a download is cancelled through its cancel event."""
+
+
+def create_session(pool_size=4):
+    """Create a requests session whose connection pool fits pool_size parallel segments."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class ResumableDownloader:
+    """Download url to dest_path, resuming from a previous partial download if possible.
+
+    progress_callback is called as progress_callback(downloaded, total) from the
+    downloading thread(s); total is 0 when the server does not report a size.
+    """
+
+    def __init__(self, url, dest_path, session=None, segments=1, max_retries=5,
+                 backoff_base=0.5, backoff_max=30.0, timeout=30,
+                 progress_callback=None, cancel_event=None):
+        self.url = url
+        self.dest_path = dest_path
+        self.part_path = dest_path + ".part"
+        self.meta_path = dest_path + ".part.json"
+        self.segments = max(1, segments)
+        self.session = session or create_session(self.segments)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event or threading.Event()
+
+        self.lock = threading.Lock()
+        self.meta = {}
+        self.downloaded = 0
+        self.last_meta_save = 0.0
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def download(self):
+        """Run the download with bounded exponential-backoff retries and return dest_path."""
+        attempt = 0
+        while True:
+            self.check_cancelled()
+            try:
+                self.attempt()
+                return self.dest_path
+            except DownloadCancelled:
+                raise
+            except (requests.RequestException, Urllib3Error, OSError, DownloadError) as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise DownloadError(f"Download failed after {attempt} attempts: {e}") from e
+                delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+                # Wait for the backoff delay, but wake up immediately on cancel
+                if self.cancel_event.wait(delay):
+                    raise DownloadCancelled()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise DownloadCancelled()
+
+    def attempt(self):
+        remote = self.probe()
+        self.meta = self.load_meta()
+        if not self.meta_matches(remote):
+            self.discard_partial()
+            self.meta = dict(remote)
+
+        can_split = (remote["accept_ranges"] and remote["size"] >= MIN_SEGMENT_SIZE * 2)
+        if "segments" in self.meta or (self.segments > 1 and can_split and not os.path.exists(self.part_path)):
+            if not remote["accept_ranges"]:
+                # Server stopped advertising ranges; the segmented part file is useless
+                self.discard_partial()
+                self.meta = dict(remote)
+                self.download_sequential()
+            else:
+                self.download_segmented()
+        else:
+            self.download_sequential()
+
+        self.finalize()
+
+    def probe(self):
+        """Fetch the validators of the remote file with a HEAD request."""
+        response = self.session.head(self.url, allow_redirects=True, timeout=self.timeout)
+        response.raise_for_status()
+        return {
+            "url": self.url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "size": int(response.headers.get("Content-Length", 0)),
+            "accept_ranges": response.headers.get("Accept-Ranges", "").lower() == "bytes",
+        }
+
+    def meta_matches(self, remote):
+        if not self.meta or not os.path.exists(self.part_path):
+            return False
+        for key in ("url", "etag", "last_modified", "size"):
+            if self.meta.get(key) != remote[key]:
+                return False
+        # Without any validator we can't tell whether the remote file changed
+        return bool(remote["etag"] or remote["last_modified"])
+
+    def load_meta(self):
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_meta(self, force=False):
+        now = time.monotonic()
+        if not force and now - self.last_meta_save < META_SAVE_INTERVAL:
+            return
+        self.last_meta_save = now
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def discard_partial(self):
+        for path in (self.part_path, self.meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def if_range(self):
+        # Strong ETags are preferred; Last-Modified is the fallback validator
+        etag = self.meta.get("etag")
+        if etag and not etag.startswith("W/"):
+            return etag
+        return self.meta.get("last_modified")
+
+    def report_progress(self, amount):
+        with self.lock:
+            self.downloaded += amount
+            downloaded = self.downloaded
+        if self.progress_callback:
+            self.progress_callback(downloaded, self.meta.get("size", 0))
+
+    def iter_chunks(self, response):
+        """Yield chunks from response, growing the chunk size while reads stay fast."""
+        chunk_size = MIN_CHUNK_SIZE
+        while True:
+            self.check_cancelled()
+            started = time.monotonic()
+            data = response.raw.read(chunk_size, decode_content=True)
+            if not data:
+                return
+            yield data
+            elapsed = time.monotonic() - started
+            if elapsed < 0.05 and chunk_size < MAX_CHUNK_SIZE:
+                chunk_size *= 2
+            elif elapsed > 0.5 and chunk_size > MIN_CHUNK_SIZE:
+                chunk_size //= 2
+
+    def download_sequential(self):
+        offset = os.path.getsize(self.part_path) if os.path.exists(self.part_path) else 0
+        size = self.meta.get("size", 0)
+        self.downloaded = offset
+        if size and offset >= size:
+            return
+
+        headers = {}
+        validator = self.if_range()
+        if offset and validator:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+        elif offset:
+            offset = 0
+            self.downloaded = 0
+
+        self.save_meta(force=True)
+        with self.session.get(self.url, headers=headers, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                # The server ignored the range (or the file changed): start over
+                offset = 0
+                self.downloaded = 0
+            mode = "ab" if offset else "wb"
+            with open(self.part_path, mode) as target:
+                for data in self.iter_chunks(response):
+                    target.write(data)
+                    self.report_progress(len(data))
+
+        if size and os.path.getsize(self.part_path) != size:
+            raise DownloadError("Connection closed before the download completed")
+
+    def download_segmented(self):
+        size = self.meta["size"]
+        if "segments" not in self.meta:
+            step = -(-size // self.segments)
+            self.meta["segments"] = [
+                [start, min(start + step, size) - 1, 0] for start in range(0, size, step)
+            ]
+            with open(self.part_path, "wb") as f:
+                f.truncate(size)
+        self.save_meta(force=True)
+
+        segments = self.meta["segments"]
+        self.downloaded = sum(done for _, _, done in segments)
+        pending = [segment for segment in segments if segment[0] + segment[2] <= segment[1]]
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.segments, len(pending)) or 1) as pool:
+                for future in [pool.submit(self.download_segment, segment) for segment in pending]:
+                    future.result()
+        finally:
+            with self.lock:
+                self.save_meta(force=True)
+
+    def download_segment(self, segment):
+        start, end, done = segment
+        headers = {"Range": f"bytes={start + done}-{end}"}
+        validator = self.if_range()
+        if validator:
+            headers["If-Range"] = validator
+        with self.session.get(self.url, headers=headers, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                # A full body here means the file changed under us
+                with self.lock:
+                    self.discard_partial()
+                    self.meta.pop("segments", None)
+                raise DownloadError("Server did not honour the range request")
+            with open(self.part_path, "r+b") as target:
+                target.seek(start + done)
+                for data in self.iter_chunks(response):
+                    target.write(data)
+                    with self.lock:
+                        segment[2] += len(data)
+                        self.save_meta()
+                    self.report_progress(len(data))
+        if segment[0] + segment[2] <= segment[1]:
+            raise DownloadError("Connection closed before the segment completed")
+
+    def finalize(self):
+        size = self.meta.get("size", 0)
+        if size and os.path.getsize(self.part_path) != size:
+            self.discard_partial()
+            raise DownloadError("Downloaded file has the wrong size")
+        os.replace(self.part_path, self.dest_path)
+        if os.path.exists(self.meta_path):
+            os.remove(self.meta_path)
+
+
+def extract_binary(archive_path, binary_path):
+    """Extract the immich-go binary from a .zip or .tar.gz archive and atomically move it into place."""
+    binary_folder = os.path.dirname(binary_path)
+    fd, tmp_binary = tempfile.mkstemp(suffix=".tmp", dir=binary_folder)
+    try:
+        with os.fdopen(fd, "wb") as target:
+            found = False
+            if archive_path.endswith(".zip"):
+                import zipfile
+                with zipfile.ZipFile(archive_path) as z:
+                    # Extract the binary, handling different archive structures
+                    for filename in z.namelist():
+                        if filename.endswith("immich-go") or filename.endswith("immich-go.exe"):
+                            with z.open(filename) as member:
+                                shutil.copyfileobj(member, target, MAX_CHUNK_SIZE)
+                            found = True
+                            break
+            elif archive_path.endswith(".tar.gz"):
+                import tarfile
+                # Stream mode reads the archive front to back without seeking
+                with tarfile.open(archive_path, mode="r|gz") as tar:
+                    for member in tar:
+                        if member.name.endswith("immich-go") or member.name.endswith("immich-go.exe"):
+                            shutil.copyfileobj(tar.extractfile(member), target, MAX_CHUNK_SIZE)
+                            found = True
+                            break
+            else:
+                raise ValueError("Unsupported archive type")
+            if not found:
+                raise ValueError("immich-go binary not found in archive")
+
+        # Set executable permissions for non-Windows systems
+        if not sys.platform.startswith("win"):
+            os.chmod(tmp_binary, 0o755)
+        os.replace(tmp_binary, binary_path)
+    finally:
+        if os.path.exists(tmp_binary):
+            os.remove(tmp_binary)
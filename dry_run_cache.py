@@ -0,0 +1,269 @@
+"""Results of immich-go dry runs, kept so the real run can skip the analysis.
+
+While a dry run's output streams in, DryRunRecorder notes what immich-go
+decided for every file it names (upload, already on the server, skipped,
+error) and the album it would go to. When the run ends the record is saved
+under a key made of the command, its options and the server, together with
+a fingerprint of every source: size and mtime for a ZIP, and for a folder a
+digest over the relative path, size and mtime of every file below it.
+
+A later real run with the same key looks the record up. If any source's
+fingerprint differs the record is stale and the run goes ahead unchanged.
+Otherwise the run can be narrowed: a folder upload gets the explicit list
+of files to upload, a Takeout leaves out the ZIPs with nothing to upload
+(but keeps those holding sidecars of the ZIPs that run), and nothing runs
+at all when the dry run found nothing to upload. A real run uses the
+record up, since it changes what is on the server. Per-file decisions are
+only in immich-go's output at log level INFO or finer; without them only
+the nothing-to-upload case can be reused.
+"""
+import hashlib
+import json
+import os
+import time
+
+from progress import KEY_VALUE_PATTERN
+
+
+VERSION = 1
+UPLOAD = "upload"
+ON_SERVER = "on server"
+SKIPPED = "skipped"
+ERROR = "error"
+ON_SERVER_WORDS = ("duplicate", "same asset", "better asset", "already")
+SKIPPED_WORDS = ("discard", "skip", "filter", "ignore", "not selected")
+
+
+def fingerprint(path):
+    """Cheap summary of a source that changes when its files do."""
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return {"bytes": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    digest = hashlib.sha1()
+    files = total = 0
+    for folder, dirs, names in os.walk(path):
+        dirs.sort()
+        for name in sorted(names):
+            try:
+                stat = os.stat(os.path.join(folder, name))
+            except OSError:
+                continue
+            relative = os.path.relpath(os.path.join(folder, name), path)
+            digest.update(f"{relative}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8", "surrogateescape"))
+            files += 1
+            total += stat.st_size
+    return {"files": files, "bytes": total, "digest": digest.hexdigest()}
+
+
+def fingerprints(sources):
+    """{source: fingerprint}; a source that cannot be read gets None."""
+    result = {}
+    for source in sources:
+        try:
+            result[source] = fingerprint(source)
+        except OSError:
+            result[source] = None
+    return result
+
+
+def cache_key(kind, server, options):
+    """Key of a dry run: its command parts (sources included) without --dry-run, and the server it checked."""
+    options = [option for option in options if option != "--dry-run"]
+    return hashlib.sha256(json.dumps([kind, server, options]).encode("utf-8")).hexdigest()[:16]
+
+
+def event_of(line):
+    if line.startswith("{"):
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return {}
+        return event if isinstance(event, dict) else {}
+    if "level=" in line:
+        return dict((key, value.strip('"')) for key, value in KEY_VALUE_PATTERN.findall(line))
+    return {}
+
+
+def decision_of(event):
+    message = str(event.get("msg", "")).lower()
+    if str(event.get("level", "")).upper().startswith("ERR") or "error" in message:
+        return ERROR
+    if any(word in message for word in ON_SERVER_WORDS):
+        return ON_SERVER
+    if any(word in message for word in SKIPPED_WORDS):
+        return SKIPPED
+    if "upload" in message:
+        return UPLOAD
+    return None
+
+
+class DryRunRecorder:
+    def __init__(self):
+        self.files = {}  # file as immich-go names it -> [decision, album]
+
+    def feed_lines(self, lines):
+        for line in lines:
+            self.feed(line)
+
+    def feed(self, line):
+        if "file" not in line:
+            return
+        event = event_of(line)
+        file = event.get("file")
+        if not file:
+            return
+        record = self.files.setdefault(str(file), [None, None])
+        decision = decision_of(event)
+        if decision is not None and record[0] != ERROR:
+            record[0] = decision
+        if event.get("album"):
+            record[1] = str(event["album"])
+
+    def entry(self, kind, server, options, sources, source_fingerprints, report):
+        """The record saved for a finished dry run; report holds the parser's final counters."""
+        files = {file: record for file, record in self.files.items() if record[0] is not None}
+        uploads = sum(1 for record in files.values() if record[0] == UPLOAD)
+        return {
+            "version": VERSION,
+            "created": time.time(),
+            "kind": kind,
+            "server": server,
+            "options": [option for option in options if option != "--dry-run"],
+            "sources": {source: source_fingerprints.get(source) for source in sources},
+            "report": {name: report.get(name, 0) for name in ("scanned", "uploaded", "duplicates", "errors")},
+            # The decisions name exactly the files the report counts, so the record can narrow a run down
+            "complete": report.get("uploaded", 0) > 0 and uploads == report["uploaded"],
+            "files": files,
+        }
+
+
+class DryRunCache:
+    def __init__(self, folder):
+        self.folder = folder
+
+    def path_for(self, key):
+        return os.path.join(self.folder, f"{key}.json")
+
+    def load(self, key):
+        try:
+            with open(self.path_for(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) and entry.get("version") == VERSION else None
+
+    def save(self, key, entry):
+        os.makedirs(self.folder, exist_ok=True)
+        tmp_path = self.path_for(key) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self.path_for(key))
+
+    def remove(self, key):
+        try:
+            os.remove(self.path_for(key))
+        except OSError:
+            pass
+
+
+def changed_sources(entry, source_fingerprints):
+    """Sources that changed (or were added or removed) since the dry run."""
+    recorded = entry.get("sources", {})
+    names = set(recorded) | set(source_fingerprints)
+    return sorted(name for name in names
+                  if recorded.get(name) is None or recorded.get(name) != source_fingerprints.get(name))
+
+
+def describe(entry):
+    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.get("created", 0)))
+    report = entry.get("report", {})
+    text = (f"dry run of {when}: {report.get('uploaded', 0):,} to upload, "
+            f"{report.get('duplicates', 0):,} already on the server, {report.get('errors', 0):,} errors")
+    albums = {album for _, album in entry.get("files", {}).values() if album}
+    if albums:
+        text += f", {len(albums):,} albums"
+    return text
+
+
+def nothing_to_upload(entry):
+    """True when the dry run found files but none to upload (not when its output said nothing)."""
+    report = entry.get("report", {})
+    if any(decision == UPLOAD for decision, _ in entry.get("files", {}).values()):
+        return False
+    found = report.get("scanned", 0) or report.get("duplicates", 0) or entry.get("files")
+    return bool(found) and report.get("uploaded", 0) == 0 and report.get("errors", 0) == 0
+
+
+def upload_files(entry, root):
+    """Absolute paths of the files the dry run would upload from a folder, or None if they are not all known."""
+    if not entry.get("complete"):
+        return None
+    paths = []
+    for file, (decision, _) in entry["files"].items():
+        if decision not in (UPLOAD, ERROR):
+            continue
+        path = file if os.path.isabs(file) else os.path.join(root, file)
+        if not os.path.isfile(path):
+            return None
+        paths.append(os.path.normpath(path))
+    return sorted(paths)
+
+
+def takeout_archives(entry, archives):
+    """ZIPs a real Takeout run still needs, or None if the dry run cannot tell.
+
+    A ZIP is needed when the dry run would upload (or failed on) a file in
+    it, or when it holds the JSON sidecar of a media file in a needed ZIP.
+    """
+    if not entry.get("complete"):
+        return None
+    names = {os.path.basename(path): path for path in archives}
+    needed = set()
+    for file, (decision, _) in entry["files"].items():
+        if decision not in (UPLOAD, ERROR):
+            continue
+        matches = [name for name in names if name in file]
+        if not matches:
+            return None  # immich-go named the file without its archive
+        needed.add(names[max(matches, key=len)])
+    if not needed:
+        return []
+
+    # Deferred import: the ZIP directories are only read when ZIPs can be left out
+    from takeout_inspector import inspect_takeout
+
+    pairing = inspect_takeout(archives).pairing
+    for media_archive, _, sidecar_archive, _, _ in pairing.pairs:
+        if media_archive in needed:
+            needed.add(sidecar_archive)
+    return [path for path in archives if path in needed]
+
+
+class DryRunCheck:
+    def __init__(self, key, source_fingerprints):
+        self.key = key
+        self.fingerprints = source_fingerprints
+        self.entry = None  # The cached dry run, None if there is none
+        self.changed = []  # Sources changed since, which make the entry stale
+        self.narrowed = None  # Files or ZIPs the real run still needs, None if it cannot be narrowed
+
+
+def check(cache, key, kind, sources, dry_run):
+    """Fingerprint the sources and, for a real run, look up and apply a cached dry run of them."""
+    result = DryRunCheck(key, fingerprints(sources))
+    if dry_run:
+        return result
+    result.entry = cache.load(key)
+    if result.entry is None:
+        return result
+    result.changed = changed_sources(result.entry, result.fingerprints)
+    if result.changed or nothing_to_upload(result.entry):
+        return result
+    if kind == "local":
+        result.narrowed = upload_files(result.entry, sources[0])
+    else:
+        try:
+            result.narrowed = takeout_archives(result.entry, sources)
+        except OSError:
+            result.narrowed = None
+    return result
@@ -0,0 +1,336 @@
+"""Persistent, incremental index of local upload folders.
+
+For every (source folder, server) pair the index keeps each directory's
+mtime and each file's size, mtime, inode and upload status in SQLite. A
+re-scan stats every known directory but only lists the ones whose mtime
+changed (a file being added, removed or renamed changes its directory's
+mtime); unchanged directories reuse their stored children. Files rewritten
+in place without touching their directory are only picked up by a full
+scan.
+
+delta_arguments() turns the files that are new or changed since the last
+successful upload into a compact list of paths for immich-go: whole
+directories when everything below them is pending, single files otherwise.
+Files marked as duplicates by the dedup pass are never pending.
+"""
+import datetime
+import os
+import sqlite3
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from prescan import parse_extensions
+
+
+NEW = "new"
+CHANGED = "changed"
+UPLOADED = "uploaded"
+DUPLICATE = "duplicate"  # Same content as another indexed file; left out of deltas
+PENDING = (NEW, CHANGED)
+
+DEFAULT_WORKERS = 16
+MAX_ARGUMENT_CHARS = 24000  # Stay below the Windows command line limit per invocation
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    root TEXT NOT NULL,
+    server TEXT NOT NULL,
+    UNIQUE (root, server)
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    source_id INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    parent TEXT,
+    mtime_ns INTEGER NOT NULL,
+    PRIMARY KEY (source_id, path)
+);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (source_id, parent);
+CREATE TABLE IF NOT EXISTS files (
+    source_id INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    dir TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (source_id, path)
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files (source_id, dir);
+CREATE INDEX IF NOT EXISTS files_status ON files (source_id, status);
+"""
+
+
+class RefreshResult:
+    def __init__(self):
+        self.dirs_checked = 0
+        self.dirs_listed = 0
+        self.new = 0
+        self.changed = 0
+        self.removed = 0
+        self.pending_files = 0
+        self.pending_bytes = 0
+        self.cancelled = False
+
+
+class FolderIndex:
+    def __init__(self, db_path, root, server):
+        self.db_path = db_path
+        self.root = os.path.abspath(root)
+        self.server = server
+        self.db = sqlite3.connect(db_path, timeout=30)
+        self.db.executescript(SCHEMA)
+        self.db.execute("INSERT OR IGNORE INTO sources (root, server) VALUES (?, ?)", (self.root, server))
+        self.source_id = self.db.execute(
+            "SELECT id FROM sources WHERE root = ? AND server = ?", (self.root, server)
+        ).fetchone()[0]
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def examine_dir(path, stored_mtime, full):
+        """Stat a directory and list it if it changed; runs on a worker thread."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None, None
+        if mtime == stored_mtime and not full:
+            return mtime, None
+        files, subdirs = {}, []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            files[entry.path] = (st.st_size, st.st_mtime_ns, st.st_ino)
+                    except OSError:
+                        continue
+        except OSError:
+            return None, None
+        return mtime, (files, subdirs)
+
+    def refresh(self, full=False, workers=DEFAULT_WORKERS, cancel_event=None):
+        """Bring the index up to date with the folder and return a RefreshResult."""
+        cancel_event = cancel_event or threading.Event()
+        result = RefreshResult()
+        stored_dirs = {}
+        children = {}
+        for path, parent, mtime in self.db.execute(
+                "SELECT path, parent, mtime_ns FROM dirs WHERE source_id = ?", (self.source_id,)):
+            stored_dirs[path] = mtime
+            children.setdefault(parent, []).append(path)
+
+        seen_dirs = set()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {pool.submit(self.examine_dir, self.root, stored_dirs.get(self.root), full): (self.root, None)}
+            while pending:
+                if cancel_event.is_set():
+                    for future in pending:
+                        future.cancel()
+                    result.cancelled = True
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, parent = pending.pop(future)
+                    mtime, listing = future.result()
+                    if mtime is None:
+                        continue  # Vanished or unreadable; cleaned up below
+                    seen_dirs.add(path)
+                    result.dirs_checked += 1
+                    if listing is None:
+                        subdirs = children.get(path, [])
+                    else:
+                        result.dirs_listed += 1
+                        files, subdirs = listing
+                        self.update_dir_files(path, files, result)
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO dirs (source_id, path, parent, mtime_ns) VALUES (?, ?, ?, ?)",
+                        (self.source_id, path, parent, mtime))
+                    for subdir in subdirs:
+                        future = pool.submit(self.examine_dir, subdir, stored_dirs.get(subdir), full)
+                        pending[future] = (subdir, path)
+
+        if not result.cancelled:
+            # Directories that disappeared take their files with them
+            for path in set(stored_dirs) - seen_dirs:
+                result.removed += self.db.execute(
+                    "DELETE FROM files WHERE source_id = ? AND dir = ?", (self.source_id, path)).rowcount
+                self.db.execute("DELETE FROM dirs WHERE source_id = ? AND path = ?", (self.source_id, path))
+        self.db.commit()
+
+        result.pending_files, result.pending_bytes = self.pending_totals()
+        return result
+
+    def update_dir_files(self, path, files, result):
+        stored = {
+            file_path: (size, mtime, inode, status)
+            for file_path, size, mtime, inode, status in self.db.execute(
+                "SELECT path, size, mtime_ns, inode, status FROM files WHERE source_id = ? AND dir = ?",
+                (self.source_id, path))
+        }
+        rows = []
+        for file_path, (size, mtime, inode) in files.items():
+            previous = stored.get(file_path)
+            if previous is None:
+                status = NEW
+                result.new += 1
+            elif previous[:2] != (size, mtime):
+                status = CHANGED
+                result.changed += 1
+            else:
+                # Same content as far as we can tell; keep the status (and a moved inode)
+                status = previous[3]
+            rows.append((self.source_id, file_path, path, size, mtime, inode, status))
+        self.db.executemany(
+            "INSERT OR REPLACE INTO files (source_id, path, dir, size, mtime_ns, inode, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        removed = [(self.source_id, file_path) for file_path in stored if file_path not in files]
+        self.db.executemany("DELETE FROM files WHERE source_id = ? AND path = ?", removed)
+        result.removed += len(removed)
+
+    def pending_totals(self):
+        count, size = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files WHERE source_id = ? AND status IN (?, ?)",
+            (self.source_id, *PENDING)).fetchone()
+        return count, size
+
+    def pending_files(self):
+        return [path for (path,) in self.db.execute(
+            "SELECT path FROM files WHERE source_id = ? AND status IN (?, ?) ORDER BY path",
+            (self.source_id, *PENDING))]
+
+    def delta_paths(self):
+        """Minimal list of paths covering exactly the pending files."""
+        direct = {}  # dir -> [files, pending files]
+        pending_by_dir = {}
+        for file_path, dir_path, status in self.db.execute(
+                "SELECT path, dir, status FROM files WHERE source_id = ? ORDER BY path", (self.source_id,)):
+            counts = direct.setdefault(dir_path, [0, 0])
+            counts[0] += 1
+            if status in PENDING:
+                counts[1] += 1
+                pending_by_dir.setdefault(dir_path, []).append(file_path)
+        parents = dict(self.db.execute("SELECT path, parent FROM dirs WHERE source_id = ?", (self.source_id,)))
+        children = {}
+        for path, parent in parents.items():
+            children.setdefault(parent, []).append(path)
+
+        # Bottom-up: does a subtree hold pending files, and is everything in it pending?
+        has_pending, all_pending = {}, {}
+        for path in sorted(parents, key=len, reverse=True):
+            files, pending = direct.get(path, (0, 0))
+            below = children.get(path, [])
+            has_pending[path] = pending > 0 or any(has_pending[child] for child in below)
+            all_pending[path] = files == pending and all(all_pending[child] for child in below)
+
+        paths = []
+        stack = [self.root] if self.root in parents else []
+        while stack:
+            path = stack.pop()
+            if not has_pending[path]:
+                continue
+            if all_pending[path]:
+                paths.append(path)
+                continue
+            paths.extend(pending_by_dir.get(path, []))
+            stack.extend(sorted(children.get(path, []), reverse=True))
+        return paths
+
+    def delta_arguments(self, max_chars=MAX_ARGUMENT_CHARS):
+        """Split delta_paths() into batches whose combined length fits one command line."""
+        return argument_batches(self.delta_paths(), max_chars)
+
+    def mark_uploaded(self, paths, accept=None):
+        """Mark the given files, and every file below the given directories, as uploaded.
+
+        Files that accept(path) rejects, i.e. that the run's filters left
+        out, stay pending.
+        """
+        uploaded = []
+        for path in paths:
+            path = os.path.abspath(path)
+            prefix = path.rstrip(os.sep) + os.sep
+            # substr rather than LIKE, which ignores case
+            for (file_path,) in self.db.execute(
+                    "SELECT path FROM files WHERE source_id = ? AND status IN (?, ?) "
+                    "AND (path = ? OR substr(path, 1, ?) = ?)",
+                    (self.source_id, *PENDING, path, len(prefix), prefix)).fetchall():
+                if accept is None or accept(file_path):
+                    uploaded.append((UPLOADED, self.source_id, file_path))
+        self.db.executemany("UPDATE files SET status = ? WHERE source_id = ? AND path = ?", uploaded)
+        self.db.commit()
+
+    def indexed_files(self):
+        """(path, size, mtime_ns, status) of every indexed file."""
+        return self.db.execute(
+            "SELECT path, size, mtime_ns, status FROM files WHERE source_id = ?", (self.source_id,)).fetchall()
+
+    def set_duplicates(self, paths):
+        """Mark exactly these files as duplicates; earlier duplicates not among them are pending again."""
+        self.db.execute("UPDATE files SET status = ? WHERE source_id = ? AND status = ?",
+                        (NEW, self.source_id, DUPLICATE))
+        self.db.executemany(
+            "UPDATE files SET status = ? WHERE source_id = ? AND path = ? AND status IN (?, ?)",
+            [(DUPLICATE, self.source_id, path, *PENDING) for path in paths])
+        self.db.commit()
+
+
+def argument_batches(paths, max_chars=MAX_ARGUMENT_CHARS):
+    """Split paths into batches whose combined length fits one command line."""
+    batches, batch, length = [], [], 0
+    for path in paths:
+        if batch and length + len(path) + 3 > max_chars:
+            batches.append(batch)
+            batch, length = [], 0
+        batch.append(path)
+        length += len(path) + 3
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def upload_filter(command_parts, dates_db=None):
+    """Predicate for the files a run's --file-filter and --date-filter let through, None without filters.
+
+    Capture dates are taken from the date cache in dates_db while it is
+    current, otherwise read from the file; a file without a known date
+    does not pass a date filter.
+    """
+    extensions = dates = None
+    for part in command_parts:
+        if part.startswith("--file-filter="):
+            extensions = parse_extensions(part.split("=", 1)[1].strip('"'))
+        elif part.startswith("--date-filter="):
+            try:
+                dates = [datetime.date.fromisoformat(value) for value in part.split("=", 1)[1].split(",", 1)]
+            except ValueError:
+                return lambda path: False  # Not a range immich-go could have applied either
+    if not extensions and dates is None:
+        return None
+
+    # Deferred import: capture dates are only needed with a date filter
+    from media_dates import cached_dates, capture_date
+
+    cache = cached_dates(dates_db) if dates is not None and dates_db else {}
+
+    def accept(path):
+        if extensions and os.path.splitext(path)[1].lower() not in extensions:
+            return False
+        if dates is None:
+            return True
+        cached = cache.get(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            taken = datetime.date.fromordinal(cached[2]) if cached[2] else None
+        else:
+            taken = capture_date(path)
+        return taken is not None and dates[0] <= taken <= dates[-1]
+    return accept
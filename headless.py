@@ -0,0 +1,108 @@
+"""Run a saved configuration without the GUI, e.g. from cron.
+
+    python app.py --headless [--profile NAME] [--job local|takeout] [--print-command]
+
+The profile is read from the same QSettings store the window saves its
+profiles to (only QtCore is imported, so no display is needed). immich-go's
+output is streamed to stdout, progress summaries go to stderr and the exit
+code is immich-go's.
+"""
+import argparse
+import shlex
+import subprocess
+import sys
+import time
+
+from config_model import build_command, default_binary_path
+from profiles import DEFAULT_PROFILE, ProfileStore
+from progress import ProgressParser, format_bytes, format_duration
+
+
+PROGRESS_INTERVAL = 10.0  # Seconds between progress summaries on stderr
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="app.py --headless", description="Run an immich-go upload without the GUI.")
+    parser.add_argument("--headless", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--profile", default=DEFAULT_PROFILE, help="saved configuration to use (default: %(default)s)")
+    parser.add_argument("--job", choices=("local", "takeout"),
+                        help="which tab's upload to run (default: local if a local folder is set)")
+    parser.add_argument("--binary", default=None, help="immich-go binary (default: ./immich-go/immich-go)")
+    parser.add_argument("--print-command", action="store_true", help="print the command and exit")
+    return parser.parse_args(argv)
+
+
+def load_config(profile):
+    from PySide6.QtCore import QSettings
+
+    return ProfileStore(QSettings("YourOrganization", "ImmichGoGUI")).load(profile)
+
+
+def masked(command):
+    """Command line for display, without the API key."""
+    return " ".join(shlex.quote("--api-key=***" if part.startswith("--api-key=") else part) for part in command)
+
+
+def progress_line(parser):
+    snapshot = parser.snapshot()
+    return (f"uploaded {snapshot['uploaded']:,}, duplicates {snapshot['duplicates']:,}, "
+            f"errors {snapshot['errors']:,}, {format_bytes(snapshot['bytes'])}, "
+            f"{snapshot['files_per_s']:.1f} files/s, elapsed {format_duration(snapshot['elapsed'])}, "
+            f"ETA {format_duration(snapshot['eta'])}")
+
+
+def run(command):
+    """Stream a command's output while tracking progress; returns its exit code."""
+    parser = ProgressParser()
+    # Text mode turns immich-go's carriage-return progress updates into separate lines
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                               text=True, errors="replace", bufsize=1)
+    last_report = time.monotonic()
+    try:
+        for line in process.stdout:
+            line = line.rstrip("\n")
+            print(line, flush=True)
+            parser.feed(line)
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_INTERVAL:
+                last_report = now
+                print(f"[progress] {progress_line(parser)}", file=sys.stderr, flush=True)
+        exit_code = process.wait()
+    except KeyboardInterrupt:
+        process.terminate()
+        try:
+            process.wait(5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        exit_code = 130
+    print(f"[done] exit code {exit_code}; {progress_line(parser)}", file=sys.stderr, flush=True)
+    return exit_code
+
+
+def main(argv):
+    args = parse_args(argv)
+    config = load_config(args.profile)
+    if config is None:
+        print(f"Profile not found: {args.profile}", file=sys.stderr)
+        return 2
+    errors = config.validate()
+    if errors:
+        print("Configuration incomplete: " + ", ".join(errors), file=sys.stderr)
+        return 2
+
+    job = args.job or ("local" if config.local_path or not config.takeout_source else "takeout")
+    parts = config.local_upload_options() if job == "local" else config.google_takeout_options()
+    if not (config.local_path if job == "local" else config.takeout_sources()):
+        print(f"No source set for the {job} upload", file=sys.stderr)
+        return 2
+    command = build_command(args.binary or default_binary_path(), parts, config.config_options())
+
+    if args.print_command:
+        print(masked(command))
+        return 0
+    print(f"[start] {masked(command)}", file=sys.stderr, flush=True)
+    try:
+        return run(command)
+    except OSError as e:
+        print(f"Error running immich-go: {e}", file=sys.stderr)
+        return 127
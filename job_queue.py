@@ -0,0 +1,161 @@
+"""Persistent queue of immich-go upload jobs.
+
+A job is a snapshot of the command parts built by the Google Takeout or
+Local Upload tab (server settings are added when the job starts, so API
+keys never end up in the queue file). The queue is saved as JSON after
+every change; jobs that were running when the app exited are re-queued
+on the next load.
+"""
+import json
+import os
+import time
+import uuid
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class Job:
+    def __init__(self, name, kind, command_parts, job_id=None, status=QUEUED,
+                 exit_code=None, created=None, started=None, finished=None, summary="", meta=None):
+        self.id = job_id or uuid.uuid4().hex[:8]
+        self.name = name
+        self.kind = kind
+        self.command_parts = list(command_parts)
+        self.status = status
+        self.exit_code = exit_code
+        self.created = created or time.time()
+        self.started = started
+        self.finished = finished
+        self.summary = summary
+        self.meta = dict(meta or {})  # Extra data for the app, e.g. the folder index paths of a delta upload
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "kind": self.kind,
+            "command_parts": self.command_parts,
+            "status": self.status,
+            "exit_code": self.exit_code,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "summary": self.summary,
+            "meta": self.meta,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["name"], data.get("kind", ""), data.get("command_parts", []),
+            job_id=data.get("id"), status=data.get("status", QUEUED),
+            exit_code=data.get("exit_code"), created=data.get("created"),
+            started=data.get("started"), finished=data.get("finished"),
+            summary=data.get("summary", ""), meta=data.get("meta"),
+        )
+
+
+class JobQueue:
+    def __init__(self, path):
+        self.path = path
+        self.jobs = []
+        self.concurrency = 1
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.concurrency = max(1, int(data.get("concurrency", 1)))
+        self.jobs = [Job.from_dict(job) for job in data.get("jobs", [])]
+        for job in self.jobs:
+            if job.status == RUNNING:
+                # The app exited while this job ran; run it again
+                job.status = QUEUED
+                job.summary = "interrupted, re-queued"
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "concurrency": self.concurrency,
+                "jobs": [job.to_dict() for job in self.jobs],
+            }, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, job_id):
+        for job in self.jobs:
+            if job.id == job_id:
+                return job
+        return None
+
+    def add(self, name, kind, command_parts, meta=None):
+        job = Job(name, kind, command_parts, meta=meta)
+        self.jobs.append(job)
+        self.save()
+        return job
+
+    def remove(self, job_id):
+        job = self.get(job_id)
+        if job is None or job.status == RUNNING:
+            return False
+        self.jobs.remove(job)
+        self.save()
+        return True
+
+    def move(self, job_id, offset):
+        """Move a job offset places up (negative) or down (positive) in the queue."""
+        job = self.get(job_id)
+        if job is None:
+            return False
+        index = self.jobs.index(job)
+        new_index = max(0, min(len(self.jobs) - 1, index + offset))
+        if new_index == index:
+            return False
+        self.jobs.insert(new_index, self.jobs.pop(index))
+        self.save()
+        return True
+
+    def requeue(self, job_id):
+        job = self.get(job_id)
+        if job is None or job.status not in FINISHED_STATES:
+            return False
+        job.status = QUEUED
+        job.exit_code = None
+        job.started = job.finished = None
+        job.summary = ""
+        self.save()
+        return True
+
+    def running(self):
+        return [job for job in self.jobs if job.status == RUNNING]
+
+    def next_jobs(self):
+        """Queued jobs that may start now without exceeding the concurrency limit."""
+        free_slots = self.concurrency - len(self.running())
+        if free_slots <= 0:
+            return []
+        return [job for job in self.jobs if job.status == QUEUED][:free_slots]
+
+    def mark_started(self, job):
+        job.status = RUNNING
+        job.started = time.time()
+        job.finished = None
+        job.exit_code = None
+        self.save()
+
+    def mark_finished(self, job, status, exit_code=None, summary=""):
+        job.status = status
+        job.exit_code = exit_code
+        job.finished = time.time()
+        job.summary = summary
+        self.save()
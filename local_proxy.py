@@ -0,0 +1,430 @@
+"""Local HTTP reverse proxy between immich-go and the Immich server.
+
+immich-go is given http://127.0.0.1:<port> as --server and every request is
+forwarded to the real server (HTTP or HTTPS) with the Host header
+rewritten, over a pool of kept-alive upstream connections so that
+round-trips don't pay for new TCP/TLS handshakes.
+
+Request bodies, i.e. uploads, are streamed upstream through a token bucket
+that can be shared by several proxies, so one limit covers all running
+immich-go processes. The rate can be changed while requests are in
+flight, which is how the time-of-day schedule is applied.
+
+With a cache TTL set, successful GET responses (album lists, server info,
+asset lookups) are kept for that many seconds per API key. A write to a
+resource (anything but GET/HEAD, apart from the search-style POSTs in
+QUERY_POSTS) drops the cached responses of that resource and of the views
+derived from it.
+
+    python local_proxy.py --upstream https://immich.example.com [--port 0] [--upload-mbps 20] [--cache-ttl 10]
+"""
+import argparse
+import hashlib
+import http.client
+import ssl
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+CHUNK_SIZE = 64 * 1024
+UPSTREAM_TIMEOUT = 300
+POOL_SIZE = 16  # Idle upstream connections kept
+CACHE_ENTRIES = 10000
+# Headers that describe one connection rather than the request
+HOP_BY_HOP = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "te", "trailer",
+              "trailers", "transfer-encoding", "upgrade", "host", "content-length"}
+# POSTs that only read, so they don't invalidate the cache
+QUERY_POSTS = ("/api/assets/bulk-upload-check", "/api/search/")
+# Reads derived from other resources: a write to the key also invalidates these
+DERIVED = {"assets": ("search", "timeline", "stacks"), "albums": ("search",), "tags": ("search",),
+           "stacks": ("assets", "timeline")}
+
+
+def mbps_to_bytes(mbps):
+    return int(mbps * 1_000_000 / 8)
+
+
+def api_resource(path):
+    """"albums" for /api/albums/<id>/assets?x=y and the like."""
+    parts = urllib.parse.urlsplit(path).path.strip("/").split("/")
+    if parts and parts[0] == "api":
+        parts = parts[1:]
+    return parts[0] if parts else ""
+
+
+class TokenBucket:
+    """Byte rate limit shared between threads; a rate of 0 means unlimited.
+
+    consume() takes the bytes at once and sleeps off any debt, so callers
+    together never exceed the rate by more than the burst size.
+    """
+
+    def __init__(self, rate=0):
+        self.lock = threading.Lock()
+        self.rate = 0
+        self.burst = CHUNK_SIZE
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        with self.lock:
+            self.refill()
+            self.rate = rate
+            self.burst = max(CHUNK_SIZE, rate / 4)
+            self.tokens = min(self.tokens, self.burst)
+
+    def refill(self):
+        now = time.monotonic()
+        if self.rate:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def consume(self, count):
+        with self.lock:
+            if not self.rate:
+                return
+            self.refill()
+            self.tokens -= count
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0
+        if delay:
+            time.sleep(delay)
+
+
+class ConnectionPool:
+    """Idle upstream connections, most recently used first."""
+
+    def __init__(self, factory, size=POOL_SIZE):
+        self.factory = factory
+        self.size = size
+        self.idle = []
+        self.lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self):
+        """(connection, reused)"""
+        with self.lock:
+            if self.idle:
+                self.reused += 1
+                return self.idle.pop(), True
+            self.created += 1
+        return self.factory(), False
+
+    def release(self, connection):
+        with self.lock:
+            if len(self.idle) < self.size:
+                self.idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        with self.lock:
+            idle, self.idle = self.idle, []
+        for connection in idle:
+            connection.close()
+
+
+class CachedResponse:
+    def __init__(self, resource, status, reason, headers, data, expires):
+        self.resource = resource
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.data = data
+        self.expires = expires
+
+
+class ResponseCache:
+    def __init__(self, ttl=0):
+        self.ttl = ttl  # Seconds; 0 disables caching
+        self.entries = {}  # Oldest first
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self.saved_bytes = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires <= time.monotonic():
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.saved_bytes += len(entry.data)
+            return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = entry
+            while len(self.entries) > CACHE_ENTRIES:
+                del self.entries[next(iter(self.entries))]
+
+    def invalidate(self, resource, everything=False):
+        resources = {resource, *DERIVED.get(resource, ())}
+        with self.lock:
+            stale = [key for key, entry in self.entries.items() if everything or entry.resource in resources]
+            for key in stale:
+                del self.entries[key]
+            self.invalidated += len(stale)
+
+
+class ProxyStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.bytes_up = 0
+        self.bytes_down = 0
+
+    def add(self, up=0, down=0, error=False):
+        with self.lock:
+            self.requests += 1
+            self.errors += error
+            self.bytes_up += up
+            self.bytes_down += down
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def proxy(self):
+        return self.server.proxy
+
+    def body_chunks(self, chunked, length, counter):
+        """The client's request body in pieces, de-chunked and throttled."""
+        bucket = self.proxy.upload_bucket
+
+        def read(size):
+            while size > 0:
+                data = self.rfile.read(min(CHUNK_SIZE, size))
+                if not data:
+                    raise ConnectionError("Client closed the connection mid-request")
+                bucket.consume(len(data))
+                counter[0] += len(data)
+                size -= len(data)
+                yield data
+
+        if not chunked:
+            yield from read(length)
+            return
+        while True:
+            size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                    pass  # Trailers
+                return
+            yield from read(size)
+            self.rfile.readline()
+
+    def send_upstream(self, method, path, body, headers, chunked, counter):
+        """(status, reason, headers, data) from the server, retrying once on a stale pooled connection."""
+        pool = self.proxy.pool
+        while True:
+            connection, reused = pool.acquire()
+            try:
+                connection.request(method, path, body=body, headers=headers, encode_chunked=chunked)
+                response = connection.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                connection.close()
+                # The server closed an idle connection; retry unless a body was already sent
+                if reused and not counter[0]:
+                    continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                pool.release(connection)
+            return response.status, response.reason, response.getheaders(), data
+
+    def reply(self, method, status, reason, headers, data):
+        self.send_response(status, reason)
+        for key, value in headers:
+            if key.lower() not in HOP_BY_HOP and key.lower() not in ("date", "server"):
+                self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if method != "HEAD":
+            self.wfile.write(data)
+
+    def forward(self, method):
+        proxy = self.proxy
+        cache = proxy.cache
+        chunked = "chunked" in self.headers.get("Transfer-Encoding", "").lower()
+        length = int(self.headers.get("Content-Length") or 0)
+        resource = api_resource(self.path)
+        is_write = method not in ("GET", "HEAD", "OPTIONS") and not self.path.startswith(QUERY_POSTS)
+
+        # Cached responses are per API key: other users may see other albums
+        cache_key = None
+        if method in ("GET", "HEAD") and cache.ttl and not (chunked or length):
+            credentials = self.headers.get("x-api-key", "") + self.headers.get("Authorization", "")
+            cache_key = (self.path, hashlib.sha256(credentials.encode()).hexdigest(),
+                         self.headers.get("Accept-Encoding", ""))
+            entry = cache.get(cache_key)
+            if entry is not None:
+                proxy.stats.add()
+                self.reply(method, entry.status, entry.reason, entry.headers, entry.data)
+                return
+
+        headers = {key: value for key, value in self.headers.items() if key.lower() not in HOP_BY_HOP}
+        headers["Host"] = proxy.host_header
+        counter = [0]
+        body = None
+        if chunked or length:
+            body = self.body_chunks(chunked, length, counter)
+            if not chunked:
+                headers["Content-Length"] = str(length)
+        if is_write:
+            cache.invalidate(resource, everything=method == "DELETE")
+
+        try:
+            status, reason, response_headers, data = self.send_upstream(
+                method, proxy.base_path + self.path, body, headers, chunked, counter)
+        except (OSError, http.client.HTTPException) as e:
+            proxy.stats.add(counter[0], error=True)
+            self.send_error(502, f"Upstream error: {e}")
+            self.close_connection = True  # The request body may not have been read
+            return
+
+        proxy.stats.add(counter[0], len(data))
+        if is_write:
+            # Again, in case a read cached the old state while the write was in flight
+            cache.invalidate(resource, everything=method == "DELETE")
+        elif cache_key is not None and method == "GET" and status == 200 and "no-store" not in dict(
+                (key.lower(), value) for key, value in response_headers).get("cache-control", ""):
+            cache.put(cache_key, CachedResponse(resource, status, reason, response_headers, data,
+                                                time.monotonic() + cache.ttl))
+        self.reply(method, status, reason, response_headers, data)
+
+    def do_GET(self):
+        self.forward("GET")
+
+    def do_HEAD(self):
+        self.forward("HEAD")
+
+    def do_POST(self):
+        self.forward("POST")
+
+    def do_PUT(self):
+        self.forward("PUT")
+
+    def do_PATCH(self):
+        self.forward("PATCH")
+
+    def do_DELETE(self):
+        self.forward("DELETE")
+
+
+class LocalProxy:
+    def __init__(self, upstream_url, verify_ssl=True, upload_bucket=None, port=0, cache_ttl=0):
+        parsed = urllib.parse.urlsplit(upstream_url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise ValueError(f"Not an http(s) URL: {upstream_url}")
+        self.upstream_url = upstream_url
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.host_header = parsed.netloc
+        self.base_path = parsed.path.rstrip("/")
+        self.verify_ssl = verify_ssl
+        self.upload_bucket = upload_bucket or TokenBucket()
+        self.cache = ResponseCache(cache_ttl)
+        self.pool = ConnectionPool(self.connect)
+        self.stats = ProxyStats()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), ProxyHandler)
+        self.server.daemon_threads = True
+        self.server.proxy = self
+        self.thread = None
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d" % self.server.server_address[1]
+
+    def connect(self):
+        if self.scheme == "https":
+            context = ssl.create_default_context()
+            if not self.verify_ssl:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            return http.client.HTTPSConnection(self.host, self.port, timeout=UPSTREAM_TIMEOUT, context=context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=UPSTREAM_TIMEOUT)
+
+    def snapshot(self):
+        with self.stats.lock, self.cache.lock:
+            lookups = self.cache.hits + self.cache.misses
+            return {
+                "requests": self.stats.requests,
+                "errors": self.stats.errors,
+                "bytes_up": self.stats.bytes_up,
+                "bytes_down": self.stats.bytes_down,
+                "cache_hits": self.cache.hits,
+                "cache_misses": self.cache.misses,
+                "cache_hit_rate": self.cache.hits / lookups if lookups else 0.0,
+                "cache_invalidated": self.cache.invalidated,
+                "cache_saved_bytes": self.cache.saved_bytes,
+                "connections_created": self.pool.created,
+                "connections_reused": self.pool.reused,
+            }
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="local-proxy", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.pool.close()
+
+
+def describe(before, after):
+    """One line on what a proxy did between two snapshots."""
+    delta = {key: after[key] - before.get(key, 0) for key in after if key != "cache_hit_rate"}
+    lookups = delta["cache_hits"] + delta["cache_misses"]
+    text = f"{delta['requests']:,} requests, upstream connections opened: {delta['connections_created']:,}"
+    if lookups:
+        text += (f", cache hits {delta['cache_hits']:,} of {lookups:,} GETs "
+                 f"({delta['cache_hits'] / lookups:.0%})")
+    return text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local reverse proxy for immich-go with an upload rate limit "
+                                                 "and a metadata cache.")
+    parser.add_argument("--upstream", required=True, help="Immich server URL")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--upload-mbps", type=float, default=0, help="upload limit in Mbit/s, 0 for unlimited")
+    parser.add_argument("--cache-ttl", type=float, default=0, help="seconds to cache GET responses, 0 for none")
+    parser.add_argument("--skip-verify-ssl", action="store_true")
+    args = parser.parse_args(argv)
+    proxy = LocalProxy(args.upstream, not args.skip_verify_ssl, TokenBucket(mbps_to_bytes(args.upload_mbps)),
+                       args.port, args.cache_ttl)
+    print(f"Proxying {proxy.url} -> {args.upstream}", flush=True)
+    try:
+        proxy.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.server.server_close()
+        print(describe({}, proxy.snapshot()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Log console for long immich-go runs.
+
+Lines are kept in a fixed-capacity ring buffer exposed through a list model,
+so memory stays flat no matter how long a run takes. The QListView only asks
+for the rows it paints, appends are batched once per frame, level filtering
+runs in a QSortFilterProxyModel on a level role, and the complete log can be
+spilled to a file on disk.
+"""
+import re
+
+from PySide6.QtCore import (
+    QAbstractListModel, QModelIndex, QRegularExpression, QSortFilterProxyModel, Qt, QTimer
+)
+from PySide6.QtGui import QColor, QFontDatabase
+from PySide6.QtWidgets import (
+    QCheckBox, QComboBox, QFileDialog, QHBoxLayout, QLabel, QListView, QPushButton,
+    QVBoxLayout, QWidget
+)
+
+
+DEFAULT_CAPACITY = 50000  # Lines kept in memory
+FLUSH_INTERVAL_MS = 16  # Batch appends once per frame
+
+# Same choices as the log level of the configuration tab, from most to least verbose
+LOG_LEVELS = ["INFO", "WARNING", "ERROR"]
+LEVEL_COLORS = {"WARNING": QColor("#E65100"), "ERROR": QColor("#C62828")}
+
+LEVEL_PATTERN = re.compile(r'(?:\blevel=|"level"\s*:\s*")(\w+)', re.IGNORECASE)
+LEVEL_ALIASES = {
+    "ERROR": "ERROR", "ERR": "ERROR", "FATAL": "ERROR", "PANIC": "ERROR",
+    "WARN": "WARNING", "WARNING": "WARNING",
+}
+
+
+def detect_level(line, stream="stdout"):
+    """Map an immich-go log line to one of LOG_LEVELS."""
+    match = LEVEL_PATTERN.search(line)
+    if match:
+        return LEVEL_ALIASES.get(match.group(1).upper(), "INFO")
+    # Unlabelled stderr output is how Go programs report failures
+    return "ERROR" if stream == "stderr" else "INFO"
+
+
+class RingBuffer:
+    """Fixed-capacity list with O(1) append and random access."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.items = [None] * capacity
+        self.start = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self.items[(self.start + index) % self.capacity]
+
+    def extend(self, values):
+        """Append values, dropping the oldest entries when full. Returns the number dropped."""
+        values = values[-self.capacity:]
+        dropped = max(0, self.count + len(values) - self.capacity)
+        self.start = (self.start + dropped) % self.capacity
+        self.count -= dropped
+        for value in values:
+            self.items[(self.start + self.count) % self.capacity] = value
+            self.count += 1
+        return dropped
+
+    def clear(self):
+        self.items = [None] * self.capacity
+        self.start = 0
+        self.count = 0
+
+
+class LogRingModel(QAbstractListModel):
+    LevelRole = Qt.UserRole + 1
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, parent=None):
+        super().__init__(parent)
+        self.buffer = RingBuffer(capacity)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.buffer)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        level, text = self.buffer[index.row()]
+        if role == Qt.DisplayRole:
+            return text
+        if role == self.LevelRole:
+            return level
+        if role == Qt.ForegroundRole:
+            return LEVEL_COLORS.get(level)
+        return None
+
+    def append_entries(self, entries):
+        entries = entries[-self.buffer.capacity:]
+        dropped = max(0, len(self.buffer) + len(entries) - self.buffer.capacity)
+        if dropped:
+            self.beginRemoveRows(QModelIndex(), 0, dropped - 1)
+            # Only advance the start; the new entries are inserted below
+            self.buffer.start = (self.buffer.start + dropped) % self.buffer.capacity
+            self.buffer.count -= dropped
+            self.endRemoveRows()
+        first = len(self.buffer)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self.buffer.extend(entries)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.buffer.clear()
+        self.endResetModel()
+
+
+class LogConsole(QWidget):
+    def __init__(self, capacity=DEFAULT_CAPACITY, parent=None):
+        super().__init__(parent)
+        self.pending = []
+        self.spill_file = None
+
+        self.model = LogRingModel(capacity, self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterRole(LogRingModel.LevelRole)
+
+        self.view = QListView()
+        self.view.setModel(self.proxy)
+        # Uniform rows let the view skip measuring every line: only visible rows are touched
+        self.view.setUniformItemSizes(True)
+        self.view.setEditTriggers(QListView.NoEditTriggers)
+        self.view.setSelectionMode(QListView.ExtendedSelection)
+        self.view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+
+        self.level_combo = QComboBox()
+        self.level_combo.addItems(LOG_LEVELS)
+        self.level_combo.currentTextChanged.connect(self.set_level)
+
+        self.spill_check = QCheckBox("Save full log to file")
+        self.spill_check.toggled.connect(self.toggle_spill)
+
+        clear_button = QPushButton("Clear")
+        clear_button.clicked.connect(self.clear)
+
+        # Callers may add their own controls (e.g. a Stop button) to the header
+        self.header = QHBoxLayout()
+        self.header.addWidget(QLabel("Output:"))
+        self.header.addStretch()
+        self.header.addWidget(QLabel("Level:"))
+        self.header.addWidget(self.level_combo)
+        self.header.addWidget(self.spill_check)
+        self.header.addWidget(clear_button)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(self.header)
+        layout.addWidget(self.view)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def append_lines(self, stream, lines):
+        self.pending.extend((detect_level(line, stream), line) for line in lines)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush(self):
+        if not self.pending:
+            return
+        entries, self.pending = self.pending, []
+        if self.spill_file is not None:
+            self.spill_file.write("".join(f"{text}\n" for _, text in entries))
+
+        scrollbar = self.view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.model.append_entries(entries)
+        if at_bottom:
+            self.view.scrollToBottom()
+
+    def set_level(self, level):
+        """Show only lines at level or more severe."""
+        shown = LOG_LEVELS[LOG_LEVELS.index(level):]
+        if level == LOG_LEVELS[0]:
+            self.proxy.setFilterRegularExpression(QRegularExpression())
+        else:
+            self.proxy.setFilterRegularExpression(QRegularExpression(f"^({'|'.join(shown)})$"))
+
+    def toggle_spill(self, checked):
+        if checked:
+            path, _ = QFileDialog.getSaveFileName(self, "Save Log To", "immich-go.log", "Log Files (*.log *.txt)")
+            if not path:
+                self.spill_check.setChecked(False)
+                return
+            self.set_spill_path(path)
+        else:
+            self.set_spill_path(None)
+
+    def set_spill_path(self, path):
+        """Write every line appended from now on to path (None stops spilling)."""
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+        if path:
+            self.spill_file = open(path, "a", encoding="utf-8")
+
+    def clear(self):
+        self.pending = []
+        self.model.clear()
+
+    def shutdown(self):
+        """Flush pending lines and close the spill file."""
+        self.flush()
+        self.set_spill_path(None)
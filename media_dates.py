@@ -0,0 +1,330 @@
+"""Capture dates of local media, for previewing the date filter.
+
+Dates come from, in order: EXIF DateTimeOriginal (JPEG, HEIC, TIFF and raw
+formats), the QuickTime/MP4 movie header, a Google-style JSON sidecar and
+finally a date in the file name. Only header bytes are read: the first
+HEADER_BYTES of images, and box headers of movies (the movie header box is
+found by seeking, wherever it sits in the file). Results are cached in
+SQLite by path, size and mtime. Header reads are I/O bound, so a thread
+pool is used.
+"""
+import datetime
+import json
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_WORKERS = 16
+HEADER_BYTES = 128 * 1024
+BATCH_SIZE = 256
+PROGRESS_INTERVAL = 0.25
+
+IMAGE_EXTENSIONS = {
+    ".jpg", ".jpeg", ".heic", ".heif", ".avif", ".tif", ".tiff", ".dng", ".cr2", ".nef", ".arw",
+    ".orf", ".rw2", ".raf", ".png", ".webp",
+}
+MOVIE_EXTENSIONS = {".mp4", ".mov", ".m4v", ".3gp", ".3g2"}
+MEDIA_EXTENSIONS = IMAGE_EXTENSIONS | MOVIE_EXTENSIONS | {".gif", ".avi", ".mkv", ".mts", ".m2ts", ".mpg", ".webm"}
+
+EXIF_MARKER = b"Exif\x00\x00"
+TIFF_HEADERS = (b"II*\x00", b"MM\x00*")
+DATE_TAGS = (0x9003, 0x9004, 0x0132)  # DateTimeOriginal, DateTimeDigitized, DateTime
+EXIF_IFD_TAG = 0x8769
+QUICKTIME_EPOCH_OFFSET = 2082844800  # Seconds from 1904-01-01 to 1970-01-01
+FILENAME_DATE_PATTERN = re.compile(r"(?<!\d)((?:19|20)\d{2})[-_.]?(0[1-9]|1[0-2])[-_.]?(0[1-9]|[12]\d|3[01])")
+SIDECAR_SUFFIXES = (".json", ".supplemental-metadata.json")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dates (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    taken INTEGER NOT NULL  -- Date ordinal, 0 if unknown
+);
+"""
+
+
+def parse_exif_date(data, start):
+    """DateTimeOriginal (or a fallback date tag) from the TIFF structure at data[start:]."""
+    endian = "<" if data[start:start + 2] == b"II" else ">"
+
+    def read_ifd(offset):
+        tags = {}
+        count = struct.unpack_from(endian + "H", data, start + offset)[0]
+        for number in range(count):
+            entry = start + offset + 2 + number * 12
+            tag, kind, length, value = struct.unpack_from(endian + "2H2L", data, entry)
+            tags[tag] = (kind, length, value, entry + 8)
+        return tags
+
+    def ascii_value(kind, length, value, inline):
+        position = inline if length <= 4 else start + value
+        return data[position:position + length].rstrip(b"\x00").decode("ascii", "replace")
+
+    ifd0 = read_ifd(struct.unpack_from(endian + "L", data, start + 4)[0])
+    tags = dict(ifd0)
+    if EXIF_IFD_TAG in ifd0:
+        tags.update(read_ifd(ifd0[EXIF_IFD_TAG][2]))
+    for tag in DATE_TAGS:
+        if tag in tags:
+            parsed = parse_date_text(ascii_value(*tags[tag]))
+            if parsed:
+                return parsed
+    return None
+
+
+def parse_date_text(text):
+    """Date of an EXIF "YYYY:MM:DD HH:MM:SS" value."""
+    try:
+        return datetime.date(int(text[0:4]), int(text[5:7]), int(text[8:10]))
+    except ValueError:
+        return None
+
+
+def exif_date(path):
+    with open(path, "rb") as f:
+        data = f.read(HEADER_BYTES)
+    if data[:4] in TIFF_HEADERS:
+        starts = [0]  # TIFF-based raw formats carry the structure at the start of the file
+    else:
+        starts = []
+        position = data.find(EXIF_MARKER)
+        while position >= 0 and len(starts) < 4:
+            if data[position + 6:position + 10] in TIFF_HEADERS:
+                starts.append(position + 6)
+            position = data.find(EXIF_MARKER, position + 1)
+    for start in starts:
+        try:
+            parsed = parse_exif_date(data, start)
+        except (struct.error, IndexError):
+            continue
+        if parsed:
+            return parsed
+    return None
+
+
+def read_box_header(f, position):
+    f.seek(position)
+    header = f.read(16)
+    if len(header) < 8:
+        return None, 0, 0
+    size, kind = struct.unpack(">L4s", header[:8])
+    if size == 1 and len(header) == 16:
+        return kind, struct.unpack(">Q", header[8:16])[0], 16
+    return kind, size, 8
+
+
+def quicktime_date(path):
+    """Creation date from the mvhd box of a QuickTime/MP4 file, seeking from box to box."""
+    with open(path, "rb") as f:
+        end = os.fstat(f.fileno()).st_size
+        position, limit = 0, end
+        while position + 8 <= limit:
+            kind, size, header_size = read_box_header(f, position)
+            if kind is None:
+                return None
+            if size == 0:
+                size = limit - position  # Box extends to the end of its parent
+            if size < header_size:
+                return None
+            if kind == b"moov":
+                # Descend: mvhd is a direct child of moov
+                position, limit = position + header_size, position + size
+                continue
+            if kind == b"mvhd":
+                f.seek(position + header_size)
+                version = f.read(4)[:1]
+                raw = f.read(8) if version == b"\x01" else f.read(4)
+                seconds = int.from_bytes(raw, "big") if raw else 0
+                if seconds <= QUICKTIME_EPOCH_OFFSET:
+                    return None  # Unset (0) or nonsense timestamps
+                return datetime.datetime.fromtimestamp(
+                    seconds - QUICKTIME_EPOCH_OFFSET, datetime.timezone.utc).date()
+            position += size
+    return None
+
+
+def sidecar_date(path):
+    for suffix in SIDECAR_SUFFIXES:
+        try:
+            with open(path + suffix, "r", encoding="utf-8") as f:
+                timestamp = int(json.load(f)["photoTakenTime"]["timestamp"])
+            return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).date()
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+    return None
+
+
+def filename_date(path):
+    match = FILENAME_DATE_PATTERN.search(os.path.basename(path))
+    if match:
+        try:
+            return datetime.date(*(int(group) for group in match.groups()))
+        except ValueError:
+            return None
+    return None
+
+
+def capture_date(path):
+    """Best capture date of a media file, or None."""
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        if extension in IMAGE_EXTENSIONS:
+            found = exif_date(path)
+        elif extension in MOVIE_EXTENSIONS:
+            found = quicktime_date(path)
+        else:
+            found = None
+    except OSError:
+        found = None
+    return found or sidecar_date(path) or filename_date(path)
+
+
+def cached_dates(db_path):
+    """{path: (size, mtime_ns, date ordinal)} from the date cache, empty if there is none."""
+    try:
+        db = sqlite3.connect(db_path, timeout=30)
+        try:
+            return {path: (size, mtime_ns, taken) for path, size, mtime_ns, taken in db.execute(
+                "SELECT path, size, mtime_ns, taken FROM dates")}
+        finally:
+            db.close()
+    except sqlite3.Error:
+        return {}
+
+
+class DateSummary:
+    def __init__(self):
+        self.days = {}  # date ordinal -> [files, bytes]
+        self.unknown = [0, 0]
+        self.files = 0
+        self.total = 0  # Files to date, known once the folder has been walked
+        self.cached = 0
+        self.complete = False
+        self.cancelled = False
+        self.elapsed = 0.0
+
+    def add(self, taken, size):
+        self.files += 1
+        counts = self.days.setdefault(taken, [0, 0]) if taken else self.unknown
+        counts[0] += 1
+        counts[1] += size
+
+    def copy(self):
+        summary = DateSummary()
+        summary.days = {day: list(counts) for day, counts in self.days.items()}
+        summary.unknown = list(self.unknown)
+        for name in ("files", "total", "cached", "complete", "cancelled", "elapsed"):
+            setattr(summary, name, getattr(self, name))
+        return summary
+
+    def months(self):
+        """{(year, month): [files, bytes]} for every month with dated files."""
+        months = {}
+        for day, (files, size) in self.days.items():
+            date = datetime.date.fromordinal(day)
+            counts = months.setdefault((date.year, date.month), [0, 0])
+            counts[0] += files
+            counts[1] += size
+        return months
+
+    def range_totals(self, start, end):
+        """(files, bytes) dated between start and end, both inclusive."""
+        first, last = start.toordinal(), end.toordinal()
+        files = size = 0
+        for day, counts in self.days.items():
+            if first <= day <= last:
+                files += counts[0]
+                size += counts[1]
+        return files, size
+
+
+class DateScanner:
+    def __init__(self, root, db_path, extensions=None, workers=DEFAULT_WORKERS, cancel_event=None,
+                 progress_callback=None):
+        self.root = root
+        self.db_path = db_path
+        self.extensions = set(extensions or ()) or MEDIA_EXTENSIONS
+        self.workers = workers
+        self.cancel_event = cancel_event or threading.Event()
+        self.progress_callback = progress_callback
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def media_files(self):
+        files = []
+        stack = [self.root]
+        while stack and not self.cancel_event.is_set():
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif (entry.is_file(follow_symlinks=False)
+                                  and os.path.splitext(entry.name)[1].lower() in self.extensions):
+                                st = entry.stat(follow_symlinks=False)
+                                files.append((entry.path, st.st_size, st.st_mtime_ns))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return files
+
+    @staticmethod
+    def date_batch(batch):
+        return [(path, size, mtime_ns, capture_date(path)) for path, size, mtime_ns in batch]
+
+    def scan(self):
+        """Date every media file below root and return the DateSummary."""
+        started = time.monotonic()
+        summary = DateSummary()
+        db = sqlite3.connect(self.db_path, timeout=30)
+        db.executescript(SCHEMA)
+        cache = {path: (size, mtime_ns, taken) for path, size, mtime_ns, taken in db.execute(
+            "SELECT path, size, mtime_ns, taken FROM dates")}
+
+        files = self.media_files()
+        summary.total = len(files)
+        missing = []
+        for path, size, mtime_ns in files:
+            cached = cache.get(path)
+            if cached is not None and cached[:2] == (size, mtime_ns):
+                summary.add(cached[2], size)
+                summary.cached += 1
+            else:
+                missing.append((path, size, mtime_ns))
+
+        last_report = 0.0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            batches = [missing[i:i + BATCH_SIZE] for i in range(0, len(missing), BATCH_SIZE)]
+            for results in pool.map(self.date_batch, batches):
+                rows = []
+                for path, size, mtime_ns, taken in results:
+                    ordinal = taken.toordinal() if taken else 0
+                    summary.add(ordinal, size)
+                    rows.append((path, size, mtime_ns, ordinal))
+                db.executemany("INSERT OR REPLACE INTO dates (path, size, mtime_ns, taken) VALUES (?, ?, ?, ?)",
+                               rows)
+                if self.cancel_event.is_set():
+                    summary.cancelled = True
+                    pool.shutdown(cancel_futures=True)
+                    break
+                now = time.monotonic()
+                if self.progress_callback and now - last_report >= PROGRESS_INTERVAL:
+                    last_report = now
+                    summary.elapsed = now - started
+                    self.progress_callback(summary.copy())
+        db.commit()
+        db.close()
+
+        summary.cancelled = summary.cancelled or self.cancel_event.is_set()
+        summary.complete = not summary.cancelled
+        summary.elapsed = time.monotonic() - started
+        return summary
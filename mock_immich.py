@@ -0,0 +1,329 @@
+"""A local stand-in for an Immich server, for benchmarking uploads.
+
+Implements the endpoints immich-go uses for an upload (ping, version, user,
+media types, asset search, bulk upload check, asset upload and albums)
+well enough for a run to complete. Uploaded data is read and discarded.
+Every request can be delayed by a fixed latency, and request bodies are
+read no faster than a shared bandwidth limit. Unknown endpoints answer an
+empty JSON object and are counted, so a newer immich-go that needs more
+shows up in the stats.
+
+    python mock_immich.py [--port 2283] [--latency-ms 0] [--bandwidth-mbps 0]
+
+GET /__mock__/stats returns the counters, POST /__mock__/reset clears them.
+"""
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+SERVER_VERSION = {"major": 1, "minor": 132, "patch": 3}
+MEDIA_TYPES = {
+    "image": [".3fr", ".ari", ".arw", ".avif", ".bmp", ".cap", ".cin", ".cr2", ".cr3", ".crw", ".dcr", ".dng",
+              ".erf", ".fff", ".gif", ".heic", ".heif", ".hif", ".iiq", ".insp", ".jpe", ".jpeg", ".jpg",
+              ".jxl", ".k25", ".kdc", ".mrw", ".nef", ".orf", ".ori", ".pef", ".png", ".psd", ".raf", ".raw",
+              ".rw2", ".rwl", ".sr2", ".srf", ".srw", ".svg", ".tif", ".tiff", ".webp", ".x3f"],
+    "video": [".3gp", ".3gpp", ".avi", ".flv", ".insv", ".m2t", ".m2ts", ".m4v", ".mkv", ".mov", ".mp4",
+              ".mpe", ".mpeg", ".mpg", ".mts", ".vob", ".webm", ".wmv"],
+    "sidecar": [".xmp"],
+}
+CHUNK_SIZE = 64 * 1024
+ALBUM_ASSETS_PATH = re.compile(r"^/api/albums/([^/]+)/assets$")
+ALBUM_PATH = re.compile(r"^/api/albums/([^/]+)$")
+
+
+class Bandwidth:
+    """Shared byte budget; consume() sleeps so that all callers together stay under the rate."""
+
+    def __init__(self, bytes_per_s):
+        self.bytes_per_s = bytes_per_s
+        self.lock = threading.Lock()
+        self.next_free = time.monotonic()
+
+    def consume(self, count):
+        if not self.bytes_per_s:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_free)
+            self.next_free = start + count / self.bytes_per_s
+            delay = self.next_free - now
+        time.sleep(delay)
+
+
+class MockState:
+    def __init__(self, latency=0.0, bytes_per_s=0):
+        self.latency = latency
+        self.bandwidth = Bandwidth(bytes_per_s)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.monotonic()
+            self.requests = {}  # "METHOD /path" -> count
+            self.unknown = {}
+            self.assets = 0
+            self.duplicates = 0
+            self.bytes = 0
+            self.checksums = set()
+            self.albums = {}  # id -> {"albumName": ..., "assets": set()}
+
+    def count(self, key, unknown=False):
+        with self.lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if unknown:
+                self.unknown[key] = self.unknown.get(key, 0) + 1
+
+    def stats(self):
+        with self.lock:
+            return {
+                "elapsed": time.monotonic() - self.started,
+                "assets": self.assets,
+                "duplicates": self.duplicates,
+                "bytes": self.bytes,
+                "albums": len(self.albums),
+                "album_assets": sum(len(album["assets"]) for album in self.albums.values()),
+                "requests": dict(self.requests),
+                "unknown": dict(self.unknown),
+            }
+
+
+class MockImmichHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, as with a real server
+    disable_nagle_algorithm = True  # Else delayed ACKs stall every keep-alive response
+    server_version = "MockImmich/1"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def read_body(self, keep=True):
+        """(body, size) of the request, de-chunked and read through the bandwidth
+        limit. With keep=False the data is discarded and body is empty."""
+        parts = []
+        total = 0
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass  # Trailers
+                    break
+                total += self.read_exactly(size, parts if keep else None)
+                self.rfile.readline()
+        else:
+            total = self.read_exactly(int(self.headers.get("Content-Length") or 0), parts if keep else None)
+        return b"".join(parts), total
+
+    def read_exactly(self, size, parts):
+        total = 0
+        while total < size:
+            chunk = self.rfile.read(min(CHUNK_SIZE, size - total))
+            if not chunk:
+                break
+            self.state.bandwidth.consume(len(chunk))
+            if parts is not None:
+                parts.append(chunk)
+            total += len(chunk)
+        return total
+
+    def send_json(self, payload, status=200):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def handle_request(self, method):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        handler = ROUTES.get((method, path))
+        key = f"{method} {path}"
+        if handler is None:
+            match = ALBUM_ASSETS_PATH.match(path) or ALBUM_PATH.match(path)
+            if match:
+                handler = album_assets if match.re is ALBUM_ASSETS_PATH else album_info
+                key = f"{method} /api/albums/{{id}}" + ("/assets" if handler is album_assets else "")
+        # Asset data is only counted, not kept
+        body, size = self.read_body(keep=handler is not upload_asset)
+
+        if not path.startswith("/__mock__/"):
+            if self.state.latency:
+                time.sleep(self.state.latency)
+            if not path.startswith("/api/server/ping") and not (
+                    self.headers.get("x-api-key") or self.headers.get("Authorization")):
+                self.send_json({"message": "Authentication required"}, 401)
+                return
+        self.state.count(key, unknown=handler is None)
+        if handler is None:
+            self.send_json({})
+            return
+        try:
+            payload = json.loads(body) if body and self.headers.get("Content-Type", "").startswith(
+                "application/json") else size
+        except ValueError:
+            self.send_json({"message": "Invalid JSON"}, 400)
+            return
+        status, response = handler(self.state, method, path, payload)
+        self.send_json(response, status)
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+    def do_PUT(self):
+        self.handle_request("PUT")
+
+    def do_DELETE(self):
+        self.handle_request("DELETE")
+
+
+def ping(state, method, path, body):
+    return 200, {"res": "pong"}
+
+
+def version(state, method, path, body):
+    return 200, SERVER_VERSION
+
+
+def about(state, method, path, body):
+    return 200, {"version": "v{major}.{minor}.{patch}".format(**SERVER_VERSION)}
+
+
+def user_me(state, method, path, body):
+    return 200, {"id": "00000000-0000-0000-0000-000000000001", "email": "bench@example.com", "name": "bench",
+                 "isAdmin": True}
+
+
+def media_types(state, method, path, body):
+    return 200, MEDIA_TYPES
+
+
+def search_metadata(state, method, path, body):
+    # The server starts empty, so immich-go has nothing to compare against
+    empty = {"total": 0, "count": 0, "items": [], "facets": []}
+    return 200, {"albums": empty, "assets": dict(empty, nextPage=None)}
+
+
+def bulk_upload_check(state, method, path, body):
+    results = []
+    with state.lock:
+        for asset in body.get("assets", []) if isinstance(body, dict) else []:
+            checksum = asset.get("checksum")
+            if checksum and checksum in state.checksums:
+                state.duplicates += 1
+                results.append({"id": asset.get("id"), "action": "reject", "reason": "duplicate"})
+            else:
+                if checksum:
+                    state.checksums.add(checksum)
+                results.append({"id": asset.get("id"), "action": "accept"})
+    return 200, {"results": results}
+
+
+def upload_asset(state, method, path, size):
+    with state.lock:
+        state.assets += 1
+        state.bytes += size
+    return 201, {"id": str(uuid.uuid4()), "status": "created"}
+
+
+def list_albums(state, method, path, body):
+    with state.lock:
+        return 200, [{"id": album_id, "albumName": album["albumName"], "assetCount": len(album["assets"])}
+                     for album_id, album in state.albums.items()]
+
+
+def create_album(state, method, path, body):
+    album_id = str(uuid.uuid4())
+    name = body.get("albumName", "") if isinstance(body, dict) else ""
+    assets = set(body.get("assetIds", [])) if isinstance(body, dict) else set()
+    with state.lock:
+        state.albums[album_id] = {"albumName": name, "assets": assets}
+    return 201, {"id": album_id, "albumName": name, "assetCount": len(assets)}
+
+
+def album_info(state, method, path, body):
+    album_id = ALBUM_PATH.match(path).group(1)
+    with state.lock:
+        album = state.albums.get(album_id)
+        if album is None:
+            return 404, {"message": "Not found"}
+        return 200, {"id": album_id, "albumName": album["albumName"], "assetCount": len(album["assets"]),
+                     "assets": []}
+
+
+def album_assets(state, method, path, body):
+    album_id = ALBUM_ASSETS_PATH.match(path).group(1)
+    ids = body.get("ids", []) if isinstance(body, dict) else []
+    with state.lock:
+        album = state.albums.get(album_id)
+        if album is None:
+            return 404, {"message": "Not found"}
+        album["assets"].update(ids)
+    return 200, [{"id": asset_id, "success": True} for asset_id in ids]
+
+
+def mock_stats(state, method, path, body):
+    return 200, state.stats()
+
+
+def mock_reset(state, method, path, body):
+    state.reset()
+    return 200, {}
+
+
+ROUTES = {
+    ("GET", "/api/server/ping"): ping,
+    ("GET", "/api/server-info/ping"): ping,
+    ("GET", "/api/server/version"): version,
+    ("GET", "/api/server/about"): about,
+    ("GET", "/api/users/me"): user_me,
+    ("GET", "/api/server/media-types"): media_types,
+    ("POST", "/api/search/metadata"): search_metadata,
+    ("POST", "/api/assets/bulk-upload-check"): bulk_upload_check,
+    ("POST", "/api/assets"): upload_asset,
+    ("GET", "/api/albums"): list_albums,
+    ("POST", "/api/albums"): create_album,
+    ("GET", "/__mock__/stats"): mock_stats,
+    ("POST", "/__mock__/reset"): mock_reset,
+}
+
+
+def create_server(host="127.0.0.1", port=0, latency_ms=0, bandwidth_mbps=0):
+    """A ThreadingHTTPServer (not yet serving); port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), MockImmichHandler)
+    server.daemon_threads = True
+    server.state = MockState(latency_ms / 1000, int(bandwidth_mbps * 1_000_000 / 8))
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in Immich server for upload benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2283)
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every API request")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0, help="upload bandwidth in Mbit/s, 0 for unlimited")
+    args = parser.parse_args(argv)
+    server = create_server(args.host, args.port, args.latency_ms, args.bandwidth_mbps)
+    host, port = server.server_address[:2]
+    print(f"Mock Immich server on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
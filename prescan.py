@@ -0,0 +1,139 @@
+"""Parallel pre-scan of a local upload folder.
+
+Directories are listed with os.scandir on a thread pool: every worker lists
+one directory and hands its subdirectories back to the scheduler, so wide
+and deep trees (NAS shares in particular, where each listing waits on the
+network) are walked concurrently. Results are merged as they come in and
+reported incrementally; a cancel event stops the walk at the next directory.
+"""
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+DEFAULT_WORKERS = 16
+PROGRESS_INTERVAL = 0.25  # Seconds between progress callbacks
+
+
+def parse_extensions(text):
+    """Turn the File Type Filter text (".jpg, .png,heic") into a set of lowercase extensions."""
+    extensions = set()
+    for part in (text or "").split(","):
+        part = part.strip().lower()
+        if part:
+            extensions.add(part if part.startswith(".") else "." + part)
+    return extensions
+
+
+class ScanSummary:
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.dirs = 0
+        self.skipped = 0  # Files excluded by the extension filter
+        self.errors = 0
+        self.extensions = {}  # extension -> [files, bytes]
+        self.top_level = {}  # first path component under the root -> bytes
+        self.complete = False
+        self.cancelled = False
+        self.elapsed = 0.0
+
+    def add_file(self, extension, size, top):
+        self.files += 1
+        self.bytes += size
+        counts = self.extensions.setdefault(extension, [0, 0])
+        counts[0] += 1
+        counts[1] += size
+        self.top_level[top] = self.top_level.get(top, 0) + size
+
+    def merge(self, other):
+        self.files += other.files
+        self.bytes += other.bytes
+        self.dirs += other.dirs
+        self.skipped += other.skipped
+        self.errors += other.errors
+        for extension, (files, size) in other.extensions.items():
+            counts = self.extensions.setdefault(extension, [0, 0])
+            counts[0] += files
+            counts[1] += size
+        for top, size in other.top_level.items():
+            self.top_level[top] = self.top_level.get(top, 0) + size
+
+    def copy(self):
+        summary = ScanSummary()
+        summary.merge(self)
+        summary.complete = self.complete
+        summary.cancelled = self.cancelled
+        summary.elapsed = self.elapsed
+        return summary
+
+    def top_extensions(self, limit=5):
+        """Extensions sorted by bytes, largest first."""
+        return sorted(self.extensions.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+
+
+class FolderScanner:
+    def __init__(self, root, extensions=None, workers=DEFAULT_WORKERS, cancel_event=None,
+                 progress_callback=None):
+        self.root = root
+        self.extensions = set(extensions or ())
+        self.workers = workers
+        self.cancel_event = cancel_event or threading.Event()
+        self.progress_callback = progress_callback
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def scan_dir(self, path, top):
+        """List one directory; returns its partial summary and the subdirectories to scan next."""
+        summary = ScanSummary()
+        subdirs = []
+        summary.dirs = 1
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    entry_top = top if top is not None else entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append((entry.path, entry_top))
+                        elif entry.is_file(follow_symlinks=False):
+                            extension = os.path.splitext(entry.name)[1].lower()
+                            if self.extensions and extension not in self.extensions:
+                                summary.skipped += 1
+                                continue
+                            summary.add_file(extension, entry.stat(follow_symlinks=False).st_size, entry_top)
+                    except OSError:
+                        summary.errors += 1
+        except OSError:
+            summary.errors += 1
+        return summary, subdirs
+
+    def scan(self):
+        """Walk the tree and return the ScanSummary (complete unless cancelled)."""
+        started = time.monotonic()
+        summary = ScanSummary()
+        last_report = 0.0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(self.scan_dir, self.root, None)}
+            while pending:
+                if self.cancel_event.is_set():
+                    for future in pending:
+                        future.cancel()
+                    summary.cancelled = True
+                    break
+                done, pending = wait(pending, timeout=PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    partial, subdirs = future.result()
+                    summary.merge(partial)
+                    pending.update(pool.submit(self.scan_dir, path, top) for path, top in subdirs)
+
+                now = time.monotonic()
+                if self.progress_callback and now - last_report >= PROGRESS_INTERVAL:
+                    last_report = now
+                    summary.elapsed = now - started
+                    self.progress_callback(summary.copy())
+
+        summary.complete = not summary.cancelled
+        summary.elapsed = time.monotonic() - started
+        return summary
@@ -0,0 +1,87 @@
+"""Run immich-go inside the GUI process with streamed output.
+
+ImmichGoProcess wraps a QProcess: stdout and stderr are read as soon as data
+is available, split into lines and emitted in batches, and the exit code is
+reported through a signal instead of being polled.
+"""
+from PySide6.QtCore import QObject, QProcess, QTimer, Signal
+
+
+STOP_GRACE_MS = 5000  # Time between terminate() and kill() when stopping
+
+
+class ImmichGoProcess(QObject):
+    output_received = Signal(str, list)  # Stream name ("stdout"/"stderr"), complete lines
+    process_started = Signal(int)  # PID
+    process_finished = Signal(int, str)  # Exit code, "normal" / "crashed" / "failed"
+
+    def __init__(self, command, parent=None, working_directory=None):
+        super().__init__(parent)
+        self.command = list(command)
+        self.buffers = {"stdout": b"", "stderr": b""}
+        self.exit_code = None
+        self.stop_requested = False
+
+        self.process = QProcess(self)
+        self.process.setProgram(self.command[0])
+        self.process.setArguments(self.command[1:])
+        if working_directory:
+            self.process.setWorkingDirectory(working_directory)
+        self.process.readyReadStandardOutput.connect(
+            lambda: self.read_stream("stdout", self.process.readAllStandardOutput()))
+        self.process.readyReadStandardError.connect(
+            lambda: self.read_stream("stderr", self.process.readAllStandardError()))
+        self.process.started.connect(lambda: self.process_started.emit(self.pid()))
+        self.process.finished.connect(self.handle_finished)
+        self.process.errorOccurred.connect(self.handle_error)
+
+    def start(self):
+        self.process.start()
+
+    def pid(self):
+        return self.process.processId()
+
+    def is_running(self):
+        return self.process.state() != QProcess.NotRunning
+
+    def stop(self):
+        """Ask the process to terminate, killing it if it hasn't exited after a grace period."""
+        if not self.is_running():
+            return
+        self.stop_requested = True
+        self.process.terminate()
+        QTimer.singleShot(STOP_GRACE_MS, self.kill)
+
+    def kill(self):
+        if self.is_running():
+            self.process.kill()
+
+    def read_stream(self, stream, data):
+        # Progress output uses carriage returns to redraw a line; treat them as line breaks
+        data = self.buffers[stream] + bytes(data).replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        *lines, self.buffers[stream] = data.split(b"\n")
+        lines = [line.decode("utf-8", errors="replace") for line in lines if line]
+        if lines:
+            self.output_received.emit(stream, lines)
+
+    def flush_buffers(self):
+        for stream, data in self.buffers.items():
+            if data:
+                self.buffers[stream] = b""
+                self.output_received.emit(stream, [data.decode("utf-8", errors="replace")])
+
+    def handle_finished(self, exit_code, exit_status):
+        # Pick up anything still sitting in the pipes before reporting the exit
+        self.read_stream("stdout", self.process.readAllStandardOutput())
+        self.read_stream("stderr", self.process.readAllStandardError())
+        self.flush_buffers()
+        self.exit_code = exit_code
+        status = "crashed" if exit_status == QProcess.CrashExit else "normal"
+        self.process_finished.emit(exit_code, status)
+
+    def handle_error(self, error):
+        # Other errors (crashes, read/write failures) are followed by finished()
+        if error == QProcess.FailedToStart:
+            self.exit_code = -1
+            self.output_received.emit("stderr", [f"Failed to start {self.command[0]}: {self.process.errorString()}"])
+            self.process_finished.emit(-1, "failed")
@@ -0,0 +1,86 @@
+"""Named configuration profiles, e.g. one per server or per source.
+
+Each profile is a single JSON document (UploadConfig.to_dict()) stored under
+profiles/<name> in the settings, so loading one is a single settings read.
+The "default" profile falls back to the flat keys written by older versions
+until it is first saved. Like config_model, nothing here imports Qt.
+
+Export files look like {"version": 1, "profiles": {"<name>": {...}}}.
+"""
+import json
+
+from config_model import UploadConfig
+
+
+PROFILE_GROUP = "profiles"
+CURRENT_KEY = "current_profile"
+DEFAULT_PROFILE = "default"
+EXPORT_VERSION = 1
+
+
+def valid_name(name):
+    # A slash would turn the settings key into a nested group
+    return bool(name.strip()) and "/" not in name and "\\" not in name
+
+
+class ProfileStore:
+    def __init__(self, settings):
+        self.settings = settings
+
+    def key(self, name):
+        return f"{PROFILE_GROUP}/{name}"
+
+    def names(self):
+        self.settings.beginGroup(PROFILE_GROUP)
+        names = set(self.settings.childKeys())
+        self.settings.endGroup()
+        names.add(DEFAULT_PROFILE)
+        return sorted(names, key=lambda name: (name != DEFAULT_PROFILE, name.lower()))
+
+    def load(self, name):
+        """UploadConfig of a profile, or None if there is no such profile."""
+        document = self.settings.value(self.key(name))
+        if document:
+            return UploadConfig.from_dict(json.loads(document))
+        if name == DEFAULT_PROFILE:
+            return UploadConfig.from_settings(self.settings)
+        return None
+
+    def save(self, name, config):
+        if not valid_name(name):
+            raise ValueError(f"Invalid profile name: {name!r}")
+        self.settings.setValue(self.key(name), json.dumps(config.to_dict(), sort_keys=True))
+
+    def delete(self, name):
+        self.settings.remove(self.key(name))
+
+    def current(self):
+        name = self.settings.value(CURRENT_KEY, DEFAULT_PROFILE, type=str)
+        return name if name in self.names() else DEFAULT_PROFILE
+
+    def set_current(self, name):
+        self.settings.setValue(CURRENT_KEY, name)
+
+    def export_file(self, path, names=None):
+        profiles = {}
+        for name in names or self.names():
+            config = self.load(name)
+            if config is not None:
+                profiles[name] = config.to_dict()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": EXPORT_VERSION, "profiles": profiles}, f, indent=2, sort_keys=True)
+        return sorted(profiles)
+
+    def import_file(self, path):
+        """Add (or overwrite) the profiles of an export file; returns their names."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        profiles = data.get("profiles") if isinstance(data, dict) else None
+        if not isinstance(profiles, dict):
+            raise ValueError("Not a profile export file")
+        imported = []
+        for name, values in profiles.items():
+            if valid_name(name) and isinstance(values, dict):
+                self.save(name, UploadConfig.from_dict(values))
+                imported.append(name)
+        return imported
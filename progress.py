@@ -0,0 +1,181 @@
+"""Streaming parser for immich-go console and log output.
+
+ProgressParser turns lines into counters (files scanned, uploaded,
+duplicates, errors, bytes transferred) and derives throughput, ETA and
+error rate from them. It has no Qt dependency so it can be shared by the
+GUI dashboard and headless runs. Each line is routed by a couple of cheap
+substring checks before any regular expression runs.
+"""
+import json
+import re
+import time
+from collections import deque
+
+
+# Periodic no-UI progress line, e.g. "Immich read 42%, Assets found: 1200, Upload errors: 3, Uploaded 800"
+PROGRESS_PATTERNS = {
+    "scanned": re.compile(r"Assets found:\s*(\d+)"),
+    "errors": re.compile(r"Upload errors:\s*(\d+)"),
+    "uploaded": re.compile(r"Uploaded:?\s*(\d+)"),
+}
+# Final report lines, e.g. "scanned image file             :    1234"
+REPORT_PATTERN = re.compile(r"^\s*([A-Za-z][A-Za-z ]*?)\s*:\s*(\d+)\s*$")
+REPORT_COUNTERS = {
+    "scanned image file": "scanned",
+    "scanned video file": "scanned",
+    "uploaded": "uploaded",
+    "upload error": "errors",
+    "server has same asset": "duplicates",
+    "server has better asset": "duplicates",
+    "file duplicated in the input": "duplicates",
+}
+# slog text format: time=... level=INFO msg="uploaded" file=... size=123
+KEY_VALUE_PATTERN = re.compile(r'(\w+)=("(?:[^"\\]|\\.)*"|\S+)')
+SIZE_KEYS = ("size", "bytes", "Size")
+
+COUNTERS = ("scanned", "uploaded", "duplicates", "errors", "bytes")
+RATE_WINDOW = 10.0  # Seconds of history used for throughput
+
+
+class ProgressParser:
+    def __init__(self, total_files=None, total_bytes=None):
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        # Report/progress lines carry absolute values; keep them apart from event counts
+        self.absolute = {}
+        self.report = {}
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.started = time.monotonic()
+        self.samples = deque()  # (time, processed files, bytes)
+
+    def feed_lines(self, lines):
+        for line in lines:
+            self.feed(line)
+
+    def feed(self, line):
+        if line.startswith("{"):
+            self.feed_event(self.parse_json(line))
+        elif "level=" in line:
+            self.feed_event(dict(
+                (key, value.strip('"')) for key, value in KEY_VALUE_PATTERN.findall(line)
+            ))
+        elif "Assets found" in line or "Upload errors" in line:
+            for name, pattern in PROGRESS_PATTERNS.items():
+                match = pattern.search(line)
+                if match:
+                    self.absolute[name] = max(self.absolute.get(name, 0), int(match.group(1)))
+        elif ":" in line:
+            match = REPORT_PATTERN.match(line)
+            if match and match.group(1).strip().lower() in REPORT_COUNTERS:
+                self.report[match.group(1).strip().lower()] = int(match.group(2))
+
+    @staticmethod
+    def parse_json(line):
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return {}
+        return event if isinstance(event, dict) else {}
+
+    def feed_event(self, event):
+        if not event:
+            return
+        message = str(event.get("msg", "")).lower()
+        level = str(event.get("level", "")).upper()
+        if level.startswith("ERR") or "error" in message:
+            self.counters["errors"] += 1
+        elif "duplicate" in message or "same asset" in message or "already" in message:
+            self.counters["duplicates"] += 1
+        elif "uploaded" in message:
+            self.counters["uploaded"] += 1
+            for key in SIZE_KEYS:
+                try:
+                    self.counters["bytes"] += int(event[key])
+                    break
+                except (KeyError, TypeError, ValueError):
+                    continue
+        elif "scanned" in message or "discovered" in message or "found" in message:
+            self.counters["scanned"] += 1
+
+    def value(self, name):
+        """Best current value of a counter from events, progress lines and the final report."""
+        value = max(self.counters[name], self.absolute.get(name, 0))
+        reported = [count for key, count in self.report.items() if REPORT_COUNTERS[key] == name]
+        return max(value, sum(reported)) if reported else value
+
+    def snapshot(self, now=None):
+        """Return counters plus files/s, MB/s, ETA (seconds) and error rate."""
+        now = time.monotonic() if now is None else now
+        values = {name: self.value(name) for name in COUNTERS}
+        processed = values["uploaded"] + values["duplicates"] + values["errors"]
+
+        self.samples.append((now, processed, values["bytes"]))
+        while len(self.samples) > 2 and now - self.samples[0][0] > RATE_WINDOW:
+            self.samples.popleft()
+        first_time, first_processed, first_bytes = self.samples[0]
+        elapsed = now - first_time
+        files_per_s = (processed - first_processed) / elapsed if elapsed > 0 else 0.0
+        bytes_per_s = (values["bytes"] - first_bytes) / elapsed if elapsed > 0 else 0.0
+
+        total = self.total_files or values["scanned"]
+        eta = None
+        if total and files_per_s > 0:
+            eta = max(0.0, (total - processed) / files_per_s)
+        elif self.total_bytes and bytes_per_s > 0:
+            eta = max(0.0, (self.total_bytes - values["bytes"]) / bytes_per_s)
+
+        values.update({
+            "processed": processed,
+            "total": total,
+            "elapsed": now - self.started,
+            "files_per_s": files_per_s,
+            "mb_per_s": bytes_per_s / (1024 * 1024),
+            "eta": eta,
+            "error_rate": values["errors"] / processed if processed else 0.0,
+        })
+        return values
+
+
+class AggregateProgress:
+    """Combined progress of several parsers, e.g. the shards of one upload plan."""
+
+    def __init__(self, total_files=None, total_bytes=None):
+        self.parsers = {}  # key (e.g. job id) -> parser; a retried job replaces its earlier attempt
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+
+    def add(self, key, parser):
+        self.parsers[key] = parser
+
+    def snapshot(self, now=None):
+        now = time.monotonic() if now is None else now
+        snapshots = [parser.snapshot(now) for parser in self.parsers.values()]
+        values = {name: sum(snapshot[name] for snapshot in snapshots)
+                  for name in COUNTERS + ("processed", "total", "files_per_s", "mb_per_s")}
+        values["total"] = self.total_files or values["total"]
+        values["elapsed"] = max((snapshot["elapsed"] for snapshot in snapshots), default=0.0)
+        bytes_per_s = values["mb_per_s"] * 1024 * 1024
+        eta = None
+        if values["total"] and values["files_per_s"] > 0:
+            eta = max(0.0, (values["total"] - values["processed"]) / values["files_per_s"])
+        elif self.total_bytes and bytes_per_s > 0:
+            eta = max(0.0, (self.total_bytes - values["bytes"]) / bytes_per_s)
+        values["eta"] = eta
+        values["error_rate"] = values["errors"] / values["processed"] if values["processed"] else 0.0
+        return values
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "–"
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024 or unit == "TB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
@@ -0,0 +1,90 @@
+"""Live dashboard for a running immich-go job.
+
+The dashboard polls a ProgressParser on a timer instead of repainting per
+output line, so updates stay coalesced however fast immich-go writes.
+"""
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QGridLayout, QGroupBox, QLabel, QProgressBar
+
+from progress import format_bytes, format_duration
+
+
+REFRESH_INTERVAL_MS = 500
+
+FIELDS = [
+    ("scanned", "Scanned"),
+    ("uploaded", "Uploaded"),
+    ("duplicates", "Duplicates"),
+    ("errors", "Errors"),
+    ("bytes", "Transferred"),
+    ("files_per_s", "Files/s"),
+    ("mb_per_s", "MB/s"),
+    ("eta", "ETA"),
+    ("error_rate", "Error rate"),
+    ("elapsed", "Elapsed"),
+]
+
+
+class ProgressDashboard(QGroupBox):
+    def __init__(self, title="Progress", parent=None):
+        super().__init__(title, parent)
+        self.parser = None
+        self.value_labels = {}
+
+        grid = QGridLayout(self)
+        columns = len(FIELDS) // 2
+        for position, (name, title) in enumerate(FIELDS):
+            row, column = divmod(position, columns)
+            title_label = QLabel(title)
+            title_label.setStyleSheet("color: #666;")
+            value_label = QLabel("–")
+            value_label.setStyleSheet("font-weight: bold;")
+            grid.addWidget(title_label, row * 2, column)
+            grid.addWidget(value_label, row * 2 + 1, column)
+            self.value_labels[name] = value_label
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        grid.addWidget(self.progress_bar, 4, 0, 1, columns)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def start(self, parser):
+        """Follow a ProgressParser (or anything with the same snapshot())."""
+        self.parser = parser
+        self.refresh_timer.start()
+        self.refresh()
+
+    def stop(self):
+        self.refresh_timer.stop()
+        self.refresh()
+
+    def refresh(self):
+        if self.parser is None:
+            return
+        snapshot = self.parser.snapshot()
+        texts = {
+            "scanned": f"{snapshot['scanned']:,}",
+            "uploaded": f"{snapshot['uploaded']:,}",
+            "duplicates": f"{snapshot['duplicates']:,}",
+            "errors": f"{snapshot['errors']:,}",
+            "bytes": format_bytes(snapshot["bytes"]),
+            "files_per_s": f"{snapshot['files_per_s']:.1f}",
+            "mb_per_s": f"{snapshot['mb_per_s']:.2f}",
+            "eta": format_duration(snapshot["eta"]),
+            "error_rate": f"{snapshot['error_rate']:.1%}",
+            "elapsed": format_duration(snapshot["elapsed"]),
+        }
+        for name, text in texts.items():
+            self.value_labels[name].setText(text)
+        self.value_labels["errors"].setStyleSheet(
+            "font-weight: bold; color: #C62828;" if snapshot["errors"] else "font-weight: bold;")
+
+        if snapshot["total"]:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(min(100, int(snapshot["processed"] * 100 / snapshot["total"])))
+        else:
+            # Unknown total: show a busy indicator while running
+            self.progress_bar.setRange(0, 0 if self.refresh_timer.isActive() else 100)
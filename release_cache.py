@@ -0,0 +1,103 @@
+"""Persistent cache of the latest immich-go release metadata.
+
+The GitHub releases API is only contacted once the cached entry is older
+than the TTL, and then with ``If-None-Match`` so an unchanged release costs
+a 304 without a body. Network failures fall back to whatever is cached.
+"""
+import json
+import os
+import time
+
+
+RELEASE_API_URL = "https://api.github.com/repos/simulot/immich-go/releases/latest"
+DEFAULT_TTL = 6 * 60 * 60  # Seconds
+DEFAULT_TIMEOUT = 5  # Seconds
+
+
+class ReleaseCache:
+    def __init__(self, cache_path, api_url=RELEASE_API_URL, ttl=DEFAULT_TTL,
+                 timeout=DEFAULT_TIMEOUT, session=None):
+        self.cache_path = cache_path
+        self.api_url = api_url
+        self.ttl = ttl
+        self.timeout = timeout
+        self.session = session
+
+    def load(self):
+        """Return the cached release, or None if nothing usable is stored."""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                release = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return release if release.get("tag") else None
+
+    def save(self, release):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(release, f, indent=2)
+        os.replace(tmp_path, self.cache_path)
+
+    def is_fresh(self, release):
+        return release is not None and time.time() - release.get("fetched_at", 0) < self.ttl
+
+    def get(self, allow_network=True, force=False):
+        """Return the latest release, contacting GitHub only when the cache is stale.
+
+        With allow_network=False this never blocks on I/O beyond reading the
+        cache file, which makes it safe to call from the GUI thread.
+        """
+        cached = self.load()
+        if not allow_network or (self.is_fresh(cached) and not force):
+            return cached
+
+        # Imported here so that cache-only lookups don't pay for loading requests
+        import requests
+        if self.session is None:
+            self.session = requests.Session()
+
+        headers = {"Accept": "application/vnd.github+json"}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        try:
+            response = self.session.get(self.api_url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and cached:
+                cached["fetched_at"] = time.time()
+                self.save(cached)
+                return cached
+            response.raise_for_status()
+            release = self.parse(response.json(), response.headers.get("ETag"))
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"Failed to fetch release information: {e}")
+            return cached
+
+        self.save(release)
+        return release
+
+    @staticmethod
+    def parse(release_data, etag=None):
+        """Keep only the fields of a GitHub release that the GUI needs."""
+        return {
+            "tag": release_data["tag_name"],
+            "html_url": release_data.get("html_url"),
+            "published_at": release_data.get("published_at"),
+            "assets": [
+                {
+                    "name": asset["name"],
+                    "size": asset.get("size", 0),
+                    "url": asset.get("browser_download_url"),
+                    "digest": asset.get("digest"),
+                }
+                for asset in release_data.get("assets", [])
+            ],
+            "etag": etag,
+            "fetched_at": time.time(),
+        }
+
+    @staticmethod
+    def find_asset(release, name):
+        for asset in (release or {}).get("assets", []):
+            if asset["name"] == name:
+                return asset
+        return None
@@ -0,0 +1,194 @@
+"""Resource usage of running immich-go process trees, sampled with psutil.
+
+Every sample covers a process and all of its descendants: CPU % (summed,
+so it can exceed 100 on several cores), RSS, disk read/write bytes, open
+files and process count. On Linux a reaped child's disk I/O is added to
+its parent's counters, so the live members are simply summed; elsewhere
+the counters are accumulated per PID so that an exiting child does not
+make the totals go backwards. psutil has no per-process network counters,
+so network throughput is system-wide.
+
+Each tree's samples are appended to a CSV file as they are taken, which is
+what gets kept alongside a job.
+"""
+import csv
+import os
+import sys
+import time
+from collections import deque
+
+
+CHILD_IO_INCLUDED = sys.platform.startswith("linux")
+HISTORY = 600  # Combined samples kept for the live graph
+COLUMNS = ["elapsed", "cpu_percent", "rss", "read_bytes", "write_bytes", "read_rate", "write_rate",
+           "open_files", "processes", "net_sent_rate", "net_recv_rate"]
+
+
+class ProcessTreeSampler:
+    def __init__(self, pid):
+        # Deferred import: psutil is only loaded once a process is monitored
+        import psutil
+
+        self.root = psutil.Process(pid)
+        self.processes = {pid: self.root}  # Same objects every time, cpu_percent needs the previous call
+        self.last_io = {}  # pid -> (read_bytes, write_bytes)
+        self.read_bytes = 0
+        self.write_bytes = 0
+
+    def members(self):
+        import psutil
+
+        try:
+            children = self.root.children(recursive=True)
+        except psutil.Error:
+            children = []
+        alive = {self.root.pid: self.root}
+        for child in children:
+            alive[child.pid] = self.processes.get(child.pid, child)
+        self.processes = alive
+        return list(alive.values())
+
+    def sample(self):
+        """Totals over the tree, or None once the root process is gone."""
+        import psutil
+
+        if not self.root.is_running():
+            return None
+        cpu = 0.0
+        rss = open_files = count = read_bytes = write_bytes = 0
+        for process in self.members():
+            try:
+                with process.oneshot():
+                    cpu += process.cpu_percent(None)
+                    rss += process.memory_info().rss
+                    try:
+                        counters = process.io_counters()
+                    except (AttributeError, psutil.AccessDenied):
+                        counters = None  # Not available on macOS
+                    open_files += len(process.open_files())
+            except psutil.Error:
+                continue
+            count += 1
+            if counters is None:
+                continue
+            if CHILD_IO_INCLUDED:
+                read_bytes += counters.read_bytes
+                write_bytes += counters.write_bytes
+            else:
+                last = self.last_io.get(process.pid, (0, 0))
+                self.read_bytes += max(0, counters.read_bytes - last[0])
+                self.write_bytes += max(0, counters.write_bytes - last[1])
+                self.last_io[process.pid] = (counters.read_bytes, counters.write_bytes)
+        if CHILD_IO_INCLUDED:
+            # Never backwards, e.g. while an exited child is not yet reaped
+            self.read_bytes = max(self.read_bytes, read_bytes)
+            self.write_bytes = max(self.write_bytes, write_bytes)
+        return {"cpu_percent": cpu, "rss": rss, "read_bytes": self.read_bytes, "write_bytes": self.write_bytes,
+                "open_files": open_files, "processes": count}
+
+
+class RateCounter:
+    """Per-second rate of a growing counter between calls."""
+
+    def __init__(self):
+        self.last = None
+
+    def rate(self, value, now):
+        last, self.last = self.last, (value, now)
+        if last is None or now <= last[1]:
+            return 0.0
+        return max(0.0, (value - last[0]) / (now - last[1]))
+
+
+class MonitoredTree:
+    def __init__(self, pid, csv_path=None):
+        self.sampler = ProcessTreeSampler(pid)
+        self.started = time.monotonic()
+        self.read_rate = RateCounter()
+        self.write_rate = RateCounter()
+        self.peak_rss = 0
+        self.peak_cpu = 0.0
+        self.samples = 0
+        self.csv_path = csv_path
+        self.file = None
+        if csv_path:
+            os.makedirs(os.path.dirname(csv_path) or ".", exist_ok=True)
+            self.file = open(csv_path, "w", newline="", encoding="utf-8")
+            self.writer = csv.DictWriter(self.file, fieldnames=COLUMNS)
+            self.writer.writeheader()
+
+    def sample(self, now, network):
+        totals = self.sampler.sample()
+        if totals is None:
+            return None
+        row = dict(totals, elapsed=round(now - self.started, 3),
+                   read_rate=self.read_rate.rate(totals["read_bytes"], now),
+                   write_rate=self.write_rate.rate(totals["write_bytes"], now), **network)
+        self.peak_rss = max(self.peak_rss, row["rss"])
+        self.peak_cpu = max(self.peak_cpu, row["cpu_percent"])
+        self.samples += 1
+        if self.file is not None:
+            self.writer.writerow(row)
+            self.file.flush()
+        return row
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        return {"metrics": self.csv_path, "peak_rss": self.peak_rss, "peak_cpu": self.peak_cpu,
+                "samples": self.samples}
+
+
+class ResourceMonitor:
+    """Samples any number of process trees together; history holds their combined totals."""
+
+    def __init__(self):
+        self.trees = {}
+        self.history = deque(maxlen=HISTORY)  # (time, combined row)
+        self.sent_rate = RateCounter()
+        self.recv_rate = RateCounter()
+
+    def add(self, key, pid, csv_path=None):
+        # Deferred import: psutil is only loaded once a process is monitored
+        import psutil
+
+        try:
+            self.trees[key] = MonitoredTree(pid, csv_path)
+        except (psutil.Error, OSError) as e:
+            print(f"Cannot monitor process {pid}: {e}")
+
+    def remove(self, key):
+        """Stop monitoring a tree; returns its summary (CSV path, peaks) or None."""
+        tree = self.trees.pop(key, None)
+        return tree.close() if tree is not None else None
+
+    def network(self, now):
+        import psutil
+
+        try:
+            counters = psutil.net_io_counters()
+        except (OSError, RuntimeError):
+            counters = None
+        if counters is None:  # No network interfaces
+            return {"net_sent_rate": 0.0, "net_recv_rate": 0.0}
+        return {"net_sent_rate": self.sent_rate.rate(counters.bytes_sent, now),
+                "net_recv_rate": self.recv_rate.rate(counters.bytes_recv, now)}
+
+    def sample(self):
+        """Sample every tree; returns the combined row, or None if nothing is monitored."""
+        if not self.trees:
+            return None
+        now = time.monotonic()
+        network = self.network(now)
+        combined = dict.fromkeys(COLUMNS[1:], 0)
+        combined.update(network)
+        for tree in list(self.trees.values()):
+            row = tree.sample(now, network)
+            if row is None:
+                continue
+            for name in ("cpu_percent", "rss", "read_bytes", "write_bytes", "read_rate", "write_rate",
+                         "open_files", "processes"):
+                combined[name] += row[name]
+        self.history.append((now, combined))
+        return combined
@@ -0,0 +1,136 @@
+"""Live resource graph for the running immich-go processes.
+
+Samples a ResourceMonitor on a timer that only runs while something is
+monitored, shows the latest combined values and plots CPU % and RSS over
+the last samples.
+"""
+from PySide6.QtCore import QPointF, Qt, QTimer
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import QGridLayout, QGroupBox, QHBoxLayout, QLabel, QSpinBox, QWidget
+
+from progress import format_bytes
+from resource_monitor import ResourceMonitor
+
+
+DEFAULT_INTERVAL = 2  # Seconds
+CPU_COLOR = QColor("#1565C0")
+RSS_COLOR = QColor("#EF6C00")
+GRID_COLOR = QColor("#CFD8DC")
+AXIS_COLOR = QColor("#666")
+
+FIELDS = [
+    ("cpu_percent", "CPU"),
+    ("rss", "Memory"),
+    ("read_rate", "Disk read"),
+    ("write_rate", "Disk write"),
+    ("open_files", "Open files"),
+    ("processes", "Processes"),
+    ("net_sent_rate", "Network up"),
+    ("net_recv_rate", "Network down"),
+]
+
+
+class ResourcePlot(QWidget):
+    def __init__(self, history, parent=None):
+        super().__init__(parent)
+        self.history = history  # The monitor's deque of (time, row)
+        self.setMinimumHeight(110)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        width, height = self.width(), self.height() - 14
+        painter.setPen(GRID_COLOR)
+        for fraction in (0.25, 0.5, 0.75):
+            painter.drawLine(0, int(height * fraction), width, int(height * fraction))
+        if len(self.history) < 2:
+            painter.setPen(AXIS_COLOR)
+            painter.drawText(self.rect(), Qt.AlignCenter, "Waiting for samples...")
+            return
+
+        rows = [row for _, row in self.history]
+        # CPU on a 100 % per core scale once it exceeds one core; RSS scaled to its peak
+        cpu_top = max(100.0, max(row["cpu_percent"] for row in rows))
+        rss_top = max(1, max(row["rss"] for row in rows))
+        step = width / (len(rows) - 1)
+        for name, top, color in (("cpu_percent", cpu_top, CPU_COLOR), ("rss", rss_top, RSS_COLOR)):
+            points = QPolygonF([QPointF(position * step, 2 + (height - 2) * (1 - row[name] / top))
+                                for position, row in enumerate(rows)])
+            painter.setPen(QPen(color, 1.5))
+            painter.drawPolyline(points)
+
+        painter.setPen(CPU_COLOR)
+        painter.drawText(0, self.height() - 2, f"CPU (max {cpu_top:.0f}%)")
+        painter.setPen(RSS_COLOR)
+        painter.drawText(width // 2, self.height() - 2, f"Memory (max {format_bytes(rss_top)})")
+
+
+class ResourcePanel(QGroupBox):
+    def __init__(self, title="Resources", parent=None):
+        super().__init__(title, parent)
+        self.monitor = ResourceMonitor()
+        self.value_labels = {}
+
+        layout = QGridLayout(self)
+        columns = len(FIELDS) // 2
+        for position, (name, title) in enumerate(FIELDS):
+            row, column = divmod(position, columns)
+            title_label = QLabel(title)
+            title_label.setStyleSheet("color: #666;")
+            value_label = QLabel("–")
+            value_label.setStyleSheet("font-weight: bold;")
+            layout.addWidget(title_label, row * 2, column)
+            layout.addWidget(value_label, row * 2 + 1, column)
+            self.value_labels[name] = value_label
+
+        self.plot = ResourcePlot(self.monitor.history)
+        layout.addWidget(self.plot, 4, 0, 1, columns)
+
+        interval_row = QHBoxLayout()
+        interval_row.addWidget(QLabel("Sample every"))
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(1, 60)
+        self.interval_spin.setSuffix(" s")
+        self.interval_spin.setValue(DEFAULT_INTERVAL)
+        interval_row.addWidget(self.interval_spin)
+        interval_row.addStretch()
+        layout.addLayout(interval_row, 5, 0, 1, columns)
+
+        self.sample_timer = QTimer(self)
+        self.sample_timer.setInterval(DEFAULT_INTERVAL * 1000)
+        self.sample_timer.timeout.connect(self.sample)
+        self.interval_spin.valueChanged.connect(lambda seconds: self.sample_timer.setInterval(seconds * 1000))
+
+    def add_process(self, key, pid, csv_path=None):
+        """Start monitoring a process tree, saving its samples to csv_path."""
+        if not self.monitor.trees:
+            self.monitor.history.clear()
+        self.monitor.add(key, pid, csv_path)
+        self.show()
+        if not self.sample_timer.isActive():
+            self.sample_timer.start()
+        self.sample()  # Primes the CPU and rate counters
+
+    def remove_process(self, key):
+        summary = self.monitor.remove(key)
+        if not self.monitor.trees:
+            self.sample_timer.stop()
+        return summary
+
+    def sample(self):
+        row = self.monitor.sample()
+        if row is None:
+            return
+        texts = {
+            "cpu_percent": f"{row['cpu_percent']:.0f}%",
+            "rss": format_bytes(row["rss"]),
+            "read_rate": format_bytes(row["read_rate"]) + "/s",
+            "write_rate": format_bytes(row["write_rate"]) + "/s",
+            "open_files": f"{row['open_files']:,}",
+            "processes": f"{row['processes']:,}",
+            "net_sent_rate": format_bytes(row["net_sent_rate"]) + "/s",
+            "net_recv_rate": format_bytes(row["net_recv_rate"]) + "/s",
+        }
+        for name, text in texts.items():
+            self.value_labels[name].setText(text)
+        self.plot.update()
@@ -0,0 +1,86 @@
+"""Split an upload source into byte-balanced shards for parallel immich-go runs.
+
+Items are (paths, bytes) pairs: the top-level entries of a local folder as
+measured by the pre-scan, or Takeout ZIPs by file size. They are packed
+greedily, largest first, into whichever shard is currently lightest (LPT
+scheduling), which keeps every shard within the size of one item of the
+ideal share. Local items much larger than a shard are first broken up
+into their own children so that one huge subfolder does not end up as one
+huge shard.
+"""
+import heapq
+import os
+
+from prescan import FolderScanner
+
+
+MAX_SPLITS = 16  # Subfolders broken up at most, each costs a scan of that subtree
+
+
+class Shard:
+    def __init__(self, number):
+        self.number = number
+        self.paths = []
+        self.bytes = 0
+
+
+def pack(items, count):
+    """Greedy bin-packing of (paths, bytes) items into count shards."""
+    shards = [Shard(number) for number in range(count)]
+    heap = [(0, number) for number in range(count)]
+    for paths, size in sorted(items, key=lambda item: item[1], reverse=True):
+        _, number = heapq.heappop(heap)
+        shard = shards[number]
+        shard.paths.extend(paths)
+        shard.bytes += size
+        heapq.heappush(heap, (shard.bytes, number))
+    return [shard for shard in shards if shard.paths]
+
+
+def folder_items(root, top_level):
+    """(paths, bytes) items for a folder from its ScanSummary.top_level sizes.
+
+    Files directly in the root are kept together as one item.
+    """
+    items, root_files, root_bytes = [], [], 0
+    for name, size in top_level.items():
+        path = os.path.join(root, name)
+        if os.path.isdir(path):
+            items.append(([path], size))
+        else:
+            root_files.append(path)
+            root_bytes += size
+    if root_files:
+        items.append((root_files, root_bytes))
+    return items
+
+
+def split_large_items(items, count, extensions=None, cancel_event=None):
+    """Break directories bigger than total/count into their children, largest first."""
+    total = sum(size for _, size in items)
+    for _ in range(MAX_SPLITS):
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        splittable = [item for item in items if len(item[0]) == 1 and os.path.isdir(item[0][0])]
+        if not splittable or len(items) >= count * 4:
+            break
+        largest = max(splittable, key=lambda item: item[1])
+        if largest[1] <= total / count:
+            break
+        folder = largest[0][0]
+        summary = FolderScanner(folder, extensions, cancel_event=cancel_event).scan()
+        children = folder_items(folder, summary.top_level)
+        if len(children) < 2:
+            break  # A chain of single subfolders; nothing to gain
+        items.remove(largest)
+        items.extend(children)
+    return items
+
+
+def plan_folder(root, top_level, count, extensions=None, cancel_event=None):
+    items = split_large_items(folder_items(root, top_level), count, extensions, cancel_event)
+    return pack(items, count)
+
+
+def plan_archives(zip_paths, count):
+    return pack([([path], os.path.getsize(path)) for path in zip_paths], count)
@@ -0,0 +1,352 @@
+"""Pairing of Takeout media files with their JSON sidecars.
+
+Google names a sidecar after its media file but cuts long names short, adds
+".supplemental-metadata" (itself often cut short), puts the "(1)" of a
+duplicate after the extension ("IMG.jpg(1).json" or
+"IMG.jpg.supplemental-metadata(1).json" for "IMG(1).jpg") and shares one
+sidecar between a photo and its "-edited" copy. In a multi-archive Takeout
+the photo and its sidecar are often in different ZIPs.
+
+SidecarIndex is filled in one pass over the entries of all archives and
+keeps hash tables keyed by (folder, normalized name): media by name, media
+by the name their sidecar uses when they carry a duplicate suffix, media by
+name without extension and edited copies by their original. Each sidecar is
+then resolved with a few dictionary lookups; only sidecars whose name was
+truncated fall back to a prefix trie of the media left over in their folder.
+
+Run "python sidecar_matcher.py --benchmark" to time a synthetic 500k-file Takeout.
+"""
+import csv
+import posixpath
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter
+
+
+SUPPLEMENTAL_SUFFIX = ".supplemental-metadata"
+TRUNCATED_NAME_LENGTH = 46  # Sidecar names this long may have been cut short by Google
+DUPLICATE_INDEX_PATTERN = re.compile(r"^(.*)\((\d+)\)$")
+EDITED_SUFFIX = "-edited"
+METHODS = ("exact", "duplicate", "bare", "truncated", "edited")
+EXPORT_COLUMNS = ["status", "method", "media_archive", "media", "sidecar_archive", "sidecar"]
+
+
+def normalize(name):
+    """Lookup key of a file name: NFC (macOS archives use NFD) and case-insensitive."""
+    return unicodedata.normalize("NFC", name).casefold()
+
+
+def strip_supplemental(stem):
+    if stem.endswith(SUPPLEMENTAL_SUFFIX):
+        return stem[:-len(SUPPLEMENTAL_SUFFIX)]
+    # The suffix itself may be cut short when Google truncates long names
+    for length in range(len(SUPPLEMENTAL_SUFFIX) - 1, 1, -1):
+        if stem.endswith(SUPPLEMENTAL_SUFFIX[:length]):
+            return stem[:-length]
+    return stem
+
+
+def sidecar_stem(name):
+    """Media name a sidecar describes, e.g. "IMG_1.jpg.supplemental-metadata.json" -> "IMG_1.jpg".
+
+    A duplicate index stays at the end: "IMG.jpg.supplemental-metadata(1).json" -> "IMG.jpg(1)".
+    """
+    stem = name[:-len(".json")]
+    index = ""
+    match = DUPLICATE_INDEX_PATTERN.match(stem)
+    if match:
+        stem, index = match.group(1), f"({match.group(2)})"
+    if stem.endswith(SUPPLEMENTAL_SUFFIX) or len(name) >= TRUNCATED_NAME_LENGTH:
+        stem = strip_supplemental(stem)
+    return stem + index
+
+
+def sidecar_name(media):
+    """Name a sidecar has in the stem table of a media file: "IMG(1).jpg" -> "IMG.jpg(1)", else None."""
+    base, extension = posixpath.splitext(media)
+    match = DUPLICATE_INDEX_PATTERN.match(base)
+    if match is None:
+        return None
+    return f"{match.group(1)}{extension}({match.group(2)})"
+
+
+def edited_original(media):
+    """"IMG-edited.jpg" -> "IMG.jpg", or None for anything else."""
+    base, extension = posixpath.splitext(media)
+    if not base.endswith(EDITED_SUFFIX):
+        return None
+    return base[:-len(EDITED_SUFFIX)] + extension
+
+
+class PrefixTrie:
+    """Character trie over names; every node lists the values of the names below it."""
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, name, value):
+        node = self.root
+        for char in name:
+            node = node.setdefault(char, {})
+            node.setdefault(None, []).append(value)
+
+    def find(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+        return node.get(None, [])
+
+
+class SidecarPairing:
+    def __init__(self, archives):
+        self.archives = archives
+        self.pairs = []  # (media archive, media path, sidecar archive, sidecar path, method)
+        self.orphans = []  # (archive, path) of sidecars without media
+        self.missing = []  # (archive, path) of media without sidecar
+        self.methods = Counter()
+        self.elapsed = 0.0
+
+    def orphan_paths(self):
+        return sorted(path for _, path in self.orphans)
+
+    def missing_paths(self):
+        return sorted(path for _, path in self.missing)
+
+    def rows(self):
+        for media_archive, media, sidecar_archive, sidecar, method in self.pairs:
+            yield ["matched", method, media_archive, media, sidecar_archive, sidecar]
+        for archive, media in sorted(self.missing, key=lambda item: item[1]):
+            yield ["no sidecar", "", archive, media, "", ""]
+        for archive, sidecar in sorted(self.orphans, key=lambda item: item[1]):
+            yield ["no media", "", "", "", archive, sidecar]
+
+    def export_csv(self, path):
+        """Write every pair and unmatched file to a CSV file for review; returns the row count."""
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_COLUMNS)
+            for row in self.rows():
+                writer.writerow(row)
+                count += 1
+        return count
+
+
+class SidecarIndex:
+    """Media and sidecars of all archives of a Takeout, indexed for pairing."""
+
+    def __init__(self):
+        self.archives = []
+        self.media = []  # (archive number, folder, name)
+        self.sidecars = []  # (archive number, folder, name)
+        self.keys = []  # Normalized name of each media file
+        self.by_name = {}  # (folder, name) -> media number
+        self.by_sidecar_name = {}  # (folder, "IMG.jpg(1)") -> media number of "IMG(1).jpg"
+        self.by_bare_name = {}  # (folder, name without extension) -> media numbers
+        self.edited = {}  # (folder, original name) -> media numbers of edited copies
+        self.folders = {}  # folder -> media numbers
+
+    def add_archive(self, archive):
+        self.archives.append(archive)
+        return len(self.archives) - 1
+
+    def add_media(self, archive, folder, name):
+        number = len(self.media)
+        self.media.append((archive, folder, name))
+        key = normalize(name)
+        self.keys.append(key)
+        self.by_name.setdefault((folder, key), number)
+        duplicate = sidecar_name(key)
+        if duplicate is not None:
+            self.by_sidecar_name.setdefault((folder, duplicate), number)
+        self.by_bare_name.setdefault((folder, posixpath.splitext(key)[0]), []).append(number)
+        original = edited_original(key)
+        if original is not None:
+            self.edited.setdefault((folder, original), []).append(number)
+        self.folders.setdefault(folder, []).append(number)
+
+    def add_sidecar(self, archive, folder, name):
+        self.sidecars.append((archive, folder, name))
+
+    def add_entries(self, archive, names):
+        """Index the media and sidecars of one archive, given (folder, name, is media) tuples."""
+        number = self.add_archive(archive)
+        for folder, name, is_media in names:
+            if is_media:
+                self.add_media(number, folder, name)
+            else:
+                self.add_sidecar(number, folder, name)
+
+    def lookup(self, folder, stem):
+        """(media numbers, method) for a sidecar stem, or (None, None)."""
+        number = self.by_name.get((folder, stem))
+        if number is not None:
+            return [number], "exact"
+        number = self.by_sidecar_name.get((folder, stem))
+        if number is not None:
+            return [number], "duplicate"
+        numbers = self.by_bare_name.get((folder, stem))
+        if numbers:
+            return numbers, "bare"
+        return None, None
+
+    def match(self):
+        """Pair every sidecar with its media; returns a SidecarPairing."""
+        started = time.monotonic()
+        pairing = SidecarPairing(self.archives)
+        matched = {}  # media number -> sidecar number
+        truncated = {}  # folder -> [(sidecar number, stem)] still to resolve by prefix
+
+        def pair(numbers, sidecar, method):
+            for number in numbers:
+                if number in matched:
+                    continue
+                matched[number] = sidecar
+                pairing.pairs.append(self.pair_row(number, sidecar, method))
+                pairing.methods[method] += 1
+                # Edited copies share the original's sidecar
+                for edited in self.edited.get((self.media[number][1], self.keys[number]), ()):
+                    if edited not in matched:
+                        matched[edited] = sidecar
+                        pairing.pairs.append(self.pair_row(edited, sidecar, "edited"))
+                        pairing.methods["edited"] += 1
+
+        for sidecar, (_, folder, name) in enumerate(self.sidecars):
+            stem = normalize(sidecar_stem(name))
+            numbers, method = self.lookup(folder, stem)
+            if numbers is not None:
+                pair(numbers, sidecar, method)
+            elif len(name) >= TRUNCATED_NAME_LENGTH:
+                truncated.setdefault(folder, []).append((sidecar, stem))
+            else:
+                pairing.orphans.append(self.path_of(self.sidecars[sidecar]))
+
+        # Truncated names: the sidecar stem is a prefix of a media name left over in its folder
+        for folder, sidecars in truncated.items():
+            # Only the first characters of longer names can ever be compared with a stem
+            shortest = min(len(stem) for _, stem in sidecars)
+            longest = max(len(stem) for _, stem in sidecars)
+            trie = PrefixTrie()
+            for number in self.folders.get(folder, ()):
+                key = self.keys[number]
+                if number not in matched and len(key) > shortest:
+                    trie.add(key[:longest], number)
+            for sidecar, stem in sidecars:
+                numbers = [number for number in trie.find(stem) if number not in matched]
+                if numbers:
+                    pair(numbers, sidecar, "truncated")
+                else:
+                    pairing.orphans.append(self.path_of(self.sidecars[sidecar]))
+
+        for number, entry in enumerate(self.media):
+            if number not in matched and edited_original(entry[2]) is None:
+                pairing.missing.append(self.path_of(entry))
+        pairing.elapsed = time.monotonic() - started
+        return pairing
+
+    def path_of(self, entry):
+        archive, folder, name = entry
+        return self.archives[archive], f"{folder}/{name}" if folder else name
+
+    def pair_row(self, media, sidecar, method):
+        return self.path_of(self.media[media]) + self.path_of(self.sidecars[sidecar]) + (method,)
+
+
+def synthetic_takeout(files=500000, archives=50, seed=1):
+    """Directory listings of a made-up multi-archive Takeout; returns ([(archive, entries)], expected pairs).
+
+    Media and sidecars are spread over the archives at random, with the name
+    quirks Google produces: partly or fully truncated supplemental suffixes,
+    truncated long names, duplicate indexes, edited copies, extension-less
+    sidecars and a few files without a partner.
+    """
+    import random
+
+    rng = random.Random(seed)
+    names = []
+    expected = 0
+    number = 0
+    while len(names) < files:
+        folder = f"Takeout/Google Photos/Photos from {2000 + number // 5000 % 25}"
+        if number % 7 == 0:
+            folder = f"Takeout/Google Photos/Album {number // 2000}"
+        kind = rng.random()
+        if kind < 0.05:
+            media = f"Screenshot_{number:08d}_com.example.some_long_application_name.png"
+        elif kind < 0.30:
+            media = f"PXL_{20200101 + number % 1000}_{number:09d}.jpg"
+        else:
+            media = f"IMG_{number:07d}.jpg"
+        if kind > 0.97:
+            base, extension = posixpath.splitext(media)
+            media = f"{base}(1){extension}"
+            sidecar = f"{base}{extension}{SUPPLEMENTAL_SUFFIX}(1).json"
+        elif kind > 0.95:
+            sidecar = posixpath.splitext(media)[0] + ".json"
+        else:
+            sidecar = (media + SUPPLEMENTAL_SUFFIX)[:TRUNCATED_NAME_LENGTH] + ".json"
+        names.append((folder, media, True))
+        if rng.random() >= 0.01:  # The rest have no sidecar
+            names.append((folder, sidecar, False))
+            expected += 1
+            if kind < 0.10:
+                base, extension = posixpath.splitext(media)
+                names.append((folder, f"{base}{EDITED_SUFFIX}{extension}", True))
+                expected += 1
+        if rng.random() < 0.002:
+            names.append((folder, f"lost_{number}.jpg{SUPPLEMENTAL_SUFFIX}.json", False))
+        number += 1
+    rng.shuffle(names)
+    listings = [[] for _ in range(archives)]
+    for position, entry in enumerate(names):
+        listings[position % archives].append(entry)
+    return [(f"takeout-{position + 1:03d}.zip", listing) for position, listing in enumerate(listings)], expected
+
+
+def benchmark(files=500000, archives=50):
+    """Index and match a synthetic Takeout; returns timings and the match accuracy."""
+    listings, expected = synthetic_takeout(files, archives)
+    started = time.perf_counter()
+    index = SidecarIndex()
+    for archive, names in listings:
+        index.add_entries(archive, names)
+    indexed = time.perf_counter() - started
+    pairing = index.match()
+    total = time.perf_counter() - started
+    return {
+        "files": sum(len(names) for _, names in listings),
+        "archives": archives,
+        "media": len(index.media),
+        "sidecars": len(index.sidecars),
+        "index_seconds": round(indexed, 3),
+        "match_seconds": round(pairing.elapsed, 3),
+        "files_per_s": round(sum(len(names) for _, names in listings) / total),
+        "pairs": len(pairing.pairs),
+        "expected_pairs": expected,
+        "methods": dict(pairing.methods),
+        "missing": len(pairing.missing),
+        "orphans": len(pairing.orphans),
+    }
+
+
+if __name__ == "__main__":
+    if "--benchmark" not in sys.argv:
+        print("Usage: python sidecar_matcher.py --benchmark [--files=N] [--archives=N]")
+        sys.exit(1)
+    options = {"files": 500000, "archives": 50}
+    for arg in sys.argv[1:]:
+        for name in options:
+            prefix = "--" + name + "="
+            if arg.startswith(prefix):
+                options[name] = int(arg[len(prefix):].replace("_", ""))
+    results = benchmark(**options)
+    print(f"Matched {results['media']:,} media and {results['sidecars']:,} sidecars from "
+          f"{results['archives']} archives: index {results['index_seconds']} s, "
+          f"match {results['match_seconds']} s ({results['files_per_s']:,} files/s)")
+    print(f"{results['pairs']:,} pairs of {results['expected_pairs']:,} expected "
+          f"({', '.join(f'{method} {count:,}' for method, count in results['methods'].items())}), "
+          f"{results['missing']:,} media without sidecar, {results['orphans']:,} sidecars without media")
@@ -0,0 +1,76 @@
+"""Startup timing for ``app.py --profile-startup``.
+
+Construction phases are always recorded (the cost is a perf_counter call per
+phase); the import breakdown is only gathered when a report is written,
+by re-importing the app in a child interpreter with ``-X importtime``.
+"""
+import time
+from contextlib import contextmanager
+
+
+PHASES = []  # (name, milliseconds) in the order they finished
+
+
+def record_phase(name, started):
+    """Record a phase that began at the perf_counter value started and ends now."""
+    PHASES.append((name, (time.perf_counter() - started) * 1000))
+
+
+@contextmanager
+def startup_phase(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, started)
+
+
+def import_breakdown(module="app", limit=30):
+    """Return the slowest imports of module as dicts sorted by cumulative time (ms)."""
+    import os
+    import subprocess
+    import sys
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen")),
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        imports.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    imports.sort(key=lambda entry: entry["cumulative_ms"], reverse=True)
+    return imports[:limit]
+
+
+def write_report(path, startup_time, first_paint_ms):
+    """Write the import and construction breakdown of this startup as JSON to path."""
+    import json
+    import platform
+    import sys
+
+    import PySide6
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pyside6": PySide6.__version__,
+        "platform": sys.platform,
+        "first_paint_ms": first_paint_ms,
+        "phases_ms": [{"phase": name, "ms": round(ms, 2)} for name, ms in PHASES],
+        "imports": import_breakdown(),
+        "total_ms": (time.perf_counter() - startup_time) * 1000,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
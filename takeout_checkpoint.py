@@ -0,0 +1,167 @@
+"""Checkpointed uploads of large Takeout ZIP sets.
+
+The archives of a set are uploaded in groups of a few ZIPs, one queued job
+per group, so immich-go only ever holds one group in memory and a crash
+late in a 50-ZIP Takeout costs at most the group that was running. A
+journal next to the job queue records the state of every archive: it is
+done when its group's run exits normally, or as soon as the run's output
+has reported every media file in it as uploaded or already on the server.
+A group (re-)started later only gets the archives that are not done yet.
+The journal is saved after every change, so progress survives a crash or a
+restart of the app.
+"""
+import json
+import os
+import posixpath
+import time
+import uuid
+
+from progress import KEY_VALUE_PATTERN
+from takeout_inspector import MEDIA_EXTENSIONS, read_central_directory
+
+
+PENDING = "pending"
+DONE = "done"
+DEFAULT_GROUP_SIZE = 5
+MAX_ATTEMPTS = 3  # Runs per archive before a failing group is left for the user to retry
+PROCESSED_WORDS = ("uploaded", "duplicate", "same asset", "better asset", "already")
+
+
+def count_media(path):
+    """Media files in a Takeout ZIP, from its central directory."""
+    return sum(1 for name, _, _, _ in read_central_directory(path)
+               if posixpath.splitext(name.lower())[1] in MEDIA_EXTENSIONS)
+
+
+def make_groups(archives, size):
+    """Consecutive groups of at most size archives."""
+    return [archives[start:start + size] for start in range(0, len(archives), max(1, size))]
+
+
+class TakeoutJournal:
+    def __init__(self, path):
+        self.path = path
+        self.sets = {}  # set id -> {"name", "created", "archives": {path: {"state", "media", "attempts"}}}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.sets = json.load(f).get("sets", {})
+        except (OSError, ValueError, AttributeError):
+            self.sets = {}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"sets": self.sets}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def create(self, name, media_counts):
+        """Start a journal for archives (path -> media files); returns the set id."""
+        set_id = uuid.uuid4().hex[:8]
+        self.sets[set_id] = {
+            "name": name,
+            "created": time.time(),
+            "archives": {path: {"state": PENDING, "media": media, "attempts": 0}
+                         for path, media in media_counts.items()},
+        }
+        self.save()
+        return set_id
+
+    def archive(self, set_id, path):
+        return self.sets.get(set_id, {}).get("archives", {}).get(path)
+
+    def remaining(self, set_id, archives):
+        """Archives of a group not done yet; unknown sets and archives count as remaining."""
+        return [path for path in archives if (self.archive(set_id, path) or {}).get("state") != DONE]
+
+    def media_counts(self, set_id, archives):
+        return {path: (self.archive(set_id, path) or {}).get("media") for path in archives}
+
+    def start_attempt(self, set_id, archives):
+        for path in archives:
+            entry = self.archive(set_id, path)
+            if entry is not None:
+                entry["attempts"] += 1
+        self.save()
+
+    def exhausted(self, set_id, archives):
+        """True once any archive of the group has had MAX_ATTEMPTS runs."""
+        return any((self.archive(set_id, path) or {}).get("attempts", 0) >= MAX_ATTEMPTS for path in archives)
+
+    def mark_done(self, set_id, archives):
+        changed = False
+        for path in archives:
+            entry = self.archive(set_id, path)
+            if entry is not None and entry["state"] != DONE:
+                entry["state"] = DONE
+                entry["finished"] = time.time()
+                changed = True
+        if changed:
+            self.save()
+
+    def progress(self, set_id):
+        """(archives done, archives) of a set."""
+        archives = self.sets.get(set_id, {}).get("archives", {})
+        return sum(1 for entry in archives.values() if entry["state"] == DONE), len(archives)
+
+    def latest(self):
+        """Id of the most recently created set, or None."""
+        if not self.sets:
+            return None
+        return max(self.sets, key=lambda set_id: self.sets[set_id].get("created", 0))
+
+
+class ArchiveTracker:
+    """Works out from immich-go's output which archives of a run are fully processed.
+
+    An archive is complete once as many distinct media files from it have
+    been reported uploaded or already on the server as it holds. Only
+    events naming a media file in their file field count; archives without
+    a known media count only complete with their run.
+    """
+
+    def __init__(self, media_counts):
+        self.media = {path: media for path, media in media_counts.items() if media}
+        self.names = {os.path.basename(path): path for path in self.media}
+        self.processed = {path: set() for path in self.media}
+        self.complete = set()
+
+    def feed(self, line):
+        """Returns the archive this line completed, or None."""
+        if ".zip" not in line or not self.names:
+            return None
+        lower = line.lower()
+        if "error" in lower or not any(word in lower for word in PROCESSED_WORDS):
+            return None
+        file = self.file_of(line)
+        if file is None or posixpath.splitext(file.lower())[1] not in MEDIA_EXTENSIONS:
+            return None
+        names = [name for name in self.names if name in file]
+        if not names:
+            return None
+        path = self.names[max(names, key=len)]  # "takeout-1.zip" is also in "old-takeout-1.zip"
+        if path in self.complete:
+            return None
+        self.processed[path].add(file)
+        if len(self.processed[path]) < self.media[path]:
+            return None
+        self.complete.add(path)
+        self.processed[path] = set()
+        return path
+
+    @staticmethod
+    def file_of(line):
+        """The file field of a JSON or key=value event, or None."""
+        if line.startswith("{"):
+            try:
+                file = json.loads(line).get("file")
+            except (ValueError, AttributeError):
+                return None
+            return str(file) if file else None
+        for key, value in KEY_VALUE_PATTERN.findall(line):
+            if key == "file":
+                return value.strip('"') or None
+        return None
@@ -0,0 +1,199 @@
+"""Inventory of Google Takeout archives without extracting them.
+
+Each ZIP's central directory is read straight from a memory map: the end of
+central directory record is located in the archive's tail and the entry
+headers are decoded in place, so only the few megabytes of directory at the
+end of each (possibly 50 GB) archive are touched. Archives are read in
+parallel and merged before sidecars are paired (see sidecar_matcher), since
+a photo and its JSON sidecar may sit in different parts of a multi-archive
+Takeout.
+"""
+import mmap
+import os
+import posixpath
+import re
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sidecar_matcher import SidecarIndex
+
+
+DEFAULT_WORKERS = 8
+
+EOCD_SIGNATURE = b"PK\x05\x06"
+EOCD64_LOCATOR_SIGNATURE = b"PK\x06\x07"
+EOCD64_SIGNATURE = b"PK\x06\x06"
+CENTRAL_HEADER_SIGNATURE = b"PK\x01\x02"
+EOCD = struct.Struct("<4s4H2LH")
+EOCD64_LOCATOR = struct.Struct("<4sLQL")
+EOCD64 = struct.Struct("<4sQ2H2L4Q")
+CENTRAL_HEADER = struct.Struct("<4s6H3L5H2L")
+MAX_EOCD_SEARCH = EOCD.size + 0xFFFF  # Record plus the longest possible archive comment
+ZIP64_EXTRA_ID = 0x0001
+UTF8_FLAG = 0x800
+
+MEDIA_EXTENSIONS = {
+    ".jpg", ".jpeg", ".png", ".gif", ".heic", ".heif", ".webp", ".bmp", ".tif", ".tiff", ".avif",
+    ".dng", ".cr2", ".cr3", ".nef", ".arw", ".orf", ".rw2", ".raf",
+    ".mp4", ".mov", ".m4v", ".avi", ".3gp", ".mkv", ".mts", ".m2ts", ".mpg", ".mpeg", ".wmv", ".webm",
+}
+# JSON files that describe a folder or the account rather than one photo
+NON_SIDECAR_JSON = {
+    "metadata.json", "print-subscriptions.json", "shared_album_comments.json",
+    "user-generated-memory-titles.json",
+}
+YEAR_FOLDER_PATTERN = re.compile(r"^Photos from \d{4}$")
+
+
+class InspectError(Exception):
+    pass
+
+
+def read_central_directory(path):
+    """Return [(name, size, compressed size, crc)] for every entry of a ZIP archive."""
+    with open(path, "rb") as f:
+        try:
+            view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise InspectError("empty file")
+    with view:
+        eocd = view.rfind(EOCD_SIGNATURE, max(0, len(view) - MAX_EOCD_SEARCH))
+        if eocd < 0:
+            raise InspectError("not a ZIP archive")
+        _, _, _, _, count, directory_size, directory_offset, _ = EOCD.unpack_from(view, eocd)
+
+        if count == 0xFFFF or 0xFFFFFFFF in (directory_size, directory_offset):
+            locator = eocd - EOCD64_LOCATOR.size
+            if locator < 0 or view[locator:locator + 4] != EOCD64_LOCATOR_SIGNATURE:
+                raise InspectError("ZIP64 locator missing")
+            eocd64 = EOCD64_LOCATOR.unpack_from(view, locator)[2]
+            fields = EOCD64.unpack_from(view, eocd64)
+            if fields[0] != EOCD64_SIGNATURE:
+                raise InspectError("ZIP64 end of central directory missing")
+            count, directory_size, directory_offset = fields[7], fields[8], fields[9]
+
+        entries = []
+        position = directory_offset
+        for _ in range(count):
+            header = CENTRAL_HEADER.unpack_from(view, position)
+            if header[0] != CENTRAL_HEADER_SIGNATURE:
+                raise InspectError(f"bad central directory entry at offset {position}")
+            flags, crc, compressed, size = header[3], header[7], header[8], header[9]
+            name_length, extra_length, comment_length = header[10], header[11], header[12]
+            start = position + CENTRAL_HEADER.size
+            raw_name = view[start:start + name_length]
+            name = raw_name.decode("utf-8" if flags & UTF8_FLAG else "cp437", errors="replace")
+            if size == 0xFFFFFFFF or compressed == 0xFFFFFFFF:
+                size, compressed = zip64_sizes(view, start + name_length, extra_length, size, compressed)
+            entries.append((name, size, compressed, crc))
+            position = start + name_length + extra_length + comment_length
+    return entries
+
+
+def zip64_sizes(view, start, length, size, compressed):
+    """Real sizes from the ZIP64 extra field of an entry whose sizes overflow 32 bits."""
+    end = start + length
+    while start + 4 <= end:
+        header_id, data_length = struct.unpack_from("<2H", view, start)
+        if header_id == ZIP64_EXTRA_ID:
+            position = start + 4
+            if size == 0xFFFFFFFF:
+                size = struct.unpack_from("<Q", view, position)[0]
+                position += 8
+            if compressed == 0xFFFFFFFF:
+                compressed = struct.unpack_from("<Q", view, position)[0]
+            break
+        start += 4 + data_length
+    return size, compressed
+
+
+def read_folder(root):
+    """Same entries as read_central_directory for an extracted Takeout folder."""
+    entries = []
+    for folder, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(folder, name)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            relative = os.path.relpath(path, root).replace(os.sep, "/")
+            entries.append((relative, size, size, None))
+    return entries
+
+
+class TakeoutInventory:
+    def __init__(self):
+        self.archives = 0
+        self.entries = 0
+        self.media = 0
+        self.media_bytes = 0
+        self.compressed_bytes = 0
+        self.sidecars = 0
+        self.other = 0
+        self.albums = {}  # album folder name -> media files
+        self.year_folders = 0
+        self.orphan_sidecars = []  # JSON sidecars without their media
+        self.missing_sidecars = []  # Media without a JSON sidecar
+        self.pairing = None  # SidecarPairing of every media file and sidecar
+        self.errors = []  # (archive, message)
+        self.elapsed = 0.0
+
+
+def build_inventory(archive_entries):
+    """Merge (archive, entries) pairs into a TakeoutInventory, pairing sidecars across archives."""
+    inventory = TakeoutInventory()
+    index = SidecarIndex()
+    folders = set()
+    for archive, entries in archive_entries:
+        inventory.archives += 1
+        inventory.entries += len(entries)
+        number = index.add_archive(archive)
+        for name, size, compressed, _ in entries:
+            if name.endswith("/"):
+                continue
+            folder, base = posixpath.split(name)
+            lower = base.lower()
+            extension = posixpath.splitext(lower)[1]
+            inventory.compressed_bytes += compressed
+            if extension in MEDIA_EXTENSIONS:
+                inventory.media += 1
+                inventory.media_bytes += size
+                index.add_media(number, folder, base)
+                folders.add(folder)
+                album = posixpath.basename(folder)
+                if YEAR_FOLDER_PATTERN.match(album) is None:
+                    inventory.albums[album] = inventory.albums.get(album, 0) + 1
+            elif extension == ".json" and lower not in NON_SIDECAR_JSON:
+                inventory.sidecars += 1
+                index.add_sidecar(number, folder, base)
+                folders.add(folder)
+            else:
+                inventory.other += 1
+    inventory.year_folders = sum(
+        1 for folder in folders if YEAR_FOLDER_PATTERN.match(posixpath.basename(folder)))
+    inventory.pairing = index.match()
+    inventory.orphan_sidecars = inventory.pairing.orphan_paths()
+    inventory.missing_sidecars = inventory.pairing.missing_paths()
+    return inventory
+
+
+def inspect_takeout(sources, workers=DEFAULT_WORKERS):
+    """Inventory ZIP archives and/or extracted folders, reading archives in parallel."""
+    started = time.monotonic()
+
+    def read(source):
+        try:
+            if os.path.isdir(source):
+                return source, read_folder(source), None
+            return source, read_central_directory(source), None
+        except (OSError, InspectError, struct.error) as e:
+            return source, [], str(e)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(read, sources))
+    inventory = build_inventory([(source, entries) for source, entries, error in results if error is None])
+    inventory.errors = [(source, error) for source, _, error in results if error is not None]
+    inventory.elapsed = time.monotonic() - started
+    return inventory
@@ -0,0 +1,97 @@
+"""Time-of-day throttling for immich-go runs.
+
+During the daytime window uploads are limited to the daytime rate and
+immich-go runs at the daytime priority; outside it the night settings
+apply. A window whose end is before its start runs over midnight. Rates
+are in Mbit/s with 0 meaning unlimited; the rate itself is enforced by the
+token bucket of local_proxy. Priority classes lower CPU priority (nice)
+and, where the platform has it, disk I/O priority (ionice).
+"""
+import datetime
+import sys
+
+
+PRIORITIES = ("normal", "low", "idle")
+
+# attribute -> (settings key, default)
+FIELDS = {
+    "enabled": ("throttle_enabled", False),
+    "day_start": ("throttle_day_start", "08:00"),
+    "day_end": ("throttle_day_end", "18:00"),
+    "day_mbps": ("throttle_day_mbps", 10.0),
+    "night_mbps": ("throttle_night_mbps", 0.0),
+    "day_priority": ("throttle_day_priority", "low"),
+    "night_priority": ("throttle_night_priority", "normal"),
+}
+
+
+def parse_time(text):
+    hours, minutes = text.split(":")
+    return datetime.time(int(hours), int(minutes))
+
+
+class ThrottleSchedule:
+    def __init__(self, **values):
+        for name, (_, default) in FIELDS.items():
+            setattr(self, name, values.pop(name, default))
+        if values:
+            raise TypeError(f"Unknown setting: {', '.join(values)}")
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(**{name: settings.value(key, default, type=type(default))
+                      for name, (key, default) in FIELDS.items()})
+
+    def to_settings(self, settings):
+        for name, (key, _) in FIELDS.items():
+            settings.setValue(key, getattr(self, name))
+
+    def is_daytime(self, now=None):
+        now = (now or datetime.datetime.now()).time()
+        start, end = parse_time(self.day_start), parse_time(self.day_end)
+        if start <= end:
+            return start <= now < end
+        return now >= start or now < end
+
+    def current(self, now=None):
+        """(upload Mbit/s, priority) in effect now; unlimited and normal when disabled."""
+        if not self.enabled:
+            return 0.0, "normal"
+        if self.is_daytime(now):
+            return self.day_mbps, self.day_priority
+        return self.night_mbps, self.night_priority
+
+    def describe(self, now=None):
+        mbps, priority = self.current(now)
+        if not self.enabled:
+            return "Throttling off"
+        period = "daytime" if self.is_daytime(now) else "night"
+        limit = f"{mbps:g} Mbit/s" if mbps else "unlimited"
+        return f"Now ({period}): upload {limit}, {priority} priority"
+
+
+def apply_priority(pid, priority):
+    """Set the CPU and disk priority class of a process; failures are reported, not raised.
+
+    Raising priority back to normal usually needs administrator rights, so a
+    schedule switching from low to normal only affects new runs in that case.
+    """
+    # Deferred import: psutil is only needed once a run's priority changes
+    import psutil
+
+    try:
+        process = psutil.Process(pid)
+        if sys.platform.startswith("win"):
+            process.nice({"normal": psutil.NORMAL_PRIORITY_CLASS, "low": psutil.BELOW_NORMAL_PRIORITY_CLASS,
+                          "idle": psutil.IDLE_PRIORITY_CLASS}[priority])
+            process.ionice({"normal": psutil.IOPRIO_NORMAL, "low": psutil.IOPRIO_LOW,
+                            "idle": psutil.IOPRIO_VERYLOW}[priority])
+        else:
+            process.nice({"normal": 0, "low": 10, "idle": 19}[priority])
+            if hasattr(process, "ionice"):  # Linux
+                if priority == "idle":
+                    process.ionice(psutil.IOPRIO_CLASS_IDLE)
+                else:
+                    process.ionice(psutil.IOPRIO_CLASS_BE, 7 if priority == "low" else 4)
+    except (psutil.Error, OSError) as e:
+        print(f"Cannot set {priority} priority for process {pid}: {e}")
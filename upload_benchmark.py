@@ -0,0 +1,357 @@
+"""End-to-end upload benchmark against the local mock Immich server.
+
+    python upload_benchmark.py --files 10000,100000 [--file-kb 16] [--latency-ms 5]
+                               [--bandwidth-mbps 0] [--throttle-mbps 0] [--cache-ttl 0] [--priority normal]
+                               [--output report.json] [--compare old.json]
+
+For every tree size a synthetic photo tree is generated (and reused on later
+runs), the mock server is started in its own process and immich-go is run
+with the same argv the Local Upload tab would build. CPU time and peak RSS
+of immich-go and of the server are measured with psutil (and wait4 where
+available). Reports are JSON
+with one result per tree size, so runs on different machines, immich-go
+versions or settings can be compared with --compare. --throttle-mbps and
+--priority run immich-go the way the GUI's throttling does: through the
+rate-limited local proxy and at a lower priority class. --cache-ttl puts
+the proxy's metadata cache in front of the server.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import socket
+import struct
+import subprocess
+import sys
+import time
+import urllib.request
+
+import psutil
+
+from config_model import UploadConfig, build_command, default_binary_path
+from local_proxy import LocalProxy, TokenBucket, mbps_to_bytes
+from progress import format_bytes
+from throttle import PRIORITIES, apply_priority
+
+
+REPORT_VERSION = 1
+FILES_PER_DIR = 1000
+SAMPLE_INTERVAL = 0.5
+POLL_INTERVAL = 0.02  # Keeps the measured run time accurate
+SERVER_START_TIMEOUT = 10.0
+TREE_MANIFEST = ".benchmark-tree.json"
+COMPARED_METRICS = ("files_per_s", "mb_per_s", "cpu_seconds", "peak_rss", "server_cpu_seconds", "elapsed")
+
+
+def exif_segment(taken):
+    """APP1 segment with a minimal EXIF block holding DateTimeOriginal."""
+    date = taken.strftime("%Y:%m:%d %H:%M:%S").encode() + b"\x00"
+    # TIFF header, IFD0 with one entry (pointer to the Exif IFD), Exif IFD with DateTimeOriginal
+    tiff = b"II*\x00" + struct.pack("<L", 8)
+    tiff += struct.pack("<H", 1) + struct.pack("<HHLL", 0x8769, 4, 1, 26) + struct.pack("<L", 0)
+    tiff += struct.pack("<H", 1) + struct.pack("<HHLL", 0x9003, 2, len(date), 44) + struct.pack("<L", 0)
+    tiff += date
+    payload = b"Exif\x00\x00" + tiff
+    return b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload
+
+
+def synthetic_jpeg(taken, size, rng):
+    """JPEG-shaped bytes of about size bytes: EXIF date plus unique filler, no image data."""
+    head = b"\xff\xd8" + exif_segment(taken)
+    filler = max(0, size - len(head) - 6)
+    parts = [head]
+    while filler > 0:
+        chunk = min(filler, 65533)
+        parts.append(b"\xff\xfe" + struct.pack(">H", chunk + 2) + rng.randbytes(chunk))
+        filler -= chunk + 4
+    parts.append(b"\xff\xd9")
+    return b"".join(parts)
+
+
+def generate_tree(root, files, file_size, seed=1):
+    """Create (or reuse) a tree of files photos in year/month folders; returns its total bytes."""
+    manifest_path = os.path.join(root, TREE_MANIFEST)
+    wanted = {"files": files, "file_size": file_size, "seed": seed}
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if {key: manifest.get(key) for key in wanted} == wanted:
+            return manifest["bytes"]
+    except (OSError, ValueError):
+        pass
+
+    rng = random.Random(seed)
+    start = datetime.datetime(2010, 1, 1)
+    span = (datetime.datetime(2024, 12, 31) - start).total_seconds()
+    total = 0
+    for number in range(files):
+        # Spread the dates evenly so every folder gets about FILES_PER_DIR files
+        taken = start + datetime.timedelta(seconds=span * number / files)
+        folder = os.path.join(root, f"{taken.year}", f"{taken.month:02d}", f"{number // FILES_PER_DIR:04d}")
+        if number % FILES_PER_DIR == 0 or not os.path.isdir(folder):
+            os.makedirs(folder, exist_ok=True)
+        size = max(256, int(file_size * rng.uniform(0.5, 1.5)))
+        data = synthetic_jpeg(taken, size, rng)
+        with open(os.path.join(folder, f"IMG_{taken:%Y%m%d_%H%M%S}_{number:07d}.jpg"), "wb") as f:
+            f.write(data)
+        total += len(data)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(dict(wanted, bytes=total), f)
+    return total
+
+
+def start_server(latency_ms, bandwidth_mbps):
+    """Run mock_immich in its own process, so its CPU use is measured separately."""
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_immich.py")
+    port = free_port()
+    process = subprocess.Popen([sys.executable, script, "--port", str(port), "--latency-ms", str(latency_ms),
+                                "--bandwidth-mbps", str(bandwidth_mbps)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            server_request(url, "/api/server/ping")
+            return process, url
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Mock server did not start")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_request(url, path, method="GET"):
+    request = urllib.request.Request(url + path, method=method, data=b"" if method == "POST" else None)
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.load(response)
+
+
+def process_usage(process):
+    """(cpu_seconds, rss) of a process and its children; zeros once it has exited."""
+    try:
+        processes = [process] + process.children(recursive=True)
+    except psutil.Error:
+        return 0.0, 0
+    cpu = rss = 0
+    for member in processes:
+        try:
+            times = member.cpu_times()
+            cpu += times.user + times.system
+            rss += member.memory_info().rss
+        except psutil.Error:
+            continue
+    return cpu, rss
+
+
+def wait_sampled(process, sample):
+    """Wait for process, calling sample() every SAMPLE_INTERVAL; returns its resource usage if known.
+
+    On POSIX the child is reaped with wait4, which reports its exact CPU time
+    and peak RSS; elsewhere the psutil samples are all there is.
+    """
+    next_sample = 0.0
+    while True:
+        now = time.monotonic()
+        if now >= next_sample:
+            sample()
+            next_sample = now + SAMPLE_INTERVAL
+        if hasattr(os, "wait4"):
+            pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+            if pid:
+                process.returncode = os.waitstatus_to_exitcode(status)
+                return usage
+        elif process.poll() is not None:
+            return None
+        time.sleep(POLL_INTERVAL)
+
+
+def run_upload(command, server_process, log_path=None, priority="normal"):
+    """Run immich-go to completion, sampling it and the server; returns the measurements."""
+    server = psutil.Process(server_process.pid)
+    server_cpu_start, _ = process_usage(server)
+    measured = {"cpu": 0.0, "rss": 0, "server_cpu": 0.0, "server_rss": 0}
+
+    log = open(log_path, "w", encoding="utf-8") if log_path else subprocess.DEVNULL
+    started = time.monotonic()
+    try:
+        process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+        if priority != "normal":
+            apply_priority(process.pid, priority)
+        watched = psutil.Process(process.pid)
+
+        def sample():
+            cpu, rss = process_usage(watched)
+            measured["cpu"] = max(measured["cpu"], cpu)
+            measured["rss"] = max(measured["rss"], rss)
+            cpu, rss = process_usage(server)
+            measured["server_cpu"] = max(measured["server_cpu"], cpu - server_cpu_start)
+            measured["server_rss"] = max(measured["server_rss"], rss)
+
+        usage = wait_sampled(process, sample)
+        elapsed = time.monotonic() - started
+    finally:
+        if log_path:
+            log.close()
+    sample()  # Server time up to the end of the run
+    if usage is not None:
+        measured["cpu"] = usage.ru_utime + usage.ru_stime
+        # ru_maxrss is in bytes on macOS and in KiB elsewhere
+        measured["rss"] = max(measured["rss"], usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024))
+    return {
+        "exit_code": process.returncode,
+        "elapsed": elapsed,
+        "cpu_seconds": measured["cpu"],
+        "peak_rss": measured["rss"],
+        "server_cpu_seconds": measured["server_cpu"],
+        "server_peak_rss": measured["server_rss"],
+    }
+
+
+def binary_version(binary):
+    try:
+        result = subprocess.run([binary, "version"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    lines = (result.stdout or result.stderr).strip().splitlines()
+    return lines[0] if result.returncode == 0 and lines else None
+
+
+def benchmark(files, file_kb, tree_root, binary, latency_ms=0, bandwidth_mbps=0, extra_args=(), log_dir=None,
+              throttle_mbps=0, priority="normal", cache_ttl=0):
+    """Generate the tree, run one upload against a fresh mock server and return its result."""
+    tree = os.path.join(tree_root, f"tree-{files}-{file_kb}k")
+    print(f"Preparing {files:,} files in {tree}...", file=sys.stderr, flush=True)
+    generate_started = time.monotonic()
+    tree_bytes = generate_tree(tree, files, file_kb * 1024)
+    generate_seconds = time.monotonic() - generate_started
+
+    server_process, url = start_server(latency_ms, bandwidth_mbps)
+    proxy = None
+    try:
+        if throttle_mbps or cache_ttl:
+            proxy = LocalProxy(url, upload_bucket=TokenBucket(mbps_to_bytes(throttle_mbps)),
+                               cache_ttl=cache_ttl).start()
+        # The same argv the Local Upload tab builds for run_command
+        config = UploadConfig(server_url=proxy.url if proxy else url, api_key="benchmark", local_path=tree)
+        command = build_command(binary, config.local_upload_options() + list(extra_args), config.config_options())
+        print(f"Uploading {files:,} files ({format_bytes(tree_bytes)})...", file=sys.stderr, flush=True)
+        log_path = os.path.join(log_dir, f"immich-go-{files}.log") if log_dir else None
+        measured = run_upload(command, server_process, log_path, priority)
+        stats = server_request(url, "/__mock__/stats")
+    finally:
+        if proxy is not None:
+            proxy.stop()
+        server_process.terminate()
+        server_process.wait(10)
+
+    elapsed = measured["elapsed"] or 1e-9
+    return dict(
+        measured,
+        files=files,
+        tree_bytes=tree_bytes,
+        generate_seconds=generate_seconds,
+        uploaded=stats["assets"],
+        uploaded_bytes=stats["bytes"],
+        files_per_s=stats["assets"] / elapsed,
+        mb_per_s=stats["bytes"] / elapsed / 1_000_000,
+        cpu_percent=100 * measured["cpu_seconds"] / elapsed,
+        server=stats,
+        proxy=proxy.snapshot() if proxy else None,
+        command=command,
+    )
+
+
+def environment(binary):
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "memory": psutil.virtual_memory().total,
+        "python": platform.python_version(),
+        "immich_go": binary_version(binary),
+    }
+
+
+def compare(old, new):
+    """Lines comparing the results of two reports, matched by tree size."""
+    old_results = {result["files"]: result for result in old["results"]}
+    lines = []
+    for result in new["results"]:
+        before = old_results.get(result["files"])
+        if before is None:
+            continue
+        changes = []
+        for metric in COMPARED_METRICS:
+            if before.get(metric):
+                changes.append(f"{metric} {result[metric] / before[metric]:.2f}x")
+        lines.append(f"{result['files']:,} files: " + ", ".join(changes))
+    return lines
+
+
+def summary_line(result):
+    return (f"{result['files']:,} files: {result['uploaded']:,} uploaded in {result['elapsed']:.1f} s, "
+            f"{result['files_per_s']:.1f} files/s, {result['mb_per_s']:.2f} MB/s, "
+            f"CPU {result['cpu_seconds']:.1f} s ({result['cpu_percent']:.0f}%), "
+            f"peak RSS {format_bytes(result['peak_rss'])}, server CPU {result['server_cpu_seconds']:.1f} s, "
+            f"exit code {result['exit_code']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark immich-go uploads against a local mock server.")
+    parser.add_argument("--files", default="10000", help="comma-separated tree sizes (default: %(default)s)")
+    parser.add_argument("--file-kb", type=int, default=16, help="average file size in KiB (default: %(default)s)")
+    parser.add_argument("--tree-root", default=os.path.join("immich-go", "benchmark"),
+                        help="where synthetic trees are kept (default: %(default)s)")
+    parser.add_argument("--binary", default=None, help="immich-go binary (default: ./immich-go/immich-go)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="server latency per request")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0, help="server bandwidth in Mbit/s, 0 for unlimited")
+    parser.add_argument("--throttle-mbps", type=float, default=0,
+                        help="upload through the throttling proxy at this many Mbit/s")
+    parser.add_argument("--cache-ttl", type=float, default=0,
+                        help="upload through the proxy, caching GET responses for this many seconds")
+    parser.add_argument("--priority", choices=PRIORITIES, default="normal", help="immich-go's priority class")
+    parser.add_argument("--arg", action="append", default=[], help="extra immich-go option, may be repeated")
+    parser.add_argument("--output", default=None, help="report file (default: benchmark-<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="earlier report to compare with")
+    parser.add_argument("--keep-logs", action="store_true", help="keep immich-go's output next to the report")
+    args = parser.parse_args(argv)
+
+    binary = args.binary or default_binary_path()
+    output = args.output or f"benchmark-{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    report = {
+        "version": REPORT_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(binary),
+        "settings": {"file_kb": args.file_kb, "latency_ms": args.latency_ms,
+                     "bandwidth_mbps": args.bandwidth_mbps, "throttle_mbps": args.throttle_mbps,
+                     "cache_ttl": args.cache_ttl,
+                     "priority": args.priority, "args": args.arg},
+        "results": [],
+    }
+    log_dir = os.path.dirname(os.path.abspath(output)) if args.keep_logs else None
+    for files in (int(size.replace("_", "")) for size in args.files.split(",")):
+        result = benchmark(files, args.file_kb, args.tree_root, binary, args.latency_ms, args.bandwidth_mbps,
+                           args.arg, log_dir, args.throttle_mbps, args.priority, args.cache_ttl)
+        report["results"].append(result)
+        print(summary_line(result), flush=True)
+        # Written after every size so a long sweep keeps what it has measured
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(f"Report written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            for line in compare(json.load(f), report):
+                print(line)
+    return 0 if all(result["exit_code"] == 0 for result in report["results"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())